@@ -108,6 +108,7 @@ export interface StateResponse {
 
 export interface ProcessResponse {
     status: string;
+    job_id: string | null;
     output_path: string | null;
 }
 
@@ -1,20 +1,22 @@
-import os
+import re
 import uuid
-import shutil
 import base64
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 import cv2
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 
 from facefusion import state_manager
 from facefusion.filesystem import is_image, is_video
-from facefusion.vision import read_static_image, read_video_frame, count_video_frame_total, detect_video_fps, detect_video_resolution, fit_cover_frame
+from facefusion.vision import read_static_image, read_video_frame, probe_video, fit_cover_frame
+from facefusion.video_store import register_video
 from facefusion.face_analyser import get_many_faces
 from facefusion.face_selector import sort_and_filter_faces
+from .stream_helper import create_file_response, store_stream
 from .schemas import (
 	HealthResponse, UploadResponse, ProcessRequest, ProcessResponse, StateResponse,
 	FaceDetectionRequest, FaceDetectionResponse, DetectedFace,
@@ -26,6 +28,10 @@ router = APIRouter()
 # Temporary storage for uploaded files
 UPLOAD_DIR = Path(state_manager.get_item('temp_path') or './temp') / 'api_uploads'
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+UPLOAD_SIZE_LIMIT = 16 * 1024 ** 3
+
+# Output paths of started processes by job id
+OUTPUT_PATHS: Dict[str, str] = {}
 
 
 @router.get('/health', response_model=HealthResponse)
@@ -33,22 +39,21 @@ def health() -> HealthResponse:
 	return HealthResponse(status='ok')
 
 
-@router.post('/upload/source', response_model=UploadResponse)
-async def upload_source(file: UploadFile = File(...)) -> UploadResponse:
-	"""Upload a source image or video file."""
-	file_id = str(uuid.uuid4())
+async def save_upload(file: UploadFile) -> UploadResponse:
+	"""Stream the upload to content addressed storage without blocking the event loop."""
 	file_extension = Path(file.filename or '').suffix
-	file_path = UPLOAD_DIR / f"source_{file_id}{file_extension}"
-	
+
 	try:
-		with open(file_path, 'wb') as buffer:
-			shutil.copyfileobj(file.file, buffer)
+		file_id, file_path = await run_in_threadpool(store_stream, file.file, UPLOAD_DIR, file_extension, UPLOAD_SIZE_LIMIT)
+	except HTTPException:
+		raise
 	except Exception as e:
 		raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
-	
-	# Update state manager - replace existing source
-	state_manager.set_item('source_paths', [str(file_path)])
-	
+
+	# Probe video metadata once per content hash, re-uploads reuse the index
+	if is_video(str(file_path)):
+		await run_in_threadpool(register_video, str(file_path), file_id)
+
 	return UploadResponse(
 		file_id=file_id,
 		filename=file.filename or 'unknown',
@@ -58,29 +63,33 @@ async def upload_source(file: UploadFile = File(...)) -> UploadResponse:
 	)
 
 
+@router.post('/upload/source', response_model=UploadResponse)
+async def upload_source(file: UploadFile = File(...)) -> UploadResponse:
+	"""Upload a source image or video file."""
+	upload_response = await save_upload(file)
+
+	# Update state manager - replace existing source
+	state_manager.set_item('source_paths', [upload_response.path])
+	return upload_response
+
+
 @router.post('/upload/target', response_model=UploadResponse)
 async def upload_target(file: UploadFile = File(...)) -> UploadResponse:
 	"""Upload a target image or video file."""
-	file_id = str(uuid.uuid4())
-	file_extension = Path(file.filename or '').suffix
-	file_path = UPLOAD_DIR / f"target_{file_id}{file_extension}"
-	
-	try:
-		with open(file_path, 'wb') as buffer:
-			shutil.copyfileobj(file.file, buffer)
-	except Exception as e:
-		raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
-	
+	upload_response = await save_upload(file)
+
 	# Update state manager
-	state_manager.set_item('target_path', str(file_path))
-	
-	return UploadResponse(
-		file_id=file_id,
-		filename=file.filename or 'unknown',
-		path=str(file_path),
-		is_image=is_image(str(file_path)),
-		is_video=is_video(str(file_path))
-	)
+	state_manager.set_item('target_path', upload_response.path)
+	return upload_response
+
+
+@router.get('/upload/{file_id}')
+async def get_upload(file_id: str, request: Request) -> Response:
+	"""Stream an uploaded file, supporting byte ranges for video previews."""
+	if re.fullmatch('[0-9a-f]{64}', file_id):
+		for file_path in UPLOAD_DIR.glob(f"{file_id}.*"):
+			return create_file_response(file_path, request.headers.get('range'))
+	raise HTTPException(status_code=404, detail="Uploaded file not found")
 
 
 @router.get('/state', response_model=StateResponse)
@@ -100,6 +109,8 @@ async def start_process(request: ProcessRequest, background_tasks: BackgroundTas
 	"""Start the face swap processing."""
 	from facefusion.core import common_pre_check, processors_pre_check, conditional_process
 	
+	job_id = uuid.uuid4().hex
+
 	# Set output path if provided
 	if request.output_path:
 		state_manager.set_item('output_path', request.output_path)
@@ -109,8 +120,11 @@ async def start_process(request: ProcessRequest, background_tasks: BackgroundTas
 		if target_path:
 			output_dir = UPLOAD_DIR / 'outputs'
 			output_dir.mkdir(exist_ok=True)
-			output_path = output_dir / f"output_{uuid.uuid4()}{Path(target_path).suffix}"
+			output_path = output_dir / f"output_{job_id}{Path(target_path).suffix}"
 			state_manager.set_item('output_path', str(output_path))
+
+	if state_manager.get_item('output_path'):
+		OUTPUT_PATHS[job_id] = state_manager.get_item('output_path')
 	
 	# Set processors
 	if request.processors:
@@ -151,16 +165,31 @@ async def start_process(request: ProcessRequest, background_tasks: BackgroundTas
 	
 	return ProcessResponse(
 		status='started',
+		job_id=job_id,
 		output_path=state_manager.get_item('output_path')
 	)
 
 
+def resolve_output_path(file_id: str) -> Optional[Path]:
+	"""Look up an output by job id or by its file name."""
+	output_path = OUTPUT_PATHS.get(file_id)
+
+	if not output_path:
+		for temp_output_path in OUTPUT_PATHS.values():
+			if Path(temp_output_path).name == file_id:
+				output_path = temp_output_path
+
+	if output_path and Path(output_path).is_file():
+		return Path(output_path)
+	return None
+
+
 @router.get('/output/{file_id}')
-async def get_output(file_id: str):
-	"""Get the processed output file."""
-	output_path = state_manager.get_item('output_path')
-	if output_path and os.path.exists(output_path):
-		return FileResponse(output_path)
+async def get_output(file_id: str, request: Request):
+	"""Get the processed output file of a job, supporting byte ranges."""
+	output_path = resolve_output_path(file_id)
+	if output_path:
+		return create_file_response(output_path, request.headers.get('range'))
 	raise HTTPException(status_code=404, detail="Output file not found")
 
 
@@ -271,6 +300,7 @@ async def get_preview_frame(request: PreviewFrameRequest) -> PreviewFrameRespons
 						'reference_vision_frame': reference_vision_frame,
 						'source_audio_frame': source_audio_frame,
 						'source_voice_frame': source_voice_frame,
+						'scene_index': 0,
 						'source_vision_frames': source_vision_frames,
 						'target_vision_frame': target_vision_frame,
 						'temp_vision_frame': temp_vision_frame,
@@ -302,16 +332,18 @@ async def get_video_info() -> VideoInfoResponse:
 	if not is_video(target_path):
 		raise HTTPException(status_code=400, detail="Target is not a video file")
 	
-	frame_count = count_video_frame_total(target_path)
-	fps = detect_video_fps(target_path)
-	width, height = detect_video_resolution(target_path)
-	duration = frame_count / fps if fps > 0 else 0
-	
+	video_metadata = await run_in_threadpool(probe_video, target_path)
+
+	if not video_metadata:
+		raise HTTPException(status_code=400, detail="Unable to read video metadata")
+
+	width, height = video_metadata.get('resolution')
 	return VideoInfoResponse(
-		frame_count=frame_count,
-		fps=fps,
-		duration=duration,
+		frame_count=video_metadata.get('frame_total'),
+		fps=video_metadata.get('fps'),
+		duration=video_metadata.get('duration'),
 		width=width,
-		height=height
+		height=height,
+		codec=video_metadata.get('codec')
 	)
 
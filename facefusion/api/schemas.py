@@ -32,6 +32,7 @@ class ProcessRequest(BaseModel):
 
 class ProcessResponse(BaseModel):
 	status: str
+	job_id: Optional[str] = None
 	output_path: Optional[str]
 
 
@@ -71,3 +72,4 @@ class VideoInfoResponse(BaseModel):
 	duration: float
 	width: int
 	height: int
+	codec: Optional[str] = None
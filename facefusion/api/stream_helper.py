@@ -0,0 +1,101 @@
+import hashlib
+import mimetypes
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def store_stream(source_file: BinaryIO, upload_directory: Path, file_extension: str, size_limit: int) -> Tuple[str, Path]:
+	"""Copy an upload stream to disk while hashing it, keeping one file per content hash."""
+	file_hash = hashlib.sha256()
+	file_size = 0
+	part_path = upload_directory / f".{uuid.uuid4().hex}.part"
+
+	try:
+		with open(part_path, 'wb') as part_file:
+			while chunk := source_file.read(STREAM_CHUNK_SIZE):
+				file_size += len(chunk)
+				if file_size > size_limit:
+					raise HTTPException(status_code=413, detail="File exceeds the upload size limit")
+				file_hash.update(chunk)
+				part_file.write(chunk)
+
+		file_id = file_hash.hexdigest()
+		file_path = upload_directory / f"{file_id}{file_extension.lower()}"
+
+		# Identical content was uploaded before, keep the existing copy
+		if not file_path.is_file():
+			os.replace(part_path, file_path)
+	finally:
+		if part_path.is_file():
+			part_path.unlink()
+
+	return file_id, file_path
+
+
+def parse_range_header(range_header: Optional[str], file_size: int) -> Optional[Tuple[int, int]]:
+	"""Resolve a single byte range, multiple ranges fall back to the full file."""
+	if not range_header or not range_header.startswith('bytes='):
+		return None
+
+	range_values = range_header[len('bytes='):].split(',')
+	if len(range_values) > 1:
+		return None
+
+	start_value, _, end_value = range_values[0].strip().partition('-')
+
+	try:
+		if start_value:
+			start = int(start_value)
+			end = int(end_value) if end_value else file_size - 1
+		else:
+			start = max(file_size - int(end_value), 0)
+			end = file_size - 1
+	except ValueError:
+		return None
+
+	if start < 0 or start > end or start >= file_size:
+		raise HTTPException(status_code=416, detail="Range not satisfiable", headers={'Content-Range': f"bytes */{file_size}"})
+
+	return start, min(end, file_size - 1)
+
+
+def iterate_file_range(file_path: Path, start: int, end: int) -> Iterator[bytes]:
+	with open(file_path, 'rb') as file:
+		file.seek(start)
+		remaining_size = end - start + 1
+
+		while remaining_size > 0:
+			chunk = file.read(min(STREAM_CHUNK_SIZE, remaining_size))
+			if not chunk:
+				break
+			remaining_size -= len(chunk)
+			yield chunk
+
+
+def create_file_response(file_path: Path, range_header: Optional[str]) -> Response:
+	"""Serve a file, answering byte range requests with partial content."""
+	file_size = file_path.stat().st_size
+	media_type = mimetypes.guess_type(file_path.name)[0] or 'application/octet-stream'
+	file_range = parse_range_header(range_header, file_size)
+
+	if file_range:
+		start, end = file_range
+		return StreamingResponse(
+			iterate_file_range(file_path, start, end),
+			status_code=206,
+			media_type=media_type,
+			headers={
+				'Accept-Ranges': 'bytes',
+				'Content-Range': f"bytes {start}-{end}/{file_size}",
+				'Content-Length': str(end - start + 1)
+			}
+		)
+
+	return FileResponse(file_path, media_type=media_type, headers={'Accept-Ranges': 'bytes'})
@@ -61,6 +61,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	# face landmarker
 	apply_state_item('face_landmarker_model', args.get('face_landmarker_model'))
 	apply_state_item('face_landmarker_score', args.get('face_landmarker_score'))
+	apply_state_item('face_alignment_method', args.get('face_alignment_method'))
 	# face selector
 	apply_state_item('face_selector_mode', args.get('face_selector_mode'))
 	apply_state_item('face_selector_order', args.get('face_selector_order'))
@@ -85,6 +86,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('trim_frame_start', args.get('trim_frame_start'))
 	apply_state_item('trim_frame_end', args.get('trim_frame_end'))
 	apply_state_item('temp_frame_format', args.get('temp_frame_format'))
+	apply_state_item('scene_cut_threshold', args.get('scene_cut_threshold'))
 	apply_state_item('keep_temp', args.get('keep_temp'))
 	# output creation
 	apply_state_item('output_image_quality', args.get('output_image_quality'))
@@ -112,6 +114,8 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('execution_device_ids', args.get('execution_device_ids'))
 	apply_state_item('execution_providers', args.get('execution_providers'))
 	apply_state_item('execution_thread_count', args.get('execution_thread_count'))
+	apply_state_item('execution_session_limit', args.get('execution_session_limit'))
+	apply_state_item('job_concurrency', args.get('job_concurrency'))
 	# download
 	apply_state_item('download_providers', args.get('download_providers'))
 	apply_state_item('download_scope', args.get('download_scope'))
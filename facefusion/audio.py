@@ -1,22 +1,38 @@
+import os
+import tempfile
+import threading
 from functools import lru_cache
-from typing import Any, List, Optional
+from typing import Any, Optional, Tuple
 
 import numpy
 import scipy
+from numpy.lib.stride_tricks import sliding_window_view
 from numpy.typing import NDArray
 
-from facefusion.ffmpeg import read_audio_buffer
-from facefusion.filesystem import is_audio
-from facefusion.types import Audio, AudioFrame, Fps, Mel, MelFilterBank, Spectrogram
+from facefusion import process_manager, state_manager
+from facefusion.ffmpeg import open_audio_stream, read_audio_buffer
+from facefusion.filesystem import create_directory, is_audio, is_file
+from facefusion.hash_helper import create_file_hash
+from facefusion.types import Audio, AudioFrame, AudioFrames, AudioPoolSet, AudioStream, Fps, Mel, MelFilterBank, Spectrogram
 from facefusion.voice_extractor import batch_extract_voice
 
+AUDIO_POOL_SET : AudioPoolSet =\
+{
+	'stream': {},
+	'block': {},
+	'chunk': {}
+}
+AUDIO_LOCK : threading.Lock = threading.Lock()
+AUDIO_CHUNK_SIZE : int = 2400
+AUDIO_CACHE_LIMIT : int = 4
+
 
 @lru_cache(maxsize = 64)
-def read_static_audio(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
+def read_static_audio(audio_path : str, fps : Fps) -> Optional[AudioFrames]:
 	return read_audio(audio_path, fps)
 
 
-def read_audio(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
+def read_audio(audio_path : str, fps : Fps) -> Optional[AudioFrames]:
 	audio_sample_rate = 48000
 	audio_sample_size = 16
 	audio_channel_total = 2
@@ -32,11 +48,26 @@ def read_audio(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
 
 
 @lru_cache(maxsize = 64)
-def read_static_voice(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
-	return read_voice(audio_path, fps)
+def read_static_voice_spectrogram(audio_path : str) -> Optional[Spectrogram]:
+	return read_voice_spectrogram(audio_path)
+
+
+def clear_static_voice_spectrograms() -> None:
+	if process_manager.count_process_scopes() > 1:
+		return
 
+	read_static_voice_spectrogram.cache_clear()
 
-def read_voice(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
+
+def read_voice(audio_path : str, fps : Fps) -> Optional[AudioFrames]:
+	spectrogram = read_voice_spectrogram(audio_path)
+
+	if spectrogram is not None:
+		return extract_audio_frames(spectrogram, fps)
+	return None
+
+
+def read_voice_spectrogram(audio_path : str) -> Optional[Spectrogram]:
 	voice_sample_rate = 48000
 	voice_sample_size = 16
 	voice_channel_total = 2
@@ -44,43 +75,250 @@ def read_voice(audio_path : str, fps : Fps) -> Optional[List[AudioFrame]]:
 	voice_step_size = 180 * 1024
 
 	if is_audio(audio_path):
+		voice_cache_path = resolve_voice_cache_path(audio_path)
+
+		if is_file(voice_cache_path):
+			return numpy.load(voice_cache_path)
+
 		audio_buffer = read_audio_buffer(audio_path, voice_sample_rate, voice_sample_size, voice_channel_total)
 		audio = numpy.frombuffer(audio_buffer, dtype = numpy.int16).reshape(-1, 2)
 		audio = batch_extract_voice(audio, voice_chunk_size, voice_step_size)
 		audio = prepare_voice(audio)
 		spectrogram = create_spectrogram(audio)
-		audio_frames = extract_audio_frames(spectrogram, fps)
-		return audio_frames
+		write_voice_cache(voice_cache_path, spectrogram)
+		return spectrogram
 	return None
 
 
+def resolve_voice_cache_path(audio_path : str) -> str:
+	temp_path = state_manager.get_item('temp_path') or tempfile.gettempdir()
+	audio_hash = create_file_hash(audio_path)
+	return os.path.join(temp_path, 'facefusion', 'voices', audio_hash + '-' + state_manager.get_item('voice_extractor_model') + '.npy')
+
+
+def write_voice_cache(voice_cache_path : str, spectrogram : Spectrogram) -> bool:
+	temp_voice_cache_path = voice_cache_path + '.' + str(os.getpid()) + '.tmp'
+
+	if create_directory(os.path.dirname(voice_cache_path)):
+		with open(temp_voice_cache_path, 'wb') as voice_cache_file:
+			numpy.save(voice_cache_file, spectrogram)
+		os.replace(temp_voice_cache_path, voice_cache_path)
+		return True
+	return False
+
+
 def get_audio_frame(audio_path : str, fps : Fps, frame_number : int = 0) -> Optional[AudioFrame]:
+	audio_step_size = 16
+
 	if is_audio(audio_path):
-		audio_frames = read_static_audio(audio_path, fps)
-		if frame_number in range(len(audio_frames)):
-			return audio_frames[frame_number]
+		audio_scan = scan_static_audio(audio_path)
+
+		if audio_scan:
+			audio_sample_total, _ = audio_scan
+			indices = create_audio_frame_indices(calculate_spectrogram_total(audio_sample_total), fps)
+
+			if frame_number in range(len(indices)):
+				index = indices[frame_number]
+
+				with AUDIO_LOCK:
+					return read_spectrogram_range(audio_path, index - audio_step_size, index)
 	return None
 
 
-def extract_audio_frames(spectrogram : Spectrogram, fps : Fps) -> List[AudioFrame]:
-	audio_frames = []
+def extract_audio_frames(spectrogram : Spectrogram, fps : Fps) -> AudioFrames:
 	mel_filter_total = 80
 	audio_step_size = 16
-	indices = numpy.arange(0, spectrogram.shape[1], mel_filter_total / fps).astype(numpy.int16)
-	indices = indices[indices >= audio_step_size]
+	indices = create_audio_frame_indices(spectrogram.shape[1], fps)
 
-	for index in indices:
-		start = max(0, index - audio_step_size)
-		audio_frames.append(spectrogram[:, start:index])
+	if len(indices):
+		audio_frames = sliding_window_view(spectrogram, audio_step_size, axis = 1)
+		return numpy.moveaxis(audio_frames, 1, 0)[indices - audio_step_size]
+	return numpy.empty((0, mel_filter_total, audio_step_size))
 
-	return audio_frames
+
+def extract_audio_frame(spectrogram : Spectrogram, fps : Fps, frame_number : int) -> Optional[AudioFrame]:
+	audio_step_size = 16
+	indices = create_audio_frame_indices(spectrogram.shape[1], fps)
+
+	if frame_number in range(len(indices)):
+		index = indices[frame_number]
+		return spectrogram[:, index - audio_step_size:index]
+	return None
+
+
+@lru_cache(maxsize = 64)
+def create_audio_frame_indices(spectrogram_total : int, fps : Fps) -> NDArray[Any]:
+	mel_filter_total = 80
+	audio_step_size = 16
+	audio_frame_indices = numpy.arange(0, spectrogram_total, mel_filter_total / fps).astype(numpy.int64)
+	return audio_frame_indices[audio_frame_indices >= audio_step_size]
+
+
+def calculate_spectrogram_total(audio_sample_total : int) -> int:
+	mel_bin_total = 800
+	mel_bin_overlap = 600
+	mel_hop_size = mel_bin_total - mel_bin_overlap
+	return -(-audio_sample_total // mel_hop_size) + 1
+
+
+@lru_cache(maxsize = 64)
+def scan_static_audio(audio_path : str) -> Optional[Tuple[int, float]]:
+	return scan_audio(audio_path)
+
+
+def scan_audio(audio_path : str) -> Optional[Tuple[int, float]]:
+	audio_sample_rate = 48000
+	audio_sample_size = 16
+	audio_channel_total = 2
+	audio_block_size = AUDIO_CHUNK_SIZE * 200
+
+	if is_audio(audio_path):
+		process = open_audio_stream(audio_path, audio_sample_rate, audio_sample_size, audio_channel_total)
+		audio_sample_total = 0
+		audio_peak = 0.0
+
+		while audio_buffer := process.stdout.read(audio_block_size * audio_channel_total * 2):
+			audio = numpy.frombuffer(audio_buffer, dtype = numpy.int16).reshape(-1, 2)
+			audio = numpy.mean(audio, axis = 1)
+			audio_sample_total += len(audio)
+			audio_peak = max(audio_peak, numpy.max(numpy.abs(audio)))
+
+		process.communicate()
+		if process.returncode == 0 and audio_sample_total:
+			return audio_sample_total, audio_peak
+	return None
+
+
+def read_spectrogram_range(audio_path : str, start : int, end : int) -> Spectrogram:
+	chunk_start = start // AUDIO_CHUNK_SIZE
+	chunk_end = (end - 1) // AUDIO_CHUNK_SIZE
+	spectrogram = numpy.concatenate([ read_spectrogram_chunk(audio_path, chunk_index) for chunk_index in range(chunk_start, chunk_end + 1) ], axis = 1)
+	offset = start - chunk_start * AUDIO_CHUNK_SIZE
+	return spectrogram[:, offset:offset + end - start]
+
+
+def read_spectrogram_chunk(audio_path : str, chunk_index : int) -> Spectrogram:
+	spectrogram_chunks = AUDIO_POOL_SET.get('chunk').setdefault(audio_path, {})
+	spectrogram = spectrogram_chunks.pop(chunk_index, None)
+
+	if spectrogram is None:
+		spectrogram = create_spectrogram_chunk(audio_path, chunk_index)
+
+	spectrogram_chunks[chunk_index] = spectrogram
+
+	if len(spectrogram_chunks) > AUDIO_CACHE_LIMIT:
+		spectrogram_chunks.pop(next(iter(spectrogram_chunks)))
+	return spectrogram
+
+
+def create_spectrogram_chunk(audio_path : str, chunk_index : int) -> Spectrogram:
+	mel_bin_total = 800
+	mel_bin_overlap = 600
+	mel_hop_size = mel_bin_total - mel_bin_overlap
+	audio_sample_total, audio_peak = scan_static_audio(audio_path)
+	spectrogram_start = chunk_index * AUDIO_CHUNK_SIZE
+	spectrogram_end = min(spectrogram_start + AUDIO_CHUNK_SIZE, calculate_spectrogram_total(audio_sample_total))
+	sample_start = spectrogram_start * mel_hop_size - mel_bin_total // 2
+	sample_end = (spectrogram_end - 1) * mel_hop_size + mel_bin_total // 2
+	audio_start = max(0, sample_start - 1)
+	audio_end = min(sample_end, audio_sample_total)
+	audio_buffer = numpy.zeros(sample_end - sample_start)
+
+	if audio_end > audio_start:
+		audio = read_audio_range(audio_path, audio_start, audio_end)
+		audio = audio / audio_peak
+		audio = scipy.signal.lfilter([ 1.0, -0.97 ], [ 1.0 ], audio)
+
+		if sample_start > 0:
+			audio = audio[1:]
+
+		offset = max(0, -sample_start)
+		audio_buffer[offset:offset + len(audio)] = audio
+
+	mel_filter_bank = create_mel_filter_bank()
+	audio_window = scipy.signal.get_window('hann', mel_bin_total)
+	audio_frames = sliding_window_view(audio_buffer, mel_bin_total)[::mel_hop_size]
+	spectrogram = scipy.fft.rfft(audio_frames * audio_window, axis = -1) / audio_window.sum()
+	spectrogram = numpy.dot(mel_filter_bank, numpy.abs(spectrogram).T)
+	return spectrogram
+
+
+def read_audio_range(audio_path : str, start : int, end : int) -> Audio:
+	audio_block_size = AUDIO_CHUNK_SIZE * 200
+	block_start = start // audio_block_size
+	block_end = (end - 1) // audio_block_size
+	audio = numpy.concatenate([ read_audio_block(audio_path, block_index) for block_index in range(block_start, block_end + 1) ])
+	offset = start - block_start * audio_block_size
+	return audio[offset:offset + end - start]
+
+
+def read_audio_block(audio_path : str, block_index : int) -> Audio:
+	audio_channel_total = 2
+	audio_block_size = AUDIO_CHUNK_SIZE * 200
+	audio_blocks = AUDIO_POOL_SET.get('block').setdefault(audio_path, {})
+	audio = audio_blocks.pop(block_index, None)
+
+	if audio is None:
+		audio_stream = AUDIO_POOL_SET.get('stream').get(audio_path)
+
+		if not audio_stream or audio_stream.get('position') > block_index:
+			audio_stream = create_audio_stream(audio_path)
+
+		while audio_stream.get('position') <= block_index:
+			audio_buffer = audio_stream.get('process').stdout.read(audio_block_size * audio_channel_total * 2)
+			audio = numpy.frombuffer(audio_buffer, dtype = numpy.int16).reshape(-1, 2)
+			audio = numpy.mean(audio, axis = 1)
+			audio_blocks[audio_stream.get('position')] = audio
+			audio_stream['position'] += 1
+
+			if len(audio_blocks) > AUDIO_CACHE_LIMIT:
+				audio_blocks.pop(next(iter(audio_blocks)))
+		return audio
+
+	audio_blocks[block_index] = audio
+	return audio
+
+
+def create_audio_stream(audio_path : str) -> AudioStream:
+	audio_sample_rate = 48000
+	audio_sample_size = 16
+	audio_channel_total = 2
+	close_audio_stream(audio_path)
+	audio_stream : AudioStream =\
+	{
+		'process': open_audio_stream(audio_path, audio_sample_rate, audio_sample_size, audio_channel_total),
+		'position': 0
+	}
+	AUDIO_POOL_SET['stream'][audio_path] = audio_stream
+	return audio_stream
+
+
+def close_audio_stream(audio_path : str) -> None:
+	audio_stream = AUDIO_POOL_SET.get('stream').pop(audio_path, None)
+
+	if audio_stream:
+		audio_stream.get('process').kill()
+		audio_stream.get('process').communicate()
+
+
+def clear_audio_pool() -> None:
+	if process_manager.count_process_scopes() > 1:
+		return
+
+	with AUDIO_LOCK:
+		for audio_path in list(AUDIO_POOL_SET.get('stream').keys()):
+			close_audio_stream(audio_path)
+
+		AUDIO_POOL_SET['block'].clear()
+		AUDIO_POOL_SET['chunk'].clear()
 
 
 def get_voice_frame(audio_path : str, fps : Fps, frame_number : int = 0) -> Optional[AudioFrame]:
 	if is_audio(audio_path):
-		voice_frames = read_static_voice(audio_path, fps)
-		if frame_number in range(len(voice_frames)):
-			return voice_frames[frame_number]
+		spectrogram = read_static_voice_spectrogram(audio_path)
+
+		if spectrogram is not None:
+			return extract_audio_frame(spectrogram, fps, frame_number)
 	return None
 
 
@@ -116,6 +354,7 @@ def convert_mel_to_hertz(mel : Mel) -> NDArray[Any]:
 	return 700 * (10 ** (mel / 2595) - 1)
 
 
+@lru_cache(maxsize = None)
 def create_mel_filter_bank() -> MelFilterBank:
 	audio_sample_rate = 16000
 	audio_frequency_min = 55.0
@@ -131,6 +370,7 @@ def create_mel_filter_bank() -> MelFilterBank:
 		end = indices[index + 1]
 		mel_filter_bank[index, start:end] = scipy.signal.windows.triang(end - start)
 
+	mel_filter_bank.flags.writeable = False
 	return mel_filter_bank
 
 
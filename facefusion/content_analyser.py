@@ -191,7 +191,7 @@ def detect_with_nsfw_3(vision_frame : VisionFrame) -> bool:
 def forward_nsfw(vision_frame : VisionFrame, model_name : str) -> Detection:
 	content_analyser = get_inference_pool().get(model_name)
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(content_analyser):
 		detection = content_analyser.run(None,
 		{
 			'input': vision_frame
@@ -99,9 +99,10 @@ def get_many_faces(vision_frames : List[VisionFrame]) -> List[Face]:
 	for vision_frame in vision_frames:
 		if numpy.any(vision_frame):
 			static_faces = get_static_faces(vision_frame)
-			if static_faces:
+			if static_faces is not None:
 				many_faces.extend(static_faces)
 			else:
+				faces = []
 				all_bounding_boxes = []
 				all_face_scores = []
 				all_face_landmarks_5 = []
@@ -118,9 +119,8 @@ def get_many_faces(vision_frames : List[VisionFrame]) -> List[Face]:
 				if all_bounding_boxes and all_face_scores and all_face_landmarks_5 and state_manager.get_item('face_detector_score') > 0:
 					faces = create_faces(vision_frame, all_bounding_boxes, all_face_scores, all_face_landmarks_5)
 
-					if faces:
-						many_faces.extend(faces)
-						set_static_faces(vision_frame, faces)
+				many_faces.extend(faces)
+				set_static_faces(vision_frame, faces)
 	return many_faces
 
 
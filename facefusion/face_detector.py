@@ -397,7 +397,7 @@ def detect_with_yunet(vision_frame : VisionFrame, face_detector_size : str) -> T
 def forward_with_retinaface(detect_vision_frame : VisionFrame) -> Detection:
 	face_detector = get_inference_pool().get('retinaface')
 
-	with thread_semaphore():
+	with thread_semaphore(face_detector):
 		detection = face_detector.run(None,
 		{
 			'input': detect_vision_frame
@@ -409,7 +409,7 @@ def forward_with_retinaface(detect_vision_frame : VisionFrame) -> Detection:
 def forward_with_scrfd(detect_vision_frame : VisionFrame) -> Detection:
 	face_detector = get_inference_pool().get('scrfd')
 
-	with thread_semaphore():
+	with thread_semaphore(face_detector):
 		detection = face_detector.run(None,
 		{
 			'input': detect_vision_frame
@@ -421,7 +421,7 @@ def forward_with_scrfd(detect_vision_frame : VisionFrame) -> Detection:
 def forward_with_yolo_face(detect_vision_frame : VisionFrame) -> Detection:
 	face_detector = get_inference_pool().get('yolo_face')
 
-	with thread_semaphore():
+	with thread_semaphore(face_detector):
 		detection = face_detector.run(None,
 		{
 			'input': detect_vision_frame
@@ -433,7 +433,7 @@ def forward_with_yolo_face(detect_vision_frame : VisionFrame) -> Detection:
 def forward_with_yunet(detect_vision_frame : VisionFrame) -> Detection:
 	face_detector = get_inference_pool().get('yunet')
 
-	with thread_semaphore():
+	with thread_semaphore(face_detector):
 		detection = face_detector.run(None,
 		{
 			'input': detect_vision_frame
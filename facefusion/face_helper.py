@@ -5,7 +5,8 @@ import cv2
 import numpy
 from cv2.typing import Size
 
-from facefusion.types import Anchors, Angle, BoundingBox, Distance, FaceDetectorModel, FaceLandmark5, FaceLandmark68, Mask, Matrix, Points, Scale, Score, Translation, VisionFrame, WarpTemplate, WarpTemplateSet
+from facefusion import state_manager
+from facefusion.types import Anchors, Angle, BoundingBox, Distance, FaceAlignmentMethod, FaceDetectorModel, FaceLandmark5, FaceLandmark68, Mask, Matrix, Points, Scale, Score, Translation, VisionFrame, WarpTemplate, WarpTemplateSet
 
 WARP_TEMPLATE_SET : WarpTemplateSet =\
 {
@@ -69,8 +70,35 @@ WARP_TEMPLATE_SET : WarpTemplateSet =\
 
 
 def estimate_matrix_by_face_landmark_5(face_landmark_5 : FaceLandmark5, warp_template : WarpTemplate, crop_size : Size) -> Matrix:
+	face_alignment_method = state_manager.get_item('face_alignment_method') or 'ransac'
+	return estimate_static_matrix_by_face_landmark_5(face_landmark_5.tobytes(), face_landmark_5.dtype.str, warp_template, tuple(crop_size), face_alignment_method)
+
+
+@lru_cache(maxsize = 256)
+def estimate_static_matrix_by_face_landmark_5(face_landmark_5_buffer : bytes, face_landmark_5_dtype : str, warp_template : WarpTemplate, crop_size : Size, face_alignment_method : FaceAlignmentMethod) -> Matrix:
+	face_landmark_5 = numpy.frombuffer(face_landmark_5_buffer, dtype = face_landmark_5_dtype).reshape(-1, 2)
 	warp_template_norm = WARP_TEMPLATE_SET.get(warp_template) * crop_size
-	affine_matrix = cv2.estimateAffinePartial2D(face_landmark_5, warp_template_norm, method = cv2.RANSAC, ransacReprojThreshold = 100)[0]
+
+	if face_alignment_method == 'least-squares':
+		affine_matrix = estimate_similarity_matrix(face_landmark_5, warp_template_norm)
+	else:
+		affine_matrix = cv2.estimateAffinePartial2D(face_landmark_5, warp_template_norm, method = cv2.RANSAC, ransacReprojThreshold = 100)[0]
+	if affine_matrix is not None:
+		affine_matrix.setflags(write = False)
+	return affine_matrix
+
+
+def estimate_similarity_matrix(source_points : Points, target_points : Points) -> Matrix:
+	source_points = source_points.astype(numpy.float64)
+	target_points = target_points.astype(numpy.float64)
+	source_center = source_points.mean(axis = 0)
+	target_center = target_points.mean(axis = 0)
+	source_vectors = (source_points - source_center) @ [ 1, 1j ]
+	target_vectors = (target_points - target_center) @ [ 1, 1j ]
+	similarity = numpy.vdot(source_vectors, target_vectors) / numpy.vdot(source_vectors, source_vectors).real
+	rotation_matrix = numpy.array([ [ similarity.real, -similarity.imag ], [ similarity.imag, similarity.real ] ])
+	translation = target_center - rotation_matrix @ source_center
+	affine_matrix = numpy.hstack([ rotation_matrix, translation.reshape(2, 1) ])
 	return affine_matrix
 
 
@@ -98,18 +126,22 @@ def warp_face_by_translation(temp_vision_frame : VisionFrame, translation : Tran
 	return crop_vision_frame, affine_matrix
 
 
-def paste_back(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_vision_mask : Mask, affine_matrix : Matrix) -> VisionFrame:
+def paste_back(temp_vision_frame : VisionFrame, crop_vision_frame : VisionFrame, crop_vision_mask : Mask, affine_matrix : Matrix, in_place : bool = False) -> VisionFrame:
 	paste_bounding_box, paste_matrix = calculate_paste_area(temp_vision_frame, crop_vision_frame, affine_matrix)
 	x1, y1, x2, y2 = paste_bounding_box
 	paste_width = x2 - x1
 	paste_height = y2 - y1
-	inverse_vision_mask = cv2.warpAffine(crop_vision_mask, paste_matrix, (paste_width, paste_height)).clip(0, 1)
-	inverse_vision_mask = numpy.expand_dims(inverse_vision_mask, axis = -1)
-	inverse_vision_frame = cv2.warpAffine(crop_vision_frame, paste_matrix, (paste_width, paste_height), borderMode = cv2.BORDER_REPLICATE)
-	temp_vision_frame = temp_vision_frame.copy()
-	paste_vision_frame = temp_vision_frame[y1:y2, x1:x2]
-	paste_vision_frame = paste_vision_frame * (1 - inverse_vision_mask) + inverse_vision_frame * inverse_vision_mask
-	temp_vision_frame[y1:y2, x1:x2] = paste_vision_frame.astype(temp_vision_frame.dtype)
+
+	if not in_place:
+		temp_vision_frame = temp_vision_frame.copy()
+
+	if paste_width > 0 and paste_height > 0:
+		inverse_vision_mask = cv2.warpAffine(crop_vision_mask.astype(numpy.float32, copy = False), paste_matrix, (paste_width, paste_height))
+		numpy.clip(inverse_vision_mask, 0, 1, out = inverse_vision_mask)
+		inverse_vision_frame = cv2.warpAffine(crop_vision_frame, paste_matrix, (paste_width, paste_height), borderMode = cv2.BORDER_REPLICATE)
+		inverse_vision_frame = inverse_vision_frame.astype(temp_vision_frame.dtype, copy = False)
+		paste_vision_frame = temp_vision_frame[y1:y2, x1:x2]
+		paste_vision_frame[:] = cv2.blendLinear(inverse_vision_frame, paste_vision_frame, inverse_vision_mask, 1 - inverse_vision_mask)
 	return temp_vision_frame
 
 
@@ -207,7 +207,7 @@ def estimate_face_landmark_68_5(face_landmark_5 : FaceLandmark5) -> FaceLandmark
 def forward_with_2dfan4(crop_vision_frame : VisionFrame) -> Tuple[Prediction, Prediction]:
 	face_landmarker = get_inference_pool().get('2dfan4')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(face_landmarker):
 		prediction = face_landmarker.run(None,
 		{
 			'input': [ crop_vision_frame ]
@@ -219,7 +219,7 @@ def forward_with_2dfan4(crop_vision_frame : VisionFrame) -> Tuple[Prediction, Pr
 def forward_with_peppa_wutz(crop_vision_frame : VisionFrame) -> Prediction:
 	face_landmarker = get_inference_pool().get('peppa_wutz')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(face_landmarker):
 		prediction = face_landmarker.run(None,
 		{
 			'input': crop_vision_frame
@@ -231,7 +231,7 @@ def forward_with_peppa_wutz(crop_vision_frame : VisionFrame) -> Prediction:
 def forward_fan_68_5(face_landmark_5 : FaceLandmark5) -> FaceLandmark68:
 	face_landmarker = get_inference_pool().get('fan_68_5')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(face_landmarker):
 		face_landmark_68_5 = face_landmarker.run(None,
 		{
 			'input': [ face_landmark_5 ]
@@ -1,5 +1,6 @@
+import threading
 from functools import lru_cache
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy
@@ -8,8 +9,13 @@ import facefusion.choices
 from facefusion import inference_manager, state_manager
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.filesystem import resolve_relative_path
+from facefusion.hash_helper import create_hash
 from facefusion.thread_helper import conditional_thread_semaphore
-from facefusion.types import DownloadScope, DownloadSet, FaceLandmark68, FaceMaskArea, FaceMaskRegion, InferencePool, Mask, ModelSet, Padding, VisionFrame
+from facefusion.types import DownloadScope, DownloadSet, FaceLandmark68, FaceMaskArea, FaceMaskRegion, InferencePool, Mask, MaskSet, ModelSet, Padding, Resolution, VisionFrame
+
+FACE_MASK_SET : MaskSet = {}
+FACE_MASK_LOCK : threading.Lock = threading.Lock()
+FACE_MASK_LIMIT : int = 16
 
 
 @lru_cache()
@@ -187,40 +193,64 @@ def pre_check() -> bool:
 
 def create_box_mask(crop_vision_frame : VisionFrame, face_mask_blur : float, face_mask_padding : Padding) -> Mask:
 	crop_size = crop_vision_frame.shape[:2][::-1]
+	return create_static_box_mask(crop_size, face_mask_blur, tuple(face_mask_padding))
+
+
+@lru_cache(maxsize = 64)
+def create_static_box_mask(crop_size : Resolution, face_mask_blur : float, face_mask_padding : Padding) -> Mask:
 	blur_amount = int(crop_size[0] * 0.5 * face_mask_blur)
 	blur_area = max(blur_amount // 2, 1)
-	box_mask : Mask = numpy.ones(crop_size).astype(numpy.float32)
+	box_mask : Mask = numpy.ones(crop_size, dtype = numpy.float32)
 	box_mask[:max(blur_area, int(crop_size[1] * face_mask_padding[0] / 100)), :] = 0
 	box_mask[-max(blur_area, int(crop_size[1] * face_mask_padding[2] / 100)):, :] = 0
 	box_mask[:, :max(blur_area, int(crop_size[0] * face_mask_padding[3] / 100))] = 0
 	box_mask[:, -max(blur_area, int(crop_size[0] * face_mask_padding[1] / 100)):] = 0
 
 	if blur_amount > 0:
-		box_mask = cv2.GaussianBlur(box_mask, (0, 0), blur_amount * 0.25)
+		cv2.GaussianBlur(box_mask, (0, 0), blur_amount * 0.25, dst = box_mask)
+	box_mask.setflags(write = False)
 	return box_mask
 
 
 def create_occlusion_mask(crop_vision_frame : VisionFrame) -> Mask:
-	temp_masks = []
-
 	if state_manager.get_item('face_occluder_model') == 'many':
 		model_names = [ 'xseg_1', 'xseg_2', 'xseg_3' ]
 	else:
 		model_names = [ state_manager.get_item('face_occluder_model') ]
 
+	mask_key = create_mask_key(crop_vision_frame, model_names)
+	occlusion_mask = get_face_mask(mask_key)
+
+	if occlusion_mask is None:
+		temp_masks = []
+
+		for model_size, size_model_names in group_model_names_by_size(model_names).items():
+			prepare_vision_frame = cv2.resize(crop_vision_frame, model_size)
+			prepare_vision_frame = numpy.expand_dims(prepare_vision_frame, axis = 0).astype(numpy.float32) / 255.0
+			prepare_vision_frame = prepare_vision_frame.transpose(0, 1, 2, 3)
+
+			for model_name in size_model_names:
+				temp_mask = forward_occlude_face(prepare_vision_frame, model_name)
+				temp_mask = temp_mask.transpose(0, 1, 2).clip(0, 1).astype(numpy.float32)
+				temp_mask = cv2.resize(temp_mask, crop_vision_frame.shape[:2][::-1])
+				temp_masks.append(temp_mask)
+
+		occlusion_mask = temp_masks[0]
+
+		for temp_mask in temp_masks[1:]:
+			numpy.minimum(occlusion_mask, temp_mask, out = occlusion_mask)
+		occlusion_mask = refine_face_mask(occlusion_mask)
+		occlusion_mask = set_face_mask(mask_key, occlusion_mask)
+	return occlusion_mask
+
+
+def group_model_names_by_size(model_names : List[str]) -> Dict[Resolution, List[str]]:
+	model_name_set : Dict[Resolution, List[str]] = {}
+
 	for model_name in model_names:
 		model_size = create_static_model_set('full').get(model_name).get('size')
-		prepare_vision_frame = cv2.resize(crop_vision_frame, model_size)
-		prepare_vision_frame = numpy.expand_dims(prepare_vision_frame, axis = 0).astype(numpy.float32) / 255.0
-		prepare_vision_frame = prepare_vision_frame.transpose(0, 1, 2, 3)
-		temp_mask = forward_occlude_face(prepare_vision_frame, model_name)
-		temp_mask = temp_mask.transpose(0, 1, 2).clip(0, 1).astype(numpy.float32)
-		temp_mask = cv2.resize(temp_mask, crop_vision_frame.shape[:2][::-1])
-		temp_masks.append(temp_mask)
-
-	occlusion_mask = numpy.minimum.reduce(temp_masks)
-	occlusion_mask = (cv2.GaussianBlur(occlusion_mask.clip(0, 1), (0, 0), 5).clip(0.5, 1) - 0.5) * 2
-	return occlusion_mask
+		model_name_set.setdefault(model_size, []).append(model_name)
+	return model_name_set
 
 
 def create_area_mask(crop_vision_frame : VisionFrame, face_landmark_68 : FaceLandmark68, face_mask_areas : List[FaceMaskArea]) -> Mask:
@@ -232,32 +262,80 @@ def create_area_mask(crop_vision_frame : VisionFrame, face_landmark_68 : FaceLan
 			landmark_points.extend(facefusion.choices.face_mask_area_set.get(face_mask_area))
 
 	convex_hull = cv2.convexHull(face_landmark_68[landmark_points].astype(numpy.int32))
-	area_mask = numpy.zeros(crop_size).astype(numpy.float32)
+	area_mask = numpy.zeros(crop_size, dtype = numpy.float32)
 	cv2.fillConvexPoly(area_mask, convex_hull, 1.0) # type: ignore[call-overload]
-	area_mask = (cv2.GaussianBlur(area_mask.clip(0, 1), (0, 0), 5).clip(0.5, 1) - 0.5) * 2
+	area_mask = refine_face_mask(area_mask)
 	return area_mask
 
 
+def refine_face_mask(face_mask : Mask) -> Mask:
+	numpy.clip(face_mask, 0, 1, out = face_mask)
+	cv2.GaussianBlur(face_mask, (0, 0), 5, dst = face_mask)
+	numpy.clip(face_mask, 0.5, 1, out = face_mask)
+	face_mask -= 0.5
+	face_mask *= 2
+	return face_mask
+
+
+def merge_crop_masks(crop_masks : List[Mask]) -> Mask:
+	crop_mask = crop_masks[0].copy()
+
+	for temp_mask in crop_masks[1:]:
+		numpy.minimum(crop_mask, temp_mask, out = crop_mask)
+	numpy.clip(crop_mask, 0, 1, out = crop_mask)
+	return crop_mask
+
+
 def create_region_mask(crop_vision_frame : VisionFrame, face_mask_regions : List[FaceMaskRegion]) -> Mask:
 	model_name = state_manager.get_item('face_parser_model')
 	model_size = create_static_model_set('full').get(model_name).get('size')
-	prepare_vision_frame = cv2.resize(crop_vision_frame, model_size)
-	prepare_vision_frame = prepare_vision_frame[:, :, ::-1].astype(numpy.float32) / 255.0
-	prepare_vision_frame = numpy.subtract(prepare_vision_frame, numpy.array([ 0.485, 0.456, 0.406 ]).astype(numpy.float32))
-	prepare_vision_frame = numpy.divide(prepare_vision_frame, numpy.array([ 0.229, 0.224, 0.225 ]).astype(numpy.float32))
-	prepare_vision_frame = numpy.expand_dims(prepare_vision_frame, axis = 0)
-	prepare_vision_frame = prepare_vision_frame.transpose(0, 3, 1, 2)
-	region_mask = forward_parse_face(prepare_vision_frame)
-	region_mask = numpy.isin(region_mask.argmax(0), [ facefusion.choices.face_mask_region_set.get(face_mask_region) for face_mask_region in face_mask_regions ])
-	region_mask = cv2.resize(region_mask.astype(numpy.float32), crop_vision_frame.shape[:2][::-1])
-	region_mask = (cv2.GaussianBlur(region_mask.clip(0, 1), (0, 0), 5).clip(0.5, 1) - 0.5) * 2
+	mask_key = create_mask_key(crop_vision_frame, [ model_name ] + face_mask_regions)
+	region_mask = get_face_mask(mask_key)
+
+	if region_mask is None:
+		prepare_vision_frame = cv2.resize(crop_vision_frame, model_size)
+		prepare_vision_frame = prepare_vision_frame[:, :, ::-1].astype(numpy.float32) / 255.0
+		prepare_vision_frame = numpy.subtract(prepare_vision_frame, numpy.array([ 0.485, 0.456, 0.406 ]).astype(numpy.float32))
+		prepare_vision_frame = numpy.divide(prepare_vision_frame, numpy.array([ 0.229, 0.224, 0.225 ]).astype(numpy.float32))
+		prepare_vision_frame = numpy.expand_dims(prepare_vision_frame, axis = 0)
+		prepare_vision_frame = prepare_vision_frame.transpose(0, 3, 1, 2)
+		region_mask = forward_parse_face(prepare_vision_frame)
+		region_mask = numpy.isin(region_mask.argmax(0), [ facefusion.choices.face_mask_region_set.get(face_mask_region) for face_mask_region in face_mask_regions ])
+		region_mask = cv2.resize(region_mask.astype(numpy.float32), crop_vision_frame.shape[:2][::-1])
+		region_mask = refine_face_mask(region_mask)
+		region_mask = set_face_mask(mask_key, region_mask)
 	return region_mask
 
 
+def create_mask_key(crop_vision_frame : VisionFrame, mask_names : List[str]) -> str:
+	return create_hash(crop_vision_frame.tobytes()) + ':' + str(crop_vision_frame.shape) + ':' + ','.join(mask_names)
+
+
+def get_face_mask(mask_key : str) -> Optional[Mask]:
+	with FACE_MASK_LOCK:
+		return FACE_MASK_SET.get(mask_key)
+
+
+def set_face_mask(mask_key : str, face_mask : Mask) -> Mask:
+	face_mask.setflags(write = False)
+
+	with FACE_MASK_LOCK:
+		FACE_MASK_SET[mask_key] = face_mask
+
+		if len(FACE_MASK_SET) > FACE_MASK_LIMIT:
+			FACE_MASK_SET.pop(next(iter(FACE_MASK_SET)))
+	return face_mask
+
+
+def clear_face_mask_set() -> None:
+	with FACE_MASK_LOCK:
+		FACE_MASK_SET.clear()
+
+
 def forward_occlude_face(prepare_vision_frame : VisionFrame, model_name : str) -> Mask:
 	face_occluder = get_inference_pool().get(model_name)
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(face_occluder):
 		occlusion_mask : Mask = face_occluder.run(None,
 		{
 			'input': prepare_vision_frame
@@ -270,7 +348,7 @@ def forward_parse_face(prepare_vision_frame : VisionFrame) -> Mask:
 	model_name = state_manager.get_item('face_parser_model')
 	face_parser = get_inference_pool().get(model_name)
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(face_parser):
 		region_mask : Mask = face_parser.run(None,
 		{
 			'input': prepare_vision_frame
@@ -84,7 +84,7 @@ def calculate_face_embedding(temp_vision_frame : VisionFrame, face_landmark_5 :
 def forward(crop_vision_frame : VisionFrame) -> Embedding:
 	face_recognizer = get_inference_pool().get('face_recognizer')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(face_recognizer):
 		face_embedding = face_recognizer.run(None,
 		{
 			'input': crop_vision_frame
@@ -1,10 +1,13 @@
-from typing import List
+from typing import Any, List, Optional
 
 import numpy
+from numpy.typing import NDArray
 
 from facefusion import state_manager
+from facefusion.common_helper import get_first
 from facefusion.face_analyser import get_many_faces, get_one_face
-from facefusion.types import Face, FaceSelectorOrder, Gender, Race, Score, VisionFrame
+from facefusion.face_store import get_reference_faces, set_reference_faces
+from facefusion.types import Embedding, Face, FaceSelectorOrder, Gender, Mask, Race, VisionFrame
 
 
 def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : VisionFrame) -> List[Face]:
@@ -19,9 +22,7 @@ def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : Vis
 			return [ target_face ]
 
 	if state_manager.get_item('face_selector_mode') == 'reference':
-		reference_faces = get_many_faces([ reference_vision_frame ])
-		reference_faces = sort_and_filter_faces(reference_faces)
-		reference_face = get_one_face(reference_faces, state_manager.get_item('reference_face_position'))
+		reference_face = get_reference_face(reference_vision_frame)
 		if reference_face:
 			match_faces = find_match_faces([ reference_face ], target_faces, state_manager.get_item('reference_face_distance'))
 			return match_faces
@@ -29,28 +30,67 @@ def select_faces(reference_vision_frame : VisionFrame, target_vision_frame : Vis
 	return []
 
 
+def get_reference_face(reference_vision_frame : VisionFrame) -> Optional[Face]:
+	reference_key = create_reference_key(reference_vision_frame)
+	reference_faces = get_reference_faces(reference_key)
+
+	if reference_faces is None:
+		reference_faces = get_many_faces([ reference_vision_frame ])
+		reference_faces = sort_and_filter_faces(reference_faces)
+		reference_face = get_one_face(reference_faces, state_manager.get_item('reference_face_position'))
+		reference_faces = [ reference_face ] if reference_face else []
+		set_reference_faces(reference_key, reference_faces)
+
+	return get_first(reference_faces)
+
+
+def create_reference_key(reference_vision_frame : VisionFrame) -> str:
+	reference_keys =\
+	[
+		state_manager.get_item('target_path'),
+		state_manager.get_item('reference_frame_number'),
+		state_manager.get_item('reference_face_position'),
+		state_manager.get_item('face_detector_model'),
+		state_manager.get_item('face_detector_size'),
+		state_manager.get_item('face_detector_margin'),
+		state_manager.get_item('face_detector_angles'),
+		state_manager.get_item('face_detector_score'),
+		state_manager.get_item('face_landmarker_model'),
+		state_manager.get_item('face_landmarker_score'),
+		state_manager.get_item('face_alignment_method'),
+		state_manager.get_item('face_selector_order'),
+		state_manager.get_item('face_selector_gender'),
+		state_manager.get_item('face_selector_race'),
+		state_manager.get_item('face_selector_age_start'),
+		state_manager.get_item('face_selector_age_end'),
+		reference_vision_frame.shape
+	]
+	return str(reference_keys)
+
+
 def find_match_faces(reference_faces : List[Face], target_faces : List[Face], face_distance : float) -> List[Face]:
 	match_faces : List[Face] = []
+	reference_faces = [ reference_face for reference_face in reference_faces if reference_face ]
 
-	for reference_face in reference_faces:
-		if reference_face:
-			for index, target_face in enumerate(target_faces):
-				if compare_faces(target_face, reference_face, face_distance):
-					match_faces.append(target_faces[index])
+	if reference_faces and target_faces:
+		reference_embeddings = stack_face_embeddings(reference_faces)
+		target_embeddings = stack_face_embeddings(target_faces)
+		face_distances = calculate_face_distances(reference_embeddings, target_embeddings)
+
+		for _, target_index in numpy.argwhere(face_distances < face_distance):
+			match_faces.append(target_faces[target_index])
 
 	return match_faces
 
 
-def compare_faces(face : Face, reference_face : Face, face_distance : float) -> bool:
-	current_face_distance = calculate_face_distance(face, reference_face)
-	current_face_distance = float(numpy.interp(current_face_distance, [ 0, 2 ], [ 0, 1 ]))
-	return current_face_distance < face_distance
+def stack_face_embeddings(faces : List[Face]) -> Embedding:
+	return numpy.stack([ face.embedding_norm for face in faces ])
 
 
-def calculate_face_distance(face : Face, reference_face : Face) -> float:
-	if hasattr(face, 'embedding_norm') and hasattr(reference_face, 'embedding_norm'):
-		return 1 - numpy.dot(face.embedding_norm, reference_face.embedding_norm)
-	return 0
+def calculate_face_distances(reference_embeddings : Embedding, target_embeddings : Embedding) -> NDArray[Any]:
+	face_distances = 1 - numpy.dot(reference_embeddings, target_embeddings.T)
+	face_distances = numpy.clip(face_distances, 0, 2) / 2
+	return face_distances
 
 
 def sort_and_filter_faces(faces : List[Face]) -> List[Face]:
@@ -67,64 +107,43 @@ def sort_and_filter_faces(faces : List[Face]) -> List[Face]:
 
 
 def sort_faces_by_order(faces : List[Face], order : FaceSelectorOrder) -> List[Face]:
-	if order == 'left-right':
-		return sorted(faces, key = get_bounding_box_left)
-	if order == 'right-left':
-		return sorted(faces, key = get_bounding_box_left, reverse = True)
-	if order == 'top-bottom':
-		return sorted(faces, key = get_bounding_box_top)
-	if order == 'bottom-top':
-		return sorted(faces, key = get_bounding_box_top, reverse = True)
-	if order == 'small-large':
-		return sorted(faces, key = get_bounding_box_area)
-	if order == 'large-small':
-		return sorted(faces, key = get_bounding_box_area, reverse = True)
-	if order == 'best-worst':
-		return sorted(faces, key = get_face_detector_score, reverse = True)
-	if order == 'worst-best':
-		return sorted(faces, key = get_face_detector_score)
-	return faces
-
-
-def get_bounding_box_left(face : Face) -> float:
-	return face.bounding_box[0]
-
+	face_keys = get_face_order_keys(faces, order)
 
-def get_bounding_box_top(face : Face) -> float:
-	return face.bounding_box[1]
+	if face_keys is not None:
+		if order in [ 'right-left', 'bottom-top', 'large-small', 'best-worst' ]:
+			face_keys = -face_keys
+		return [ faces[index] for index in numpy.argsort(face_keys, kind = 'stable') ]
+	return faces
 
 
-def get_bounding_box_area(face : Face) -> float:
-	return (face.bounding_box[2] - face.bounding_box[0]) * (face.bounding_box[3] - face.bounding_box[1])
+def get_face_order_keys(faces : List[Face], order : FaceSelectorOrder) -> Optional[NDArray[Any]]:
+	if order in [ 'left-right', 'right-left' ]:
+		return numpy.array([ face.bounding_box[0] for face in faces ])
+	if order in [ 'top-bottom', 'bottom-top' ]:
+		return numpy.array([ face.bounding_box[1] for face in faces ])
+	if order in [ 'small-large', 'large-small' ]:
+		bounding_boxes = numpy.array([ face.bounding_box[:4] for face in faces ])
+		return (bounding_boxes[:, 2] - bounding_boxes[:, 0]) * (bounding_boxes[:, 3] - bounding_boxes[:, 1])
+	if order in [ 'best-worst', 'worst-best' ]:
+		return numpy.array([ face.score_set.get('detector') for face in faces ])
+	return None
 
 
-def get_face_detector_score(face : Face) -> Score:
-	return face.score_set.get('detector')
+def filter_faces_by_mask(faces : List[Face], face_mask : Mask) -> List[Face]:
+	return [ faces[index] for index in numpy.flatnonzero(face_mask) ]
 
 
 def filter_faces_by_gender(faces : List[Face], gender : Gender) -> List[Face]:
-	filter_faces = []
-
-	for face in faces:
-		if face.gender == gender:
-			filter_faces.append(face)
-	return filter_faces
+	face_genders = numpy.array([ face.gender for face in faces ])
+	return filter_faces_by_mask(faces, face_genders == gender)
 
 
 def filter_faces_by_age(faces : List[Face], face_selector_age_start : int, face_selector_age_end : int) -> List[Face]:
-	filter_faces = []
-	age = range(face_selector_age_start, face_selector_age_end)
-
-	for face in faces:
-		if set(face.age) & set(age):
-			filter_faces.append(face)
-	return filter_faces
+	face_ages = numpy.array([ (face.age.start, face.age.stop) for face in faces ]).reshape(-1, 2)
+	face_mask = (face_ages[:, 0] < face_ages[:, 1]) & (face_ages[:, 0] < face_selector_age_end) & (face_selector_age_start < face_ages[:, 1]) & (face_selector_age_start < face_selector_age_end)
+	return filter_faces_by_mask(faces, face_mask)
 
 
 def filter_faces_by_race(faces : List[Face], race : Race) -> List[Face]:
-	filter_faces = []
-
-	for face in faces:
-		if face.race == race:
-			filter_faces.append(face)
-	return filter_faces
+	face_races = numpy.array([ face.race for face in faces ])
+	return filter_faces_by_mask(faces, face_races == race)
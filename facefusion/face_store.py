@@ -1,12 +1,24 @@
+import os
+import tempfile
+import threading
 from typing import List, Optional
 
-from facefusion.hash_helper import create_hash
-from facefusion.types import Face, FaceStore, VisionFrame
+import numpy
+
+from facefusion import process_manager, state_manager
+from facefusion.filesystem import create_directory, is_file
+from facefusion.hash_helper import create_hash, create_strong_hash
+from facefusion.types import Face, FaceIndex, FaceSet, FaceStore, VisionFrame
+from facefusion.video_store import get_video_hash
 
 FACE_STORE : FaceStore =\
 {
-	'static_faces': {}
+	'static_faces': {},
+	'reference_faces': {},
+	'face_index': {},
+	'face_index_frames': {}
 }
+FACE_STORE_LOCK : threading.Lock = threading.Lock()
 
 
 def get_face_store() -> FaceStore:
@@ -14,15 +26,163 @@ def get_face_store() -> FaceStore:
 
 
 def get_static_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
-	vision_hash = create_hash(vision_frame.tobytes())
-	return FACE_STORE.get('static_faces').get(vision_hash)
+	vision_hash = create_strong_hash(vision_frame.tobytes())
+
+	with FACE_STORE_LOCK:
+		static_faces = FACE_STORE.get('static_faces').get(vision_hash)
+
+		if static_faces is None and vision_hash in FACE_STORE.get('face_index_frames'):
+			face_start, face_end = FACE_STORE.get('face_index_frames').get(vision_hash)
+			static_faces = unpack_faces(FACE_STORE.get('face_index'), face_start, face_end)
+			FACE_STORE['static_faces'][vision_hash] = static_faces
+
+	return static_faces
 
 
 def set_static_faces(vision_frame : VisionFrame, faces : List[Face]) -> None:
-	vision_hash = create_hash(vision_frame.tobytes())
+	vision_hash = create_strong_hash(vision_frame.tobytes())
 	if vision_hash:
-		FACE_STORE['static_faces'][vision_hash] = faces
+		with FACE_STORE_LOCK:
+			FACE_STORE['static_faces'][vision_hash] = faces
+
+
+def get_reference_faces(reference_key : str) -> Optional[List[Face]]:
+	return FACE_STORE.get('reference_faces').get(reference_key)
+
+
+def set_reference_faces(reference_key : str, faces : List[Face]) -> None:
+	with FACE_STORE_LOCK:
+		FACE_STORE['reference_faces'].clear()
+		FACE_STORE['reference_faces'][reference_key] = faces
 
 
 def clear_static_faces() -> None:
-	FACE_STORE['static_faces'].clear()
+	with FACE_STORE_LOCK:
+		FACE_STORE['static_faces'].clear()
+		FACE_STORE['reference_faces'].clear()
+		FACE_STORE['face_index'].clear()
+		FACE_STORE['face_index_frames'].clear()
+
+
+def resolve_face_index_path(video_path : str) -> Optional[str]:
+	video_hash = get_video_hash(video_path)
+
+	if video_hash:
+		temp_path = state_manager.get_item('temp_path') or tempfile.gettempdir()
+		face_analyser_settings =\
+		[
+			state_manager.get_item('face_detector_model'),
+			state_manager.get_item('face_detector_size'),
+			state_manager.get_item('face_detector_margin'),
+			state_manager.get_item('face_detector_angles'),
+			state_manager.get_item('face_detector_score'),
+			state_manager.get_item('face_landmarker_model'),
+			state_manager.get_item('face_landmarker_score'),
+			state_manager.get_item('face_alignment_method')
+		]
+		face_analyser_hash = create_hash(str(face_analyser_settings).encode())
+		return os.path.join(temp_path, 'facefusion', 'faces', video_hash + '-' + face_analyser_hash + '.npz')
+	return None
+
+
+def load_face_index(face_index_path : Optional[str]) -> bool:
+	if process_manager.count_process_scopes() > 1:
+		return False
+
+	with FACE_STORE_LOCK:
+		FACE_STORE['face_index'].clear()
+		FACE_STORE['face_index_frames'].clear()
+
+		if is_file(face_index_path):
+			with numpy.load(face_index_path, allow_pickle = False) as face_index:
+				FACE_STORE['face_index'].update({ key: face_index[key] for key in face_index.files })
+
+			frame_hashes = FACE_STORE.get('face_index').get('frame_hashes')
+			face_ends = numpy.cumsum(FACE_STORE.get('face_index').get('frame_face_totals'))
+			face_starts = face_ends - FACE_STORE.get('face_index').get('frame_face_totals')
+
+			for frame_hash, face_start, face_end in zip(frame_hashes, face_starts, face_ends):
+				FACE_STORE['face_index_frames'][str(frame_hash)] = (int(face_start), int(face_end))
+			return True
+	return False
+
+
+def save_face_index(face_index_path : Optional[str]) -> bool:
+	if process_manager.count_process_scopes() > 1:
+		return False
+
+	with FACE_STORE_LOCK:
+		static_faces = FACE_STORE.get('static_faces')
+
+		if set(static_faces).issubset(FACE_STORE.get('face_index_frames')):
+			return True
+
+		if face_index_path and create_directory(os.path.dirname(face_index_path)):
+			face_set : FaceSet = {}
+			temp_face_index_path = face_index_path + '.' + str(os.getpid()) + '.tmp'
+
+			for frame_hash, (face_start, face_end) in FACE_STORE.get('face_index_frames').items():
+				face_set[frame_hash] = unpack_faces(FACE_STORE.get('face_index'), face_start, face_end)
+			face_set.update(static_faces)
+
+			with open(temp_face_index_path, 'wb') as face_index_file:
+				numpy.savez(face_index_file, **pack_faces(face_set)) #type:ignore[arg-type]
+			os.replace(temp_face_index_path, face_index_path)
+			return True
+	return False
+
+
+def pack_faces(face_set : FaceSet) -> FaceIndex:
+	faces = [ face for frame_faces in face_set.values() for face in frame_faces ]
+	face_index : FaceIndex =\
+	{
+		'frame_hashes': numpy.array(list(face_set.keys()), dtype = str),
+		'frame_face_totals': numpy.array([ len(frame_faces) for frame_faces in face_set.values() ], dtype = numpy.int64)
+	}
+
+	if faces:
+		face_index.update(
+		{
+			'bounding_boxes': numpy.stack([ face.bounding_box for face in faces ]),
+			'detector_scores': numpy.array([ face.score_set.get('detector') for face in faces ]),
+			'landmarker_scores': numpy.array([ face.score_set.get('landmarker') for face in faces ]),
+			'landmarks_5': numpy.stack([ face.landmark_set.get('5') for face in faces ]),
+			'landmarks_5_68': numpy.stack([ face.landmark_set.get('5/68') for face in faces ]),
+			'landmarks_68': numpy.stack([ face.landmark_set.get('68') for face in faces ]),
+			'landmarks_68_5': numpy.stack([ face.landmark_set.get('68/5') for face in faces ]),
+			'angles': numpy.array([ face.angle for face in faces ]),
+			'embeddings': numpy.stack([ face.embedding for face in faces ]),
+			'embeddings_norm': numpy.stack([ face.embedding_norm for face in faces ]),
+			'genders': numpy.array([ face.gender for face in faces ], dtype = str),
+			'ages': numpy.array([ (face.age.start, face.age.stop) for face in faces ]),
+			'races': numpy.array([ face.race for face in faces ], dtype = str)
+		})
+	return face_index
+
+
+def unpack_faces(face_index : FaceIndex, face_start : int, face_end : int) -> List[Face]:
+	faces = []
+
+	for index in range(face_start, face_end):
+		faces.append(Face(
+			bounding_box = face_index.get('bounding_boxes')[index],
+			score_set =
+			{
+				'detector': face_index.get('detector_scores')[index],
+				'landmarker': face_index.get('landmarker_scores')[index]
+			},
+			landmark_set =
+			{
+				'5': face_index.get('landmarks_5')[index],
+				'5/68': face_index.get('landmarks_5_68')[index],
+				'68': face_index.get('landmarks_68')[index],
+				'68/5': face_index.get('landmarks_68_5')[index]
+			},
+			angle = int(face_index.get('angles')[index]),
+			embedding = face_index.get('embeddings')[index],
+			embedding_norm = face_index.get('embeddings_norm')[index],
+			gender = str(face_index.get('genders')[index]),
+			age = range(*face_index.get('ages')[index].tolist()),
+			race = str(face_index.get('races')[index])
+		))
+	return faces
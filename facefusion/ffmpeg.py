@@ -157,6 +157,14 @@ def finalize_image(target_path : str, output_path : str, output_image_resolution
 
 
 def read_audio_buffer(target_path : str, audio_sample_rate : int, audio_sample_size : int, audio_channel_total : int) -> Optional[AudioBuffer]:
+	process = open_audio_stream(target_path, audio_sample_rate, audio_sample_size, audio_channel_total)
+	audio_buffer, _ = process.communicate()
+	if process.returncode == 0:
+		return audio_buffer
+	return None
+
+
+def open_audio_stream(target_path : str, audio_sample_rate : int, audio_sample_size : int, audio_channel_total : int) -> subprocess.Popen[bytes]:
 	commands = ffmpeg_builder.chain(
 		ffmpeg_builder.set_input(target_path),
 		ffmpeg_builder.ignore_video_stream(),
@@ -165,12 +173,7 @@ def read_audio_buffer(target_path : str, audio_sample_rate : int, audio_sample_s
 		ffmpeg_builder.set_audio_channel_total(audio_channel_total),
 		ffmpeg_builder.cast_stream()
 	)
-
-	process = open_ffmpeg(commands)
-	audio_buffer, _ = process.communicate()
-	if process.returncode == 0:
-		return audio_buffer
-	return None
+	return open_ffmpeg(commands)
 
 
 def restore_audio(target_path : str, output_path : str, trim_frame_start : int, trim_frame_end : int) -> bool:
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import zlib
 from typing import Optional
@@ -9,6 +10,22 @@ def create_hash(content : bytes) -> str:
 	return format(zlib.crc32(content), '08x')
 
 
+def create_strong_hash(content : bytes) -> str:
+	return hashlib.blake2b(content, digest_size = 16).hexdigest()
+
+
+def create_file_hash(file_path : str) -> Optional[str]:
+	if is_file(file_path):
+		file_hash = hashlib.sha256()
+
+		with open(file_path, 'rb') as file:
+			while file_chunk := file.read(1024 * 1024):
+				file_hash.update(file_chunk)
+
+		return file_hash.hexdigest()
+	return None
+
+
 def validate_hash(validate_path : str) -> bool:
 	hash_path = get_hash_path(validate_path)
 
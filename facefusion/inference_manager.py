@@ -1,5 +1,6 @@
 import importlib
 import random
+import threading
 from time import sleep, time
 from typing import List
 
@@ -19,6 +20,7 @@ INFERENCE_POOL_SET : InferencePoolSet =\
 	'cli': {},
 	'ui': {}
 }
+INFERENCE_POOL_LOCK : threading.Lock = threading.Lock()
 
 
 def get_inference_pool(module_name : str, model_names : List[str], model_source_set : DownloadSet) -> InferencePool:
@@ -36,7 +38,9 @@ def get_inference_pool(module_name : str, model_names : List[str], model_source_
 		if app_context == 'ui' and INFERENCE_POOL_SET.get('cli').get(inference_context):
 			INFERENCE_POOL_SET['ui'][inference_context] = INFERENCE_POOL_SET.get('cli').get(inference_context)
 		if not INFERENCE_POOL_SET.get(app_context).get(inference_context):
-			INFERENCE_POOL_SET[app_context][inference_context] = create_inference_pool(model_source_set, execution_device_id, execution_providers)
+			with INFERENCE_POOL_LOCK:
+				if not INFERENCE_POOL_SET.get(app_context).get(inference_context):
+					INFERENCE_POOL_SET[app_context][inference_context] = create_inference_pool(model_source_set, execution_device_id, execution_providers)
 
 	current_inference_context = get_inference_context(module_name, model_names, random.choice(execution_device_ids), execution_providers)
 	return INFERENCE_POOL_SET.get(app_context).get(current_inference_context)
@@ -54,6 +58,9 @@ def create_inference_pool(model_source_set : DownloadSet, execution_device_id :
 
 
 def clear_inference_pool(module_name : str, model_names : List[str]) -> None:
+	if process_manager.count_process_scopes() > 1:
+		return
+
 	execution_device_ids = state_manager.get_item('execution_device_ids')
 	execution_providers = resolve_execution_providers(module_name)
 	app_context = detect_app_context()
@@ -82,6 +89,11 @@ def create_inference_session(model_path : str, execution_device_id : int, execut
 		fatal_exit(1)
 
 
+def has_dynamic_batch(inference_session : InferenceSession) -> bool:
+	inference_nodes = inference_session.get_inputs() + inference_session.get_outputs()
+	return all(inference_node.shape and not isinstance(inference_node.shape[0], int) for inference_node in inference_nodes)
+
+
 def get_inference_context(module_name : str, model_names : List[str], execution_device_id : int, execution_providers : List[ExecutionProvider]) -> str:
 	inference_context = '.'.join([ module_name ] + model_names + [ str(execution_device_id) ] + list(execution_providers))
 	return inference_context
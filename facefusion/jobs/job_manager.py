@@ -1,4 +1,5 @@
 import os
+import threading
 from copy import copy
 from typing import List, Optional
 
@@ -10,6 +11,7 @@ from facefusion.time_helper import get_current_date_time
 from facefusion.types import Args, Job, JobSet, JobStatus, JobStep, JobStepStatus
 
 JOBS_PATH : Optional[str] = None
+JOB_LOCK : threading.RLock = threading.RLock()
 
 
 def init_jobs(jobs_path : str) -> bool:
@@ -184,29 +186,33 @@ def count_step_total(job_id : str) -> int:
 
 
 def set_step_status(job_id : str, step_index : int, step_status : JobStepStatus) -> bool:
-	job = read_job_file(job_id)
-
-	if job:
-		steps = job.get('steps')
-		if has_step(job_id, step_index):
-			steps[step_index]['status'] = step_status
-			return update_job_file(job_id, job)
+	with JOB_LOCK:
+		job = read_job_file(job_id)
+
+		if job:
+			steps = job.get('steps')
+			if has_step(job_id, step_index):
+				steps[step_index]['status'] = step_status
+				return update_job_file(job_id, job)
 	return False
 
 
 def set_steps_status(job_id : str, step_status : JobStepStatus) -> bool:
-	job = read_job_file(job_id)
+	with JOB_LOCK:
+		job = read_job_file(job_id)
 
-	if job:
-		for step in job.get('steps'):
-			step['status'] = step_status
-		return update_job_file(job_id, job)
+		if job:
+			for step in job.get('steps'):
+				step['status'] = step_status
+			return update_job_file(job_id, job)
 	return False
 
 
 def read_job_file(job_id : str) -> Optional[Job]:
 	job_path = find_job_path(job_id)
-	return read_json(job_path) #type:ignore[return-value]
+
+	with JOB_LOCK:
+		return read_json(job_path) #type:ignore[return-value]
 
 
 def create_job_file(job_id : str, job : Job) -> bool:
@@ -223,7 +229,9 @@ def update_job_file(job_id : str, job : Job) -> bool:
 
 	if is_file(job_path):
 		job['date_updated'] = get_current_date_time().isoformat()
-		return write_json(job_path, job) #type:ignore[arg-type]
+
+		with JOB_LOCK:
+			return write_json(job_path, job) #type:ignore[arg-type]
 	return False
 
 
@@ -1,7 +1,17 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from functools import lru_cache, partial
+from typing import Callable, Dict, List, Sequence
+
+from facefusion import process_manager, state_manager
 from facefusion.ffmpeg import concat_video
-from facefusion.filesystem import are_images, are_videos, move_file, remove_file
+from facefusion.filesystem import are_images, are_videos, get_file_name, move_file, remove_file
 from facefusion.jobs import job_helper, job_manager
-from facefusion.types import JobOutputSet, JobStep, ProcessStep
+from facefusion.types import JobOutputSet, JobStep, JobStepDependencies, ProcessStep
+
+STEP_LOCK : threading.Lock = threading.Lock()
+STEP_PATH_LOCK_SET : Dict[str, threading.Lock] = {}
 
 
 def run_job(job_id : str, process_step : ProcessStep) -> bool:
@@ -18,15 +28,10 @@ def run_job(job_id : str, process_step : ProcessStep) -> bool:
 
 def run_jobs(process_step : ProcessStep, halt_on_error : bool) -> bool:
 	queued_job_ids = job_manager.find_job_ids('queued')
-	has_error = False
 
 	if queued_job_ids:
-		for job_id in queued_job_ids:
-			if not run_job(job_id, process_step):
-				has_error = True
-				if halt_on_error:
-					return False
-		return not has_error
+		run_methods = [ partial(run_job, job_id, process_step) for job_id in queued_job_ids ]
+		return run_pool(run_methods, {}, halt_on_error)
 	return False
 
 
@@ -40,15 +45,10 @@ def retry_job(job_id : str, process_step : ProcessStep) -> bool:
 
 def retry_jobs(process_step : ProcessStep, halt_on_error : bool) -> bool:
 	failed_job_ids = job_manager.find_job_ids('failed')
-	has_error = False
 
 	if failed_job_ids:
-		for job_id in failed_job_ids:
-			if not retry_job(job_id, process_step):
-				has_error = True
-				if halt_on_error:
-					return False
-		return not has_error
+		run_methods = [ partial(retry_job, job_id, process_step) for job_id in failed_job_ids ]
+		return run_pool(run_methods, {}, halt_on_error)
 	return False
 
 
@@ -68,13 +68,102 @@ def run_steps(job_id : str, process_step : ProcessStep) -> bool:
 	steps = job_manager.get_steps(job_id)
 
 	if steps:
-		for index, step in enumerate(steps):
-			if not run_step(job_id, index, step, process_step):
-				return False
-		return True
+		run_methods = [ partial(run_scoped_step, job_id, index, step, process_step) for index, step in enumerate(steps) ]
+		step_dependencies = collect_step_dependencies(job_id, steps)
+		return run_pool(run_methods, step_dependencies, True)
 	return False
 
 
+def run_scoped_step(job_id : str, step_index : int, step : JobStep, process_step : ProcessStep) -> bool:
+	job_concurrency = get_job_concurrency()
+
+	if job_concurrency > 1:
+		step_paths = collect_step_paths(job_id, step_index, step)
+
+		with ExitStack() as exit_stack:
+			for step_path_lock in resolve_step_path_locks(step_paths):
+				exit_stack.enter_context(step_path_lock)
+
+			with get_step_semaphore(job_concurrency), state_manager.scope_state(), process_manager.scope_process():
+				return run_step(job_id, step_index, step, process_step)
+	return run_step(job_id, step_index, step, process_step)
+
+
+def run_pool(run_methods : Sequence[Callable[[], bool]], step_dependencies : JobStepDependencies, halt_on_error : bool) -> bool:
+	job_concurrency = get_job_concurrency()
+	has_error = False
+
+	if job_concurrency > 1:
+		pending_indices = list(range(len(run_methods)))
+		completed_indices : List[int] = []
+		future_set : Dict[Future[bool], int] = {}
+
+		with ThreadPoolExecutor(max_workers = job_concurrency, initializer = state_manager.bind_scope_state, initargs = (state_manager.get_scope_state(),)) as executor:
+			while pending_indices or future_set:
+				if not has_error or not halt_on_error:
+					for pending_index in list(pending_indices):
+						if len(future_set) < job_concurrency and all(step_index in completed_indices for step_index in step_dependencies.get(pending_index, [])):
+							future_set[executor.submit(run_methods[pending_index])] = pending_index
+							pending_indices.remove(pending_index)
+
+				if not future_set:
+					break
+
+				done_futures, _ = wait(future_set, return_when = FIRST_COMPLETED)
+
+				for future in done_futures:
+					if future.result():
+						completed_indices.append(future_set.pop(future))
+					else:
+						future_set.pop(future)
+						has_error = True
+
+		return not has_error and not pending_indices
+
+	for run_method in run_methods:
+		if not run_method():
+			has_error = True
+			if halt_on_error:
+				return False
+	return not has_error
+
+
+def get_job_concurrency() -> int:
+	return state_manager.get_item('job_concurrency') or 1
+
+
+@lru_cache(maxsize = None)
+def get_step_semaphore(job_concurrency : int) -> threading.Semaphore:
+	return threading.Semaphore(job_concurrency)
+
+
+def collect_step_dependencies(job_id : str, steps : List[JobStep]) -> JobStepDependencies:
+	step_dependencies : JobStepDependencies = {}
+	step_paths_list = [ collect_step_paths(job_id, index, step) for index, step in enumerate(steps) ]
+
+	for index, step_paths in enumerate(step_paths_list):
+		step_dependencies[index] = [ step_index for step_index in range(index) if set(step_paths) & set(step_paths_list[step_index]) ]
+	return step_dependencies
+
+
+def collect_step_paths(job_id : str, step_index : int, step : JobStep) -> List[str]:
+	step_args = step.get('args')
+	target_path = step_args.get('target_path')
+	output_path = step_args.get('output_path')
+	step_output_path = job_helper.get_step_output_path(job_id, step_index, output_path)
+	step_paths = []
+
+	for step_path in [ target_path, output_path, step_output_path ]:
+		if step_path:
+			step_paths.append(get_file_name(step_path))
+	return step_paths
+
+
+def resolve_step_path_locks(step_paths : List[str]) -> List[threading.Lock]:
+	with STEP_LOCK:
+		return [ STEP_PATH_LOCK_SET.setdefault(step_path, threading.Lock()) for step_path in sorted(set(step_paths)) ]
+
+
 def finalize_steps(job_id : str) -> bool:
 	output_set = collect_output_set(job_id)
 
@@ -12,6 +12,8 @@ LOCALES : Locales =\
 		'extracting_frames': 'extracting frames with a resolution of {resolution} and {fps} frames per second',
 		'extracting_frames_succeeded': 'extracting frames succeeded',
 		'extracting_frames_failed': 'extracting frames failed',
+		'detecting_scenes': 'detecting scenes',
+		'detecting_scenes_succeeded': 'detecting scenes succeeded with {scene_total} scenes',
 		'analysing': 'analysing',
 		'extracting': 'extracting',
 		'streaming': 'streaming',
@@ -115,6 +117,7 @@ LOCALES : Locales =\
 			'face_detector_score': 'filter the detected faces based on the confidence score',
 			'face_landmarker_model': 'choose the model responsible for detecting the face landmarks',
 			'face_landmarker_score': 'filter the detected face landmarks based on the confidence score',
+			'face_alignment_method': 'choose the method to estimate the face alignment from the landmarks',
 			'face_selector_mode': 'use reference based tracking or simple matching',
 			'face_selector_order': 'specify the order of the detected faces',
 			'face_selector_age_start': 'filter the detected faces based on the starting age',
@@ -135,6 +138,7 @@ LOCALES : Locales =\
 			'trim_frame_start': 'specify the starting frame of the target video',
 			'trim_frame_end': 'specify the ending frame of the target video',
 			'temp_frame_format': 'specify the temporary resources format',
+			'scene_cut_threshold': 'specify the frame difference that marks a scene cut, zero disables the scene detection',
 			'keep_temp': 'keep the temporary resources after processing',
 			'output_image_quality': 'specify the image quality which translates to the image compression',
 			'output_image_scale': 'specify the image scale based on the target image',
@@ -160,6 +164,8 @@ LOCALES : Locales =\
 			'execution_device_ids': 'specify the devices used for processing',
 			'execution_providers': 'inference using different providers (choices: {choices}, ...)',
 			'execution_thread_count': 'specify the amount of parallel threads while processing',
+			'execution_session_limit': 'specify the amount of parallel runs per inference session',
+			'job_concurrency': 'specify the amount of jobs and steps that are processed in parallel',
 			'video_memory_strategy': 'balance fast processing and low VRAM usage',
 			'system_memory_limit': 'limit the available RAM that can be used while processing',
 			'log_level': 'adjust the message severity displayed in the terminal',
@@ -1,16 +1,47 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
 from facefusion.types import ProcessState
 
 PROCESS_STATE : ProcessState = 'pending'
+PROCESS_STATE_SET : Dict[int, ProcessState] = {}
+PROCESS_LOCK : threading.Lock = threading.Lock()
 
 
 def get_process_state() -> ProcessState:
-	return PROCESS_STATE
+	return PROCESS_STATE_SET.get(threading.get_ident(), PROCESS_STATE)
 
 
 def set_process_state(process_state : ProcessState) -> None:
 	global PROCESS_STATE
+	thread_ident = threading.get_ident()
+
+	with PROCESS_LOCK:
+		if thread_ident in PROCESS_STATE_SET:
+			PROCESS_STATE_SET[thread_ident] = process_state
+
+			if 'processing' in PROCESS_STATE_SET.values():
+				process_state = 'processing'
+		PROCESS_STATE = process_state
+
+
+@contextmanager
+def scope_process() -> Iterator[None]:
+	thread_ident = threading.get_ident()
 
-	PROCESS_STATE = process_state
+	with PROCESS_LOCK:
+		PROCESS_STATE_SET[thread_ident] = 'pending'
+
+	try:
+		yield
+	finally:
+		with PROCESS_LOCK:
+			PROCESS_STATE_SET.pop(thread_ident)
+
+
+def count_process_scopes() -> int:
+	return len(PROCESS_STATE_SET)
 
 
 def is_checking() -> bool:
@@ -38,7 +69,12 @@ def start() -> None:
 
 
 def stop() -> None:
-	set_process_state('stopping')
+	global PROCESS_STATE
+
+	with PROCESS_LOCK:
+		for thread_ident in PROCESS_STATE_SET:
+			PROCESS_STATE_SET[thread_ident] = 'stopping'
+		PROCESS_STATE = 'stopping'
 
 
 def end() -> None:
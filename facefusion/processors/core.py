@@ -4,6 +4,7 @@ from typing import Any, List
 
 from facefusion import logger, translator
 from facefusion.exit_helper import hard_exit
+from facefusion.processors.types import ProcessorOutputs
 
 
 PROCESSORS_METHODS =\
@@ -42,3 +43,14 @@ def get_processors_modules(processors : List[str]) -> List[ModuleType]:
 		processor_module = load_processor_module(processor)
 		processor_modules.append(processor_module)
 	return processor_modules
+
+
+def get_frame_batch_size(processor_modules : List[ModuleType]) -> int:
+	frame_batch_sizes = [ processor_module.get_frame_batch_size() for processor_module in processor_modules if hasattr(processor_module, 'get_frame_batch_size') ]
+	return max(frame_batch_sizes, default = 1)
+
+
+def process_frames(processor_module : ModuleType, processor_inputs : List[Any]) -> List[ProcessorOutputs]:
+	if hasattr(processor_module, 'process_frames'):
+		return processor_module.process_frames(processor_inputs)
+	return [ processor_module.process_frame(processor_input) for processor_input in processor_inputs ]
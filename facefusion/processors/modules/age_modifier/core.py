@@ -12,8 +12,8 @@ from facefusion.common_helper import create_int_metavar, is_macos
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.execution import has_execution_provider
 from facefusion.face_analyser import scale_face
-from facefusion.face_helper import merge_matrix, paste_back, scale_face_landmark_5, warp_face_by_face_landmark_5
-from facefusion.face_masker import create_box_mask, create_occlusion_mask
+from facefusion.face_helper import estimate_matrix_by_face_landmark_5, merge_matrix, paste_back, scale_face_landmark_5, warp_face_by_face_landmark_5
+from facefusion.face_masker import create_box_mask, create_occlusion_mask, merge_crop_masks
 from facefusion.face_selector import select_faces
 from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from facefusion.processors.modules.age_modifier import choices as age_modifier_choices
@@ -22,7 +22,7 @@ from facefusion.processors.types import ProcessorOutputs
 from facefusion.program_helper import find_argument_group
 from facefusion.thread_helper import thread_semaphore
 from facefusion.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
-from facefusion.vision import match_frame_color, read_static_image, read_static_video_frame
+from facefusion.vision import clear_static_frames, match_frame_color
 
 
 @lru_cache()
@@ -118,8 +118,7 @@ def pre_process(mode : ProcessMode) -> bool:
 
 
 def post_process() -> None:
-	read_static_image.cache_clear()
-	read_static_video_frame.cache_clear()
+	clear_static_frames()
 	video_manager.clear_video_pool()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
@@ -136,10 +135,12 @@ def modify_age(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFra
 	model_templates = get_model_options().get('templates')
 	model_sizes = get_model_options().get('sizes')
 	face_landmark_5 = target_face.landmark_set.get('5/68').copy()
-	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_templates.get('target'), model_sizes.get('target'))
 	extend_face_landmark_5 = scale_face_landmark_5(face_landmark_5, 0.875)
 	extend_vision_frame, extend_affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, extend_face_landmark_5, model_templates.get('target_with_background'), model_sizes.get('target_with_background'))
-	extend_vision_frame_raw = extend_vision_frame.copy()
+	affine_matrix = estimate_matrix_by_face_landmark_5(face_landmark_5, model_templates.get('target'), model_sizes.get('target'))
+	crop_affine_matrix = merge_matrix([ cv2.invertAffineTransform(extend_affine_matrix), affine_matrix ])
+	crop_vision_frame = cv2.warpAffine(extend_vision_frame, crop_affine_matrix, model_sizes.get('target'), borderMode = cv2.BORDER_REPLICATE, flags = cv2.INTER_AREA)
+	extend_vision_frame_raw = extend_vision_frame
 	box_mask = create_box_mask(extend_vision_frame, state_manager.get_item('face_mask_blur'), (0, 0, 0, 0))
 	crop_masks =\
 	[
@@ -148,8 +149,7 @@ def modify_age(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFra
 
 	if 'occlusion' in state_manager.get_item('face_mask_types'):
 		occlusion_mask = create_occlusion_mask(crop_vision_frame)
-		temp_matrix = merge_matrix([ extend_affine_matrix, cv2.invertAffineTransform(affine_matrix) ])
-		occlusion_mask = cv2.warpAffine(occlusion_mask, temp_matrix, model_sizes.get('target_with_background'))
+		occlusion_mask = cv2.warpAffine(occlusion_mask, cv2.invertAffineTransform(crop_affine_matrix), model_sizes.get('target_with_background'))
 		crop_masks.append(occlusion_mask)
 
 	crop_vision_frame = prepare_vision_frame(crop_vision_frame)
@@ -158,10 +158,10 @@ def modify_age(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFra
 	extend_vision_frame = forward(crop_vision_frame, extend_vision_frame, age_modifier_direction)
 	extend_vision_frame = normalize_extend_frame(extend_vision_frame)
 	extend_vision_frame = match_frame_color(extend_vision_frame_raw, extend_vision_frame)
-	extend_affine_matrix *= (model_sizes.get('target')[0] * 4) / model_sizes.get('target_with_background')[0]
-	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
+	extend_affine_matrix = extend_affine_matrix * ((model_sizes.get('target')[0] * 4) / model_sizes.get('target_with_background')[0])
+	crop_mask = merge_crop_masks(crop_masks)
 	crop_mask = cv2.resize(crop_mask, (model_sizes.get('target')[0] * 4, model_sizes.get('target')[1] * 4))
-	paste_vision_frame = paste_back(temp_vision_frame, extend_vision_frame, crop_mask, extend_affine_matrix)
+	paste_vision_frame = paste_back(temp_vision_frame, extend_vision_frame, crop_mask, extend_affine_matrix, in_place = True)
 	return paste_vision_frame
 
 
@@ -180,16 +180,17 @@ def forward(crop_vision_frame : VisionFrame, extend_vision_frame : VisionFrame,
 		if age_modifier_input.name == 'direction':
 			age_modifier_inputs[age_modifier_input.name] = age_modifier_direction
 
-	with thread_semaphore():
+	with thread_semaphore(age_modifier):
 		crop_vision_frame = age_modifier.run(None, age_modifier_inputs)[0][0]
 
 	return crop_vision_frame
 
 
 def prepare_vision_frame(vision_frame : VisionFrame) -> VisionFrame:
-	vision_frame = vision_frame[:, :, ::-1] / 255.0
-	vision_frame = (vision_frame - 0.5) / 0.5
-	vision_frame = numpy.expand_dims(vision_frame.transpose(2, 0, 1), axis = 0).astype(numpy.float32)
+	vision_frame = numpy.ascontiguousarray(vision_frame[:, :, ::-1].transpose(2, 0, 1), dtype = numpy.float32)
+	vision_frame /= 127.5
+	vision_frame -= 1.0
+	vision_frame = numpy.expand_dims(vision_frame, axis = 0)
 	return vision_frame
 
 
@@ -8,7 +8,7 @@ import numpy
 import facefusion.jobs.job_manager
 import facefusion.jobs.job_store
 from facefusion import config, content_analyser, inference_manager, logger, state_manager, translator, video_manager
-from facefusion.common_helper import is_macos
+from facefusion.common_helper import create_int_metavar, is_macos
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.execution import has_execution_provider
 from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
@@ -17,10 +17,11 @@ from facefusion.processors.modules.background_remover import choices as backgrou
 from facefusion.processors.modules.background_remover.types import BackgroundRemoverInputs
 from facefusion.processors.types import ProcessorOutputs
 from facefusion.program_helper import find_argument_group
+from facefusion.reuse_store import clear_reuse_frames, resolve_reuse_frame
 from facefusion.sanitizer import sanitize_int_range
-from facefusion.thread_helper import thread_semaphore
+from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.types import ApplyStateItem, Args, DownloadScope, ExecutionProvider, InferencePool, Mask, ModelOptions, ModelSet, ProcessMode, VisionFrame
-from facefusion.vision import read_static_image, read_static_video_frame
+from facefusion.vision import clear_static_frames
 
 
 @lru_cache()
@@ -422,12 +423,14 @@ def register_args(program : ArgumentParser) -> None:
 	if group_processors:
 		group_processors.add_argument('--background-remover-model', help = translator.get('help.model', __package__), default = config.get_str_value('processors', 'background_remover_model', 'rmbg_2.0'), choices = background_remover_choices.background_remover_models)
 		group_processors.add_argument('--background-remover-color', help = translator.get('help.color', __package__), type = partial(sanitize_int_range, int_range = background_remover_choices.background_remover_color_range), default = config.get_int_list('processors', 'background_remover_color', '0 0 0 0'), nargs = '+')
-		facefusion.jobs.job_store.register_step_keys([ 'background_remover_model', 'background_remover_color' ])
+		group_processors.add_argument('--background-remover-reuse-threshold', help = translator.get('help.reuse_threshold', __package__), type = int, default = config.get_int_value('processors', 'background_remover_reuse_threshold', '0'), choices = background_remover_choices.background_remover_reuse_threshold_range, metavar = create_int_metavar(background_remover_choices.background_remover_reuse_threshold_range))
+		facefusion.jobs.job_store.register_step_keys([ 'background_remover_model', 'background_remover_color', 'background_remover_reuse_threshold' ])
 
 
 def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('background_remover_model', args.get('background_remover_model'))
 	apply_state_item('background_remover_color', normalize_color(args.get('background_remover_color')))
+	apply_state_item('background_remover_reuse_threshold', args.get('background_remover_reuse_threshold'))
 
 
 def pre_check() -> bool:
@@ -451,35 +454,43 @@ def pre_process(mode : ProcessMode) -> bool:
 
 
 def post_process() -> None:
-	read_static_image.cache_clear()
-	read_static_video_frame.cache_clear()
+	clear_static_frames()
 	video_manager.clear_video_pool()
+	clear_reuse_frames()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
 	if state_manager.get_item('video_memory_strategy') == 'strict':
 		content_analyser.clear_inference_pool()
 
 
-def remove_background(temp_vision_frame : VisionFrame) -> Tuple[VisionFrame, Mask]:
-	temp_vision_mask = forward(prepare_temp_frame(temp_vision_frame))
-	temp_vision_mask = normalize_vision_mask(temp_vision_mask)
+def remove_background(temp_vision_frame : VisionFrame, scene_index : int) -> Tuple[VisionFrame, Mask]:
+	temp_vision_mask = create_background_mask(temp_vision_frame, scene_index)
 	temp_vision_mask = cv2.resize(temp_vision_mask, temp_vision_frame.shape[:2][::-1])
 	temp_vision_frame = apply_background_color(temp_vision_frame, temp_vision_mask)
 	return temp_vision_frame, temp_vision_mask
 
 
+def create_background_mask(temp_vision_frame : VisionFrame, scene_index : int) -> Mask:
+	reuse_key = (state_manager.get_item('target_path'), state_manager.get_item('background_remover_model'), scene_index)
+	return resolve_reuse_frame(reuse_key, temp_vision_frame, state_manager.get_item('background_remover_reuse_threshold'), predict_background_mask)
+
+
+def predict_background_mask(temp_vision_frame : VisionFrame) -> Mask:
+	return normalize_vision_mask(forward(prepare_temp_frame(temp_vision_frame)))
+
+
 def forward(temp_vision_frame : VisionFrame) -> VisionFrame:
 	background_remover = get_inference_pool().get('background_remover')
 	model_name = state_manager.get_item('background_remover_model')
 
-	with thread_semaphore():
+	with conditional_thread_semaphore(background_remover):
 		remove_vision_frame = background_remover.run(None,
 		{
 			'input': temp_vision_frame
 		})[0]
 
-		if model_name == 'u2net_cloth':
-			remove_vision_frame = numpy.argmax(remove_vision_frame, axis = 1)
+	if model_name == 'u2net_cloth':
+		remove_vision_frame = numpy.argmax(remove_vision_frame, axis = 1)
 
 	return remove_vision_frame
 
@@ -519,6 +530,6 @@ def apply_background_color(temp_vision_frame : VisionFrame, temp_vision_mask : M
 
 def process_frame(inputs : BackgroundRemoverInputs) -> ProcessorOutputs:
 	temp_vision_frame = inputs.get('temp_vision_frame')
-	temp_vision_frame, temp_vision_mask = remove_background(temp_vision_frame)
+	temp_vision_frame, temp_vision_mask = remove_background(temp_vision_frame, inputs.get('scene_index'))
 	temp_vision_mask = numpy.minimum.reduce([ temp_vision_mask, inputs.get('temp_vision_mask') ])
 	return temp_vision_frame, temp_vision_mask
@@ -7,7 +7,8 @@ LOCALES : Locales =\
 		'help':
 		{
 			'model': 'choose the model responsible for removing the background',
-			'color': 'apply red, green blue and alpha values to the background'
+			'color': 'apply red, green blue and alpha values to the background',
+			'reuse_threshold': 'reuse the background mask of a previous frame when the difference stays below the threshold'
 		},
 		'uis':
 		{
@@ -1,28 +1,41 @@
+import os
+import tempfile
+import threading
 from argparse import ArgumentParser
 from functools import lru_cache
-from typing import Tuple
+from typing import Optional, Tuple
 
 import cv2
 import numpy
 
 import facefusion.jobs.job_manager
 import facefusion.jobs.job_store
-from facefusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, state_manager, translator, video_manager
+from facefusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, translator, video_manager
 from facefusion.common_helper import create_int_metavar
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.face_analyser import scale_face
 from facefusion.face_helper import paste_back, warp_face_by_face_landmark_5
-from facefusion.face_masker import create_box_mask, create_occlusion_mask
+from facefusion.face_masker import create_box_mask, create_occlusion_mask, merge_crop_masks
 from facefusion.face_selector import select_faces
-from facefusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
+from facefusion.filesystem import create_directory, in_directory, is_file, is_image, is_video, resolve_relative_path, same_file_extension
+from facefusion.hash_helper import create_strong_hash
 from facefusion.processors.live_portrait import create_rotation, limit_expression
 from facefusion.processors.modules.expression_restorer import choices as expression_restorer_choices
-from facefusion.processors.modules.expression_restorer.types import ExpressionRestorerInputs
-from facefusion.processors.types import LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitYaw, ProcessorOutputs
+from facefusion.processors.modules.expression_restorer.types import ExpressionRestorerInputs, ExpressionRestorerMotionStore
+from facefusion.processors.types import LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotion, LivePortraitMotionPoints, ProcessorOutputs
 from facefusion.program_helper import find_argument_group
 from facefusion.thread_helper import conditional_thread_semaphore, thread_semaphore
 from facefusion.types import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
-from facefusion.vision import read_static_image, read_static_video_frame
+from facefusion.video_store import get_video_hash
+from facefusion.vision import clear_static_frames
+
+EXPRESSION_RESTORER_MOTION_STORE : ExpressionRestorerMotionStore =\
+{
+	'motion_index_path': None,
+	'motion_index_total': 0,
+	'target_expressions': {}
+}
+EXPRESSION_RESTORER_MOTION_LOCK : threading.Lock = threading.Lock()
 
 
 @lru_cache()
@@ -131,12 +144,15 @@ def pre_process(mode : ProcessMode) -> bool:
 	if mode == 'output' and not same_file_extension(state_manager.get_item('target_path'), state_manager.get_item('output_path')):
 		logger.error(translator.get('match_target_and_output_extension') + translator.get('exclamation_mark'), __name__)
 		return False
+	if mode == 'output' and is_video(state_manager.get_item('target_path')):
+		load_motion_index(resolve_motion_index_path(state_manager.get_item('target_path')))
 	return True
 
 
 def post_process() -> None:
-	read_static_image.cache_clear()
-	read_static_video_frame.cache_clear()
+	save_motion_index()
+	clear_motion_index()
+	clear_static_frames()
 	video_manager.clear_video_pool()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
@@ -169,17 +185,16 @@ def restore_expression(target_face : Face, target_vision_frame : VisionFrame, te
 	temp_crop_vision_frame = prepare_crop_frame(temp_crop_vision_frame)
 	temp_crop_vision_frame = apply_restore(target_crop_vision_frame, temp_crop_vision_frame, expression_restorer_factor)
 	temp_crop_vision_frame = normalize_crop_frame(temp_crop_vision_frame)
-	crop_mask = numpy.minimum.reduce(crop_masks).clip(0, 1)
-	paste_vision_frame = paste_back(temp_vision_frame, temp_crop_vision_frame, crop_mask, affine_matrix)
+	crop_mask = merge_crop_masks(crop_masks)
+	paste_vision_frame = paste_back(temp_vision_frame, temp_crop_vision_frame, crop_mask, affine_matrix, in_place = True)
 	return paste_vision_frame
 
 
 def apply_restore(target_crop_vision_frame : VisionFrame, temp_crop_vision_frame : VisionFrame, expression_restorer_factor : float) -> VisionFrame:
 	feature_volume = forward_extract_feature(temp_crop_vision_frame)
-	target_expression = forward_extract_motion(target_crop_vision_frame)[5]
-	pitch, yaw, roll, scale, translation, temp_expression, motion_points = forward_extract_motion(temp_crop_vision_frame)
+	target_expression, (pitch, yaw, roll, scale, translation, temp_expression, motion_points) = extract_motions(target_crop_vision_frame, temp_crop_vision_frame)
 	rotation = create_rotation(pitch, yaw, roll)
-	target_expression = restrict_expression_areas(temp_expression, target_expression)
+	target_expression = restrict_expression_areas(temp_expression, target_expression.copy())
 	target_expression = target_expression * expression_restorer_factor + temp_expression * (1 - expression_restorer_factor)
 	target_expression = limit_expression(target_expression)
 	target_motion_points = scale * (motion_points @ rotation.T + target_expression) + translation
@@ -188,6 +203,99 @@ def apply_restore(target_crop_vision_frame : VisionFrame, temp_crop_vision_frame
 	return crop_vision_frame
 
 
+def extract_motions(target_crop_vision_frame : VisionFrame, temp_crop_vision_frame : VisionFrame) -> Tuple[LivePortraitExpression, LivePortraitMotion]:
+	motion_extractor = get_inference_pool().get('motion_extractor')
+	motion_key = create_strong_hash(target_crop_vision_frame.tobytes())
+	target_expression = get_target_expression(motion_key)
+
+	if target_expression is None:
+		if inference_manager.has_dynamic_batch(motion_extractor):
+			crop_motion = forward_extract_motion(numpy.concatenate([ target_crop_vision_frame, temp_crop_vision_frame ]))
+			target_expression = crop_motion[5][:1]
+			temp_motion : LivePortraitMotion = tuple(numpy.asarray(motion_value)[1:] for motion_value in crop_motion) #type:ignore[assignment]
+		else:
+			target_expression = forward_extract_motion(target_crop_vision_frame)[5]
+			temp_motion = forward_extract_motion(temp_crop_vision_frame)
+
+		set_target_expression(motion_key, target_expression)
+		return target_expression, temp_motion
+
+	return target_expression, forward_extract_motion(temp_crop_vision_frame)
+
+
+def get_target_expression(motion_key : str) -> Optional[LivePortraitExpression]:
+	with EXPRESSION_RESTORER_MOTION_LOCK:
+		return EXPRESSION_RESTORER_MOTION_STORE.get('target_expressions').get(motion_key)
+
+
+def set_target_expression(motion_key : str, target_expression : LivePortraitExpression) -> None:
+	target_expression.setflags(write = False)
+
+	with EXPRESSION_RESTORER_MOTION_LOCK:
+		EXPRESSION_RESTORER_MOTION_STORE['target_expressions'][motion_key] = target_expression
+
+
+def resolve_motion_index_path(video_path : str) -> Optional[str]:
+	video_hash = get_video_hash(video_path)
+
+	if video_hash:
+		temp_path = state_manager.get_item('temp_path') or tempfile.gettempdir()
+		return os.path.join(temp_path, 'facefusion', 'motions', video_hash + '-' + state_manager.get_item('expression_restorer_model') + '.npz')
+	return None
+
+
+def load_motion_index(motion_index_path : Optional[str]) -> bool:
+	if process_manager.count_process_scopes() > 1:
+		return False
+
+	clear_motion_index()
+
+	with EXPRESSION_RESTORER_MOTION_LOCK:
+		EXPRESSION_RESTORER_MOTION_STORE['motion_index_path'] = motion_index_path
+
+		if is_file(motion_index_path):
+			with numpy.load(motion_index_path, allow_pickle = False) as motion_index:
+				target_expressions = motion_index['target_expressions']
+				target_expressions.setflags(write = False)
+				EXPRESSION_RESTORER_MOTION_STORE['target_expressions'].update(zip(motion_index['motion_keys'].tolist(), target_expressions))
+
+			EXPRESSION_RESTORER_MOTION_STORE['motion_index_total'] = len(EXPRESSION_RESTORER_MOTION_STORE.get('target_expressions'))
+			return True
+	return False
+
+
+def save_motion_index() -> bool:
+	if process_manager.count_process_scopes() > 1:
+		return False
+
+	with EXPRESSION_RESTORER_MOTION_LOCK:
+		motion_index_path = EXPRESSION_RESTORER_MOTION_STORE.get('motion_index_path')
+		target_expressions = EXPRESSION_RESTORER_MOTION_STORE.get('target_expressions')
+
+		if len(target_expressions) == EXPRESSION_RESTORER_MOTION_STORE.get('motion_index_total'):
+			return True
+
+		if motion_index_path and create_directory(os.path.dirname(motion_index_path)):
+			temp_motion_index_path = motion_index_path + '.' + str(os.getpid()) + '.tmp'
+
+			with open(temp_motion_index_path, 'wb') as motion_index_file:
+				numpy.savez(motion_index_file, motion_keys = numpy.array(list(target_expressions.keys())), target_expressions = numpy.stack(list(target_expressions.values())))
+			os.replace(temp_motion_index_path, motion_index_path)
+			EXPRESSION_RESTORER_MOTION_STORE['motion_index_total'] = len(target_expressions)
+			return True
+	return False
+
+
+def clear_motion_index() -> None:
+	if process_manager.count_process_scopes() > 1:
+		return
+
+	with EXPRESSION_RESTORER_MOTION_LOCK:
+		EXPRESSION_RESTORER_MOTION_STORE['motion_index_path'] = None
+		EXPRESSION_RESTORER_MOTION_STORE['motion_index_total'] = 0
+		EXPRESSION_RESTORER_MOTION_STORE['target_expressions'].clear()
+
+
 def restrict_expression_areas(temp_expression : LivePortraitExpression, target_expression : LivePortraitExpression) -> LivePortraitExpression:
 	expression_restorer_areas = state_manager.get_item('expression_restorer_areas')
 
@@ -204,7 +312,7 @@ def restrict_expression_areas(temp_expression : LivePortraitExpression, target_e
 def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeatureVolume:
 	feature_extractor = get_inference_pool().get('feature_extractor')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(feature_extractor):
 		feature_volume = feature_extractor.run(None,
 		{
 			'input': crop_vision_frame
@@ -213,10 +321,10 @@ def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeat
 	return feature_volume
 
 
-def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortraitPitch, LivePortraitYaw, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitExpression, LivePortraitMotionPoints]:
+def forward_extract_motion(crop_vision_frame : VisionFrame) -> LivePortraitMotion:
 	motion_extractor = get_inference_pool().get('motion_extractor')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(motion_extractor):
 		pitch, yaw, roll, scale, translation, expression, motion_points = motion_extractor.run(None,
 		{
 			'input': crop_vision_frame
@@ -228,7 +336,7 @@ def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortrai
 def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, target_motion_points : LivePortraitMotionPoints, temp_motion_points : LivePortraitMotionPoints) -> VisionFrame:
 	generator = get_inference_pool().get('generator')
 
-	with thread_semaphore():
+	with thread_semaphore(generator):
 		crop_vision_frame = generator.run(None,
 		{
 			'feature_volume': feature_volume,
@@ -1,5 +1,6 @@
-from typing import List, Literal, TypedDict
+from typing import Dict, List, Literal, Optional, TypedDict
 
+from facefusion.processors.types import LivePortraitExpression
 from facefusion.types import Mask, VisionFrame
 
 ExpressionRestorerInputs = TypedDict('ExpressionRestorerInputs',
@@ -11,6 +12,13 @@ ExpressionRestorerInputs = TypedDict('ExpressionRestorerInputs',
 	'temp_vision_mask' : Mask
 })
 
+ExpressionRestorerMotionStore = TypedDict('ExpressionRestorerMotionStore',
+{
+	'motion_index_path' : Optional[str],
+	'motion_index_total' : int,
+	'target_expressions' : Dict[str, LivePortraitExpression]
+})
+
 ExpressionRestorerModel = Literal['live_portrait']
 
 ExpressionRestorerArea = Literal['upper-face', 'lower-face']
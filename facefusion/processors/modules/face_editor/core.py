@@ -1,6 +1,6 @@
 from argparse import ArgumentParser
 from functools import lru_cache
-from typing import Tuple
+from typing import Callable, List
 
 import cv2
 import numpy
@@ -18,11 +18,11 @@ from facefusion.filesystem import in_directory, is_image, is_video, resolve_rela
 from facefusion.processors.live_portrait import create_rotation, limit_angle, limit_expression
 from facefusion.processors.modules.face_editor import choices as face_editor_choices
 from facefusion.processors.modules.face_editor.types import FaceEditorInputs
-from facefusion.processors.types import LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitRotation, LivePortraitScale, LivePortraitTranslation, LivePortraitYaw, ProcessorOutputs
+from facefusion.processors.types import LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotion, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitRotation, LivePortraitYaw, ProcessorOutputs
 from facefusion.program_helper import find_argument_group
 from facefusion.thread_helper import conditional_thread_semaphore, thread_semaphore
 from facefusion.types import ApplyStateItem, Args, DownloadScope, Face, FaceLandmark68, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
-from facefusion.vision import read_static_image, read_static_video_frame
+from facefusion.vision import clear_static_frames
 
 
 @lru_cache()
@@ -186,8 +186,7 @@ def pre_process(mode : ProcessMode) -> bool:
 
 
 def post_process() -> None:
-	read_static_image.cache_clear()
-	read_static_video_frame.cache_clear()
+	clear_static_frames()
 	video_manager.clear_video_pool()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
@@ -200,48 +199,76 @@ def post_process() -> None:
 		face_recognizer.clear_inference_pool()
 
 
-def edit_face(target_face : Face, temp_vision_frame : VisionFrame) -> VisionFrame:
+def edit_faces(target_faces : List[Face], temp_vision_frame : VisionFrame) -> VisionFrame:
 	model_template = get_model_options().get('template')
 	model_size = get_model_options().get('size')
-	face_landmark_5 = scale_face_landmark_5(target_face.landmark_set.get('5/68'), 1.5)
-	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
-	box_mask = create_box_mask(crop_vision_frame, state_manager.get_item('face_mask_blur'), (0, 0, 0, 0))
-	crop_vision_frame = prepare_crop_frame(crop_vision_frame)
-	crop_vision_frame = apply_edit(crop_vision_frame, target_face.landmark_set.get('68'))
-	crop_vision_frame = normalize_crop_frame(crop_vision_frame)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, box_mask, affine_matrix)
-	return paste_vision_frame
-
-
-def apply_edit(crop_vision_frame : VisionFrame, face_landmark_68 : FaceLandmark68) -> VisionFrame:
-	feature_volume = forward_extract_feature(crop_vision_frame)
-	pitch, yaw, roll, scale, translation, expression, motion_points = forward_extract_motion(crop_vision_frame)
-	rotation = create_rotation(pitch, yaw, roll)
-	motion_points_target = scale * (motion_points @ rotation.T + expression) + translation
-	expression = edit_eye_gaze(expression)
-	expression = edit_mouth_grim(expression)
-	expression = edit_mouth_position(expression)
-	expression = edit_mouth_pout(expression)
-	expression = edit_mouth_purse(expression)
-	expression = edit_mouth_smile(expression)
-	expression = edit_eyebrow_direction(expression)
-	expression = limit_expression(expression)
-	rotation = edit_head_rotation(pitch, yaw, roll)
-	motion_points_source = motion_points @ rotation.T
-	motion_points_source += expression
-	motion_points_source *= scale
-	motion_points_source += translation
-	motion_points_source += edit_eye_open(motion_points_target, face_landmark_68)
-	motion_points_source += edit_lip_open(motion_points_target, face_landmark_68)
-	motion_points_source = forward_stitch_motion_points(motion_points_source, motion_points_target)
-	crop_vision_frame = forward_generate_frame(feature_volume, motion_points_source, motion_points_target)
-	return crop_vision_frame
+	crop_vision_frames = []
+	affine_matrices = []
+	box_masks = []
+
+	for target_face in target_faces:
+		face_landmark_5 = scale_face_landmark_5(target_face.landmark_set.get('5/68'), 1.5)
+		crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, face_landmark_5, model_template, model_size)
+		box_mask = create_box_mask(crop_vision_frame, state_manager.get_item('face_mask_blur'), (0, 0, 0, 0))
+		crop_vision_frames.append(prepare_crop_frame(crop_vision_frame))
+		affine_matrices.append(affine_matrix)
+		box_masks.append(box_mask)
+
+	face_landmarks_68 = [ target_face.landmark_set.get('68') for target_face in target_faces ]
+	crop_vision_frames = apply_edits(crop_vision_frames, face_landmarks_68)
+
+	for crop_vision_frame, affine_matrix, box_mask in zip(crop_vision_frames, affine_matrices, box_masks):
+		crop_vision_frame = normalize_crop_frame(crop_vision_frame)
+		temp_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, box_mask, affine_matrix, in_place = True)
+	return temp_vision_frame
+
+
+def apply_edits(crop_vision_frames : List[VisionFrame], face_landmarks_68 : List[FaceLandmark68]) -> List[VisionFrame]:
+	feature_volumes = []
+	motion_points_sources = []
+	motion_points_targets = []
+
+	for crop_vision_frame in crop_vision_frames:
+		feature_volume = forward_extract_feature(crop_vision_frame)
+		pitch, yaw, roll, scale, translation, expression, motion_points = forward_extract_motion(crop_vision_frame)
+		rotation = create_rotation(pitch, yaw, roll)
+		motion_points_target = scale * (motion_points @ rotation.T + expression) + translation
+		expression = edit_expression(expression)
+		rotation = edit_head_rotation(pitch, yaw, roll)
+		motion_points_source = motion_points @ rotation.T
+		motion_points_source += expression
+		motion_points_source *= scale
+		motion_points_source += translation
+		feature_volumes.append(feature_volume)
+		motion_points_sources.append(motion_points_source)
+		motion_points_targets.append(motion_points_target)
+
+	source_motion_points = numpy.concatenate(motion_points_sources)
+	target_motion_points = numpy.concatenate(motion_points_targets)
+
+	if state_manager.get_item('face_editor_eye_open_ratio'):
+		source_motion_points += edit_eye_open(target_motion_points, face_landmarks_68)
+	if state_manager.get_item('face_editor_lip_open_ratio'):
+		source_motion_points += edit_lip_open(target_motion_points, face_landmarks_68)
+
+	source_motion_points = conditional_forward_batch('stitcher', forward_stitch_motion_points, source_motion_points, target_motion_points)
+	return [ forward_generate_frame(feature_volume, source_motion_points[index:index + 1], target_motion_points[index:index + 1]) for index, feature_volume in enumerate(feature_volumes) ]
+
+
+def conditional_forward_batch(model_name : str, forward_function : Callable[..., LivePortraitMotionPoints], *batch_inputs : LivePortraitMotionPoints) -> LivePortraitMotionPoints:
+	inference_session = get_inference_pool().get(model_name)
+
+	if inference_manager.has_dynamic_batch(inference_session):
+		return forward_function(*batch_inputs)
+
+	batch_outputs = [ forward_function(*[ batch_input[index:index + 1] for batch_input in batch_inputs ]) for index in range(len(batch_inputs[0])) ]
+	return numpy.concatenate(batch_outputs)
 
 
 def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeatureVolume:
 	feature_extractor = get_inference_pool().get('feature_extractor')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(feature_extractor):
 		feature_volume = feature_extractor.run(None,
 		{
 			'input': crop_vision_frame
@@ -250,10 +277,10 @@ def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeat
 	return feature_volume
 
 
-def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortraitPitch, LivePortraitYaw, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitExpression, LivePortraitMotionPoints]:
+def forward_extract_motion(crop_vision_frame : VisionFrame) -> LivePortraitMotion:
 	motion_extractor = get_inference_pool().get('motion_extractor')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(motion_extractor):
 		pitch, yaw, roll, scale, translation, expression, motion_points = motion_extractor.run(None,
 		{
 			'input': crop_vision_frame
@@ -265,7 +292,7 @@ def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortrai
 def forward_retarget_eye(eye_motion_points : LivePortraitMotionPoints) -> LivePortraitMotionPoints:
 	eye_retargeter = get_inference_pool().get('eye_retargeter')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(eye_retargeter):
 		eye_motion_points = eye_retargeter.run(None,
 		{
 			'input': eye_motion_points
@@ -277,7 +304,7 @@ def forward_retarget_eye(eye_motion_points : LivePortraitMotionPoints) -> LivePo
 def forward_retarget_lip(lip_motion_points : LivePortraitMotionPoints) -> LivePortraitMotionPoints:
 	lip_retargeter = get_inference_pool().get('lip_retargeter')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(lip_retargeter):
 		lip_motion_points = lip_retargeter.run(None,
 		{
 			'input': lip_motion_points
@@ -289,7 +316,7 @@ def forward_retarget_lip(lip_motion_points : LivePortraitMotionPoints) -> LivePo
 def forward_stitch_motion_points(source_motion_points : LivePortraitMotionPoints, target_motion_points : LivePortraitMotionPoints) -> LivePortraitMotionPoints:
 	stitcher = get_inference_pool().get('stitcher')
 
-	with thread_semaphore():
+	with thread_semaphore(stitcher):
 		motion_points = stitcher.run(None,
 		{
 			'source': source_motion_points,
@@ -302,7 +329,7 @@ def forward_stitch_motion_points(source_motion_points : LivePortraitMotionPoints
 def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, source_motion_points : LivePortraitMotionPoints, target_motion_points : LivePortraitMotionPoints) -> VisionFrame:
 	generator = get_inference_pool().get('generator')
 
-	with thread_semaphore():
+	with thread_semaphore(generator):
 		crop_vision_frame = generator.run(None,
 		{
 			'feature_volume': feature_volume,
@@ -313,24 +340,49 @@ def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, source_mo
 	return crop_vision_frame
 
 
-def edit_eyebrow_direction(expression : LivePortraitExpression) -> LivePortraitExpression:
-	face_editor_eyebrow = state_manager.get_item('face_editor_eyebrow_direction')
-
-	if face_editor_eyebrow > 0:
-		expression[0, 1, 1] += numpy.interp(face_editor_eyebrow, [ -1, 1 ], [ -0.015, 0.015 ])
-		expression[0, 2, 1] -= numpy.interp(face_editor_eyebrow, [ -1, 1 ], [ -0.020, 0.020 ])
+def edit_expression(expression : LivePortraitExpression) -> LivePortraitExpression:
+	expression_offset = create_static_expression_offset(
+		state_manager.get_item('face_editor_eyebrow_direction'),
+		state_manager.get_item('face_editor_eye_gaze_horizontal'),
+		state_manager.get_item('face_editor_eye_gaze_vertical'),
+		state_manager.get_item('face_editor_mouth_grim'),
+		state_manager.get_item('face_editor_mouth_position_horizontal'),
+		state_manager.get_item('face_editor_mouth_position_vertical'),
+		state_manager.get_item('face_editor_mouth_pout'),
+		state_manager.get_item('face_editor_mouth_purse'),
+		state_manager.get_item('face_editor_mouth_smile')
+	)
+	expression += expression_offset
+	return limit_expression(expression)
+
+
+@lru_cache(maxsize = 16)
+def create_static_expression_offset(face_editor_eyebrow_direction : float, face_editor_eye_gaze_horizontal : float, face_editor_eye_gaze_vertical : float, face_editor_mouth_grim : float, face_editor_mouth_position_horizontal : float, face_editor_mouth_position_vertical : float, face_editor_mouth_pout : float, face_editor_mouth_purse : float, face_editor_mouth_smile : float) -> LivePortraitExpression:
+	expression_offset : LivePortraitExpression = numpy.zeros((1, 21, 3), dtype = numpy.float32)
+	expression_offset = edit_eye_gaze(expression_offset, face_editor_eye_gaze_horizontal, face_editor_eye_gaze_vertical)
+	expression_offset = edit_mouth_grim(expression_offset, face_editor_mouth_grim)
+	expression_offset = edit_mouth_position(expression_offset, face_editor_mouth_position_horizontal, face_editor_mouth_position_vertical)
+	expression_offset = edit_mouth_pout(expression_offset, face_editor_mouth_pout)
+	expression_offset = edit_mouth_purse(expression_offset, face_editor_mouth_purse)
+	expression_offset = edit_mouth_smile(expression_offset, face_editor_mouth_smile)
+	expression_offset = edit_eyebrow_direction(expression_offset, face_editor_eyebrow_direction)
+	expression_offset.setflags(write = False)
+	return expression_offset
+
+
+def edit_eyebrow_direction(expression : LivePortraitExpression, face_editor_eyebrow_direction : float) -> LivePortraitExpression:
+	if face_editor_eyebrow_direction > 0:
+		expression[0, 1, 1] += numpy.interp(face_editor_eyebrow_direction, [ -1, 1 ], [ -0.015, 0.015 ])
+		expression[0, 2, 1] -= numpy.interp(face_editor_eyebrow_direction, [ -1, 1 ], [ -0.020, 0.020 ])
 	else:
-		expression[0, 1, 0] -= numpy.interp(face_editor_eyebrow, [ -1, 1 ], [ -0.015, 0.015 ])
-		expression[0, 2, 0] += numpy.interp(face_editor_eyebrow, [ -1, 1 ], [ -0.020, 0.020 ])
-		expression[0, 1, 1] += numpy.interp(face_editor_eyebrow, [ -1, 1 ], [ -0.005, 0.005 ])
-		expression[0, 2, 1] -= numpy.interp(face_editor_eyebrow, [ -1, 1 ], [ -0.005, 0.005 ])
+		expression[0, 1, 0] -= numpy.interp(face_editor_eyebrow_direction, [ -1, 1 ], [ -0.015, 0.015 ])
+		expression[0, 2, 0] += numpy.interp(face_editor_eyebrow_direction, [ -1, 1 ], [ -0.020, 0.020 ])
+		expression[0, 1, 1] += numpy.interp(face_editor_eyebrow_direction, [ -1, 1 ], [ -0.005, 0.005 ])
+		expression[0, 2, 1] -= numpy.interp(face_editor_eyebrow_direction, [ -1, 1 ], [ -0.005, 0.005 ])
 	return expression
 
 
-def edit_eye_gaze(expression : LivePortraitExpression) -> LivePortraitExpression:
-	face_editor_eye_gaze_horizontal = state_manager.get_item('face_editor_eye_gaze_horizontal')
-	face_editor_eye_gaze_vertical = state_manager.get_item('face_editor_eye_gaze_vertical')
-
+def edit_eye_gaze(expression : LivePortraitExpression, face_editor_eye_gaze_horizontal : float, face_editor_eye_gaze_vertical : float) -> LivePortraitExpression:
 	if face_editor_eye_gaze_horizontal > 0:
 		expression[0, 11, 0] += numpy.interp(face_editor_eye_gaze_horizontal, [ -1, 1 ], [ -0.015, 0.015 ])
 		expression[0, 15, 0] += numpy.interp(face_editor_eye_gaze_horizontal, [ -1, 1 ], [ -0.020, 0.020 ])
@@ -346,37 +398,40 @@ def edit_eye_gaze(expression : LivePortraitExpression) -> LivePortraitExpression
 	return expression
 
 
-def edit_eye_open(motion_points : LivePortraitMotionPoints, face_landmark_68 : FaceLandmark68) -> LivePortraitMotionPoints:
+def edit_eye_open(motion_points : LivePortraitMotionPoints, face_landmarks_68 : List[FaceLandmark68]) -> LivePortraitMotionPoints:
 	face_editor_eye_open_ratio = state_manager.get_item('face_editor_eye_open_ratio')
-	left_eye_ratio = calculate_distance_ratio(face_landmark_68, 37, 40, 39, 36)
-	right_eye_ratio = calculate_distance_ratio(face_landmark_68, 43, 46, 45, 42)
+	eye_motion_points : LivePortraitMotionPoints = numpy.empty((len(motion_points), 66), dtype = numpy.float32)
+	eye_motion_points[:, :63] = motion_points.reshape(len(motion_points), -1)
+	eye_motion_points[:, 63] = [ calculate_distance_ratio(face_landmark_68, 37, 40, 39, 36) for face_landmark_68 in face_landmarks_68 ]
+	eye_motion_points[:, 64] = [ calculate_distance_ratio(face_landmark_68, 43, 46, 45, 42) for face_landmark_68 in face_landmarks_68 ]
 
 	if face_editor_eye_open_ratio < 0:
-		eye_motion_points = numpy.concatenate([ motion_points.ravel(), [ left_eye_ratio, right_eye_ratio, 0.0 ] ])
+		eye_motion_points[:, 65] = 0.0
 	else:
-		eye_motion_points = numpy.concatenate([ motion_points.ravel(), [ left_eye_ratio, right_eye_ratio, 0.6 ] ])
-	eye_motion_points = eye_motion_points.reshape(1, -1).astype(numpy.float32)
-	eye_motion_points = forward_retarget_eye(eye_motion_points) * numpy.abs(face_editor_eye_open_ratio)
+		eye_motion_points[:, 65] = 0.6
+	eye_motion_points = conditional_forward_batch('eye_retargeter', forward_retarget_eye, eye_motion_points)
+	eye_motion_points *= numpy.abs(face_editor_eye_open_ratio)
 	eye_motion_points = eye_motion_points.reshape(-1, 21, 3)
 	return eye_motion_points
 
 
-def edit_lip_open(motion_points : LivePortraitMotionPoints, face_landmark_68 : FaceLandmark68) -> LivePortraitMotionPoints:
+def edit_lip_open(motion_points : LivePortraitMotionPoints, face_landmarks_68 : List[FaceLandmark68]) -> LivePortraitMotionPoints:
 	face_editor_lip_open_ratio = state_manager.get_item('face_editor_lip_open_ratio')
-	lip_ratio = calculate_distance_ratio(face_landmark_68, 62, 66, 54, 48)
+	lip_motion_points : LivePortraitMotionPoints = numpy.empty((len(motion_points), 65), dtype = numpy.float32)
+	lip_motion_points[:, :63] = motion_points.reshape(len(motion_points), -1)
+	lip_motion_points[:, 63] = [ calculate_distance_ratio(face_landmark_68, 62, 66, 54, 48) for face_landmark_68 in face_landmarks_68 ]
 
 	if face_editor_lip_open_ratio < 0:
-		lip_motion_points = numpy.concatenate([ motion_points.ravel(), [ lip_ratio, 0.0 ] ])
+		lip_motion_points[:, 64] = 0.0
 	else:
-		lip_motion_points = numpy.concatenate([ motion_points.ravel(), [ lip_ratio, 1.0 ] ])
-	lip_motion_points = lip_motion_points.reshape(1, -1).astype(numpy.float32)
-	lip_motion_points = forward_retarget_lip(lip_motion_points) * numpy.abs(face_editor_lip_open_ratio)
+		lip_motion_points[:, 64] = 1.0
+	lip_motion_points = conditional_forward_batch('lip_retargeter', forward_retarget_lip, lip_motion_points)
+	lip_motion_points *= numpy.abs(face_editor_lip_open_ratio)
 	lip_motion_points = lip_motion_points.reshape(-1, 21, 3)
 	return lip_motion_points
 
 
-def edit_mouth_grim(expression : LivePortraitExpression) -> LivePortraitExpression:
-	face_editor_mouth_grim = state_manager.get_item('face_editor_mouth_grim')
+def edit_mouth_grim(expression : LivePortraitExpression, face_editor_mouth_grim : float) -> LivePortraitExpression:
 	if face_editor_mouth_grim > 0:
 		expression[0, 17, 2] -= numpy.interp(face_editor_mouth_grim, [ -1, 1 ], [ -0.005, 0.005 ])
 		expression[0, 19, 2] += numpy.interp(face_editor_mouth_grim, [ -1, 1 ], [ -0.01, 0.01 ])
@@ -389,9 +444,7 @@ def edit_mouth_grim(expression : LivePortraitExpression) -> LivePortraitExpressi
 	return expression
 
 
-def edit_mouth_position(expression : LivePortraitExpression) -> LivePortraitExpression:
-	face_editor_mouth_position_horizontal = state_manager.get_item('face_editor_mouth_position_horizontal')
-	face_editor_mouth_position_vertical = state_manager.get_item('face_editor_mouth_position_vertical')
+def edit_mouth_position(expression : LivePortraitExpression, face_editor_mouth_position_horizontal : float, face_editor_mouth_position_vertical : float) -> LivePortraitExpression:
 	expression[0, 19, 0] += numpy.interp(face_editor_mouth_position_horizontal, [ -1, 1 ], [ -0.05, 0.05 ])
 	expression[0, 20, 0] += numpy.interp(face_editor_mouth_position_horizontal, [ -1, 1 ], [ -0.04, 0.04 ])
 	if face_editor_mouth_position_vertical > 0:
@@ -403,8 +456,7 @@ def edit_mouth_position(expression : LivePortraitExpression) -> LivePortraitExpr
 	return expression
 
 
-def edit_mouth_pout(expression : LivePortraitExpression) -> LivePortraitExpression:
-	face_editor_mouth_pout = state_manager.get_item('face_editor_mouth_pout')
+def edit_mouth_pout(expression : LivePortraitExpression, face_editor_mouth_pout : float) -> LivePortraitExpression:
 	if face_editor_mouth_pout > 0:
 		expression[0, 19, 1] -= numpy.interp(face_editor_mouth_pout, [ -1, 1 ], [ -0.022, 0.022 ])
 		expression[0, 19, 2] += numpy.interp(face_editor_mouth_pout, [ -1, 1 ], [ -0.025, 0.025 ])
@@ -416,8 +468,7 @@ def edit_mouth_pout(expression : LivePortraitExpression) -> LivePortraitExpressi
 	return expression
 
 
-def edit_mouth_purse(expression : LivePortraitExpression) -> LivePortraitExpression:
-	face_editor_mouth_purse = state_manager.get_item('face_editor_mouth_purse')
+def edit_mouth_purse(expression : LivePortraitExpression, face_editor_mouth_purse : float) -> LivePortraitExpression:
 	if face_editor_mouth_purse > 0:
 		expression[0, 19, 1] -= numpy.interp(face_editor_mouth_purse, [ -1, 1 ], [ -0.04, 0.04 ])
 		expression[0, 19, 2] -= numpy.interp(face_editor_mouth_purse, [ -1, 1 ], [ -0.02, 0.02 ])
@@ -429,8 +480,7 @@ def edit_mouth_purse(expression : LivePortraitExpression) -> LivePortraitExpress
 	return expression
 
 
-def edit_mouth_smile(expression : LivePortraitExpression) -> LivePortraitExpression:
-	face_editor_mouth_smile = state_manager.get_item('face_editor_mouth_smile')
+def edit_mouth_smile(expression : LivePortraitExpression, face_editor_mouth_smile : float) -> LivePortraitExpression:
 	if face_editor_mouth_smile > 0:
 		expression[0, 20, 1] -= numpy.interp(face_editor_mouth_smile, [ -1, 1 ], [ -0.015, 0.015 ])
 		expression[0, 14, 1] -= numpy.interp(face_editor_mouth_smile, [ -1, 1 ], [ -0.025, 0.025 ])
@@ -492,8 +542,7 @@ def process_frame(inputs : FaceEditorInputs) -> ProcessorOutputs:
 	target_faces = select_faces(reference_vision_frame, target_vision_frame)
 
 	if target_faces:
-		for target_face in target_faces:
-			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
-			temp_vision_frame = edit_face(target_face, temp_vision_frame)
+		target_faces = [ scale_face(target_face, target_vision_frame, temp_vision_frame) for target_face in target_faces ]
+		temp_vision_frame = edit_faces(target_faces, temp_vision_frame)
 
 	return temp_vision_frame, temp_vision_mask
@@ -8,3 +8,4 @@ frame_colorizer_models : List[FrameColorizerModel] = [ 'ddcolor', 'ddcolor_artis
 frame_colorizer_sizes : List[str] = [ '192x192', '256x256', '384x384', '512x512' ]
 
 frame_colorizer_blend_range : Sequence[int] = create_int_range(0, 100, 1)
+frame_colorizer_reuse_threshold_range : Sequence[int] = create_int_range(0, 20, 1)
@@ -16,9 +16,10 @@ from facefusion.processors.modules.frame_colorizer import choices as frame_color
 from facefusion.processors.modules.frame_colorizer.types import FrameColorizerInputs
 from facefusion.processors.types import ProcessorOutputs
 from facefusion.program_helper import find_argument_group
+from facefusion.reuse_store import clear_reuse_frames, resolve_reuse_frame
 from facefusion.thread_helper import thread_semaphore
 from facefusion.types import ApplyStateItem, Args, DownloadScope, ExecutionProvider, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
-from facefusion.vision import blend_frame, read_static_image, read_static_video_frame, unpack_resolution
+from facefusion.vision import blend_frame, clear_static_frames, unpack_resolution
 
 
 @lru_cache()
@@ -187,13 +188,15 @@ def register_args(program : ArgumentParser) -> None:
 		group_processors.add_argument('--frame-colorizer-model', help = translator.get('help.model', __package__), default = config.get_str_value('processors', 'frame_colorizer_model', 'ddcolor'), choices = frame_colorizer_choices.frame_colorizer_models)
 		group_processors.add_argument('--frame-colorizer-size', help = translator.get('help.size', __package__), type = str, default = config.get_str_value('processors', 'frame_colorizer_size', '256x256'), choices = frame_colorizer_choices.frame_colorizer_sizes)
 		group_processors.add_argument('--frame-colorizer-blend', help = translator.get('help.blend', __package__), type = int, default = config.get_int_value('processors', 'frame_colorizer_blend', '100'), choices = frame_colorizer_choices.frame_colorizer_blend_range, metavar = create_int_metavar(frame_colorizer_choices.frame_colorizer_blend_range))
-		facefusion.jobs.job_store.register_step_keys([ 'frame_colorizer_model', 'frame_colorizer_blend', 'frame_colorizer_size' ])
+		group_processors.add_argument('--frame-colorizer-reuse-threshold', help = translator.get('help.reuse_threshold', __package__), type = int, default = config.get_int_value('processors', 'frame_colorizer_reuse_threshold', '0'), choices = frame_colorizer_choices.frame_colorizer_reuse_threshold_range, metavar = create_int_metavar(frame_colorizer_choices.frame_colorizer_reuse_threshold_range))
+		facefusion.jobs.job_store.register_step_keys([ 'frame_colorizer_model', 'frame_colorizer_blend', 'frame_colorizer_size', 'frame_colorizer_reuse_threshold' ])
 
 
 def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('frame_colorizer_model', args.get('frame_colorizer_model'))
 	apply_state_item('frame_colorizer_blend', args.get('frame_colorizer_blend'))
 	apply_state_item('frame_colorizer_size', args.get('frame_colorizer_size'))
+	apply_state_item('frame_colorizer_reuse_threshold', args.get('frame_colorizer_reuse_threshold'))
 
 
 def pre_check() -> bool:
@@ -217,27 +220,35 @@ def pre_process(mode : ProcessMode) -> bool:
 
 
 def post_process() -> None:
-	read_static_image.cache_clear()
-	read_static_video_frame.cache_clear()
+	clear_static_frames()
 	video_manager.clear_video_pool()
+	clear_reuse_frames()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
 	if state_manager.get_item('video_memory_strategy') == 'strict':
 		content_analyser.clear_inference_pool()
 
 
-def colorize_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
-	color_vision_frame = prepare_temp_frame(temp_vision_frame)
-	color_vision_frame = forward(color_vision_frame)
+def colorize_frame(temp_vision_frame : VisionFrame, scene_index : int) -> VisionFrame:
+	color_vision_frame = create_color_frame(temp_vision_frame, scene_index)
 	color_vision_frame = merge_color_frame(temp_vision_frame, color_vision_frame)
 	color_vision_frame = blend_color_frame(temp_vision_frame, color_vision_frame)
 	return color_vision_frame
 
 
+def create_color_frame(temp_vision_frame : VisionFrame, scene_index : int) -> VisionFrame:
+	reuse_key = (state_manager.get_item('target_path'), state_manager.get_item('frame_colorizer_model'), state_manager.get_item('frame_colorizer_size'), scene_index)
+	return resolve_reuse_frame(reuse_key, temp_vision_frame, state_manager.get_item('frame_colorizer_reuse_threshold'), predict_color_frame)
+
+
+def predict_color_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
+	return forward(prepare_temp_frame(temp_vision_frame))
+
+
 def forward(color_vision_frame : VisionFrame) -> VisionFrame:
 	frame_colorizer = get_inference_pool().get('frame_colorizer')
 
-	with thread_semaphore():
+	with thread_semaphore(frame_colorizer):
 		color_vision_frame = frame_colorizer.run(None,
 		{
 			'input': color_vision_frame
@@ -250,17 +261,13 @@ def prepare_temp_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	model_size = unpack_resolution(state_manager.get_item('frame_colorizer_size'))
 	model_type = get_model_options().get('type')
 	temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_BGR2GRAY)
-	temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_GRAY2RGB)
 
 	if model_type == 'ddcolor':
-		temp_vision_frame = (temp_vision_frame / 255.0).astype(numpy.float32) #type:ignore[operator]
-		temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_RGB2LAB)[:, :, :1]
-		temp_vision_frame = numpy.concatenate((temp_vision_frame, numpy.zeros_like(temp_vision_frame), numpy.zeros_like(temp_vision_frame)), axis = -1)
-		temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_LAB2RGB)
+		temp_vision_frame = temp_vision_frame.astype(numpy.float32)
+		temp_vision_frame *= 1 / 255.0
 
 	temp_vision_frame = cv2.resize(temp_vision_frame, model_size)
-	temp_vision_frame = temp_vision_frame.transpose((2, 0, 1))
-	temp_vision_frame = numpy.expand_dims(temp_vision_frame, axis = 0).astype(numpy.float32)
+	temp_vision_frame = numpy.repeat(numpy.expand_dims(temp_vision_frame, axis = (0, 1)), 3, axis = 1).astype(numpy.float32, copy = False)
 	return temp_vision_frame
 
 
@@ -270,9 +277,10 @@ def merge_color_frame(temp_vision_frame : VisionFrame, color_vision_frame : Visi
 	color_vision_frame = cv2.resize(color_vision_frame, (temp_vision_frame.shape[1], temp_vision_frame.shape[0]))
 
 	if model_type == 'ddcolor':
-		temp_vision_frame = (temp_vision_frame / 255.0).astype(numpy.float32)
-		temp_vision_frame = cv2.cvtColor(temp_vision_frame, cv2.COLOR_BGR2LAB)[:, :, :1]
-		color_vision_frame = numpy.concatenate((temp_vision_frame, color_vision_frame), axis = -1)
+		temp_vision_frame = temp_vision_frame.astype(numpy.float32)
+		temp_vision_frame *= 1 / 255.0
+		temp_luminance_channel = cv2.cvtColor(temp_vision_frame, cv2.COLOR_BGR2LAB)[:, :, 0]
+		color_vision_frame = cv2.merge((temp_luminance_channel, color_vision_frame[:, :, 0], color_vision_frame[:, :, 1]))
 		color_vision_frame = cv2.cvtColor(color_vision_frame, cv2.COLOR_LAB2BGR)
 		color_vision_frame = (color_vision_frame * 255.0).round().astype(numpy.uint8) #type:ignore[operator]
 
@@ -295,5 +303,5 @@ def blend_color_frame(temp_vision_frame : VisionFrame, color_vision_frame : Visi
 def process_frame(inputs : FrameColorizerInputs) -> ProcessorOutputs:
 	temp_vision_frame = inputs.get('temp_vision_frame')
 	temp_vision_mask = inputs.get('temp_vision_mask')
-	temp_vision_frame = colorize_frame(temp_vision_frame)
+	temp_vision_frame = colorize_frame(temp_vision_frame, inputs.get('scene_index'))
 	return temp_vision_frame, temp_vision_mask
@@ -8,7 +8,8 @@ LOCALES : Locales =\
 		{
 			'model': 'choose the model responsible for colorizing the frame',
 			'size': 'specify the frame size provided to the frame colorizer',
-			'blend': 'blend the colorized into the previous frame'
+			'blend': 'blend the colorized into the previous frame',
+			'reuse_threshold': 'reuse the colors of a previous frame when the difference stays below the threshold'
 		},
 		'uis':
 		{
@@ -4,6 +4,7 @@ from facefusion.types import Mask, VisionFrame
 
 FrameColorizerInputs = TypedDict('FrameColorizerInputs',
 {
+	'scene_index' : int,
 	'target_vision_frame' : VisionFrame,
 	'temp_vision_frame' : VisionFrame,
 	'temp_vision_mask' : Mask
@@ -17,7 +17,7 @@ from facefusion.processors.types import ProcessorOutputs
 from facefusion.program_helper import find_argument_group
 from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.types import ApplyStateItem, Args, DownloadScope, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
-from facefusion.vision import blend_frame, create_tile_frames, merge_tile_frames, read_static_image, read_static_video_frame
+from facefusion.vision import blend_frame, clear_static_frames, create_tile_frames, merge_tile_frames
 
 
 @lru_cache()
@@ -604,8 +604,7 @@ def pre_process(mode : ProcessMode) -> bool:
 
 
 def post_process() -> None:
-	read_static_image.cache_clear()
-	read_static_video_frame.cache_clear()
+	clear_static_frames()
 	video_manager.clear_video_pool()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
@@ -632,7 +631,7 @@ def enhance_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 def forward(tile_vision_frame : VisionFrame) -> VisionFrame:
 	frame_enhancer = get_inference_pool().get('frame_enhancer')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(frame_enhancer):
 		tile_vision_frame = frame_enhancer.run(None,
 		{
 			'input': tile_vision_frame
@@ -1,5 +1,6 @@
 from argparse import ArgumentParser
 from functools import lru_cache
+from typing import List
 
 import cv2
 import numpy
@@ -7,21 +8,21 @@ import numpy
 import facefusion.jobs.job_manager
 import facefusion.jobs.job_store
 from facefusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, state_manager, translator, video_manager, voice_extractor
-from facefusion.audio import read_static_voice
-from facefusion.common_helper import create_float_metavar
+from facefusion.audio import clear_static_voice_spectrograms
+from facefusion.common_helper import create_float_metavar, create_int_metavar, get_first
 from facefusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from facefusion.face_analyser import scale_face
 from facefusion.face_helper import create_bounding_box, paste_back, warp_face_by_bounding_box, warp_face_by_face_landmark_5
-from facefusion.face_masker import create_area_mask, create_box_mask, create_occlusion_mask
+from facefusion.face_masker import create_area_mask, create_box_mask, create_occlusion_mask, merge_crop_masks
 from facefusion.face_selector import select_faces
 from facefusion.filesystem import has_audio, resolve_relative_path
 from facefusion.processors.modules.lip_syncer import choices as lip_syncer_choices
-from facefusion.processors.modules.lip_syncer.types import LipSyncerInputs, LipSyncerWeight
+from facefusion.processors.modules.lip_syncer.types import LipSyncerCrop, LipSyncerInputs, LipSyncerWeight
 from facefusion.processors.types import ProcessorOutputs
 from facefusion.program_helper import find_argument_group
 from facefusion.thread_helper import conditional_thread_semaphore
 from facefusion.types import ApplyStateItem, Args, AudioFrame, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
-from facefusion.vision import read_static_image, read_static_video_frame
+from facefusion.vision import clear_static_frames
 
 
 @lru_cache()
@@ -134,12 +135,14 @@ def register_args(program : ArgumentParser) -> None:
 	if group_processors:
 		group_processors.add_argument('--lip-syncer-model', help = translator.get('help.model', __package__), default = config.get_str_value('processors', 'lip_syncer_model', 'wav2lip_gan_96'), choices = lip_syncer_choices.lip_syncer_models)
 		group_processors.add_argument('--lip-syncer-weight', help = translator.get('help.weight', __package__), type = float, default = config.get_float_value('processors', 'lip_syncer_weight', '0.5'), choices = lip_syncer_choices.lip_syncer_weight_range, metavar = create_float_metavar(lip_syncer_choices.lip_syncer_weight_range))
-		facefusion.jobs.job_store.register_step_keys([ 'lip_syncer_model', 'lip_syncer_weight' ])
+		group_processors.add_argument('--lip-syncer-batch-size', help = translator.get('help.batch_size', __package__), type = int, default = config.get_int_value('processors', 'lip_syncer_batch_size', '1'), choices = lip_syncer_choices.lip_syncer_batch_size_range, metavar = create_int_metavar(lip_syncer_choices.lip_syncer_batch_size_range))
+		facefusion.jobs.job_store.register_step_keys([ 'lip_syncer_model', 'lip_syncer_weight', 'lip_syncer_batch_size' ])
 
 
 def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('lip_syncer_model', args.get('lip_syncer_model'))
 	apply_state_item('lip_syncer_weight', args.get('lip_syncer_weight'))
+	apply_state_item('lip_syncer_batch_size', args.get('lip_syncer_batch_size'))
 
 
 def pre_check() -> bool:
@@ -157,9 +160,8 @@ def pre_process(mode : ProcessMode) -> bool:
 
 
 def post_process() -> None:
-	read_static_image.cache_clear()
-	read_static_video_frame.cache_clear()
-	read_static_voice.cache_clear()
+	clear_static_frames()
+	clear_static_voice_spectrograms()
 	video_manager.clear_video_pool()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
@@ -173,11 +175,33 @@ def post_process() -> None:
 		voice_extractor.clear_inference_pool()
 
 
-def sync_lip(target_face : Face, source_voice_frame : AudioFrame, temp_vision_frame : VisionFrame) -> VisionFrame:
+def get_frame_batch_size() -> int:
+	return state_manager.get_item('lip_syncer_batch_size') or 1
+
+
+def sync_lips(lip_syncer_crops : List[LipSyncerCrop], temp_vision_frames : List[VisionFrame]) -> List[VisionFrame]:
+	model_type = get_model_options().get('type')
+	source_voice_frames = prepare_audio_frames(numpy.stack([ lip_syncer_crop.get('source_voice_frame') for lip_syncer_crop in lip_syncer_crops ]))
+	crop_vision_frames = numpy.concatenate([ lip_syncer_crop.get('crop_vision_frame') for lip_syncer_crop in lip_syncer_crops ])
+	crop_vision_frames = conditional_forward_batch(source_voice_frames, crop_vision_frames)
+
+	for index, lip_syncer_crop in enumerate(lip_syncer_crops):
+		frame_index = lip_syncer_crop.get('frame_index')
+		crop_vision_frame = normalize_crop_frame(crop_vision_frames[index:index + 1])
+
+		if model_type == 'wav2lip':
+			crop_vision_frame = cv2.warpAffine(crop_vision_frame, cv2.invertAffineTransform(lip_syncer_crop.get('area_matrix')), (512, 512), borderMode = cv2.BORDER_REPLICATE)
+
+		crop_mask = merge_crop_masks(lip_syncer_crop.get('crop_masks'))
+		temp_vision_frames[frame_index] = paste_back(temp_vision_frames[frame_index], crop_vision_frame, crop_mask, lip_syncer_crop.get('affine_matrix'), in_place = True)
+	return temp_vision_frames
+
+
+def prepare_lip_syncer_crop(frame_index : int, target_face : Face, source_voice_frame : AudioFrame, temp_vision_frame : VisionFrame) -> LipSyncerCrop:
 	model_type = get_model_options().get('type')
 	model_size = get_model_options().get('size')
-	source_voice_frame = prepare_audio_frame(source_voice_frame)
 	crop_vision_frame, affine_matrix = warp_face_by_face_landmark_5(temp_vision_frame, target_face.landmark_set.get('5/68'), 'ffhq_512', (512, 512))
+	area_matrix = None
 	crop_masks = []
 
 	if 'occlusion' in state_manager.get_item('face_mask_types'):
@@ -185,33 +209,53 @@ def sync_lip(target_face : Face, source_voice_frame : AudioFrame, temp_vision_fr
 		crop_masks.append(occlusion_mask)
 
 	if model_type == 'edtalk':
-		lip_syncer_weight = numpy.array([ state_manager.get_item('lip_syncer_weight') ]).astype(numpy.float32)
 		box_mask = create_box_mask(crop_vision_frame, state_manager.get_item('face_mask_blur'), state_manager.get_item('face_mask_padding'))
 		crop_masks.append(box_mask)
 		crop_vision_frame = prepare_crop_frame(crop_vision_frame)
-		crop_vision_frame = forward_edtalk(source_voice_frame, crop_vision_frame, lip_syncer_weight)
-		crop_vision_frame = normalize_crop_frame(crop_vision_frame)
 
 	if model_type == 'wav2lip':
 		face_landmark_68 = cv2.transform(target_face.landmark_set.get('68').reshape(1, -1, 2), affine_matrix).reshape(-1, 2)
 		area_mask = create_area_mask(crop_vision_frame, face_landmark_68, [ 'lower-face' ])
 		crop_masks.append(area_mask)
 		bounding_box = create_bounding_box(face_landmark_68)
-		area_vision_frame, area_matrix = warp_face_by_bounding_box(crop_vision_frame, bounding_box, model_size)
-		area_vision_frame = prepare_crop_frame(area_vision_frame)
-		area_vision_frame = forward_wav2lip(source_voice_frame, area_vision_frame)
-		area_vision_frame = normalize_crop_frame(area_vision_frame)
-		crop_vision_frame = cv2.warpAffine(area_vision_frame, cv2.invertAffineTransform(area_matrix), (512, 512), borderMode = cv2.BORDER_REPLICATE)
+		crop_vision_frame, area_matrix = warp_face_by_bounding_box(crop_vision_frame, bounding_box, model_size)
+		crop_vision_frame = prepare_crop_frame(crop_vision_frame)
+
+	return\
+	{
+		'frame_index': frame_index,
+		'source_voice_frame': source_voice_frame,
+		'crop_vision_frame': crop_vision_frame,
+		'crop_masks': crop_masks,
+		'affine_matrix': affine_matrix,
+		'area_matrix': area_matrix
+	}
+
 
-	crop_mask = numpy.minimum.reduce(crop_masks)
-	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_mask, affine_matrix)
-	return paste_vision_frame
+def conditional_forward_batch(source_voice_frames : AudioFrame, crop_vision_frames : VisionFrame) -> VisionFrame:
+	lip_syncer = get_inference_pool().get('lip_syncer')
+
+	if inference_manager.has_dynamic_batch(lip_syncer):
+		return forward(source_voice_frames, crop_vision_frames)
+
+	batch_vision_frames = [ forward(source_voice_frames[index:index + 1], crop_vision_frames[index:index + 1]) for index in range(len(crop_vision_frames)) ]
+	return numpy.concatenate(batch_vision_frames)
+
+
+def forward(source_voice_frames : AudioFrame, crop_vision_frames : VisionFrame) -> VisionFrame:
+	model_type = get_model_options().get('type')
+
+	if model_type == 'edtalk':
+		lip_syncer_weight = numpy.full(len(crop_vision_frames), state_manager.get_item('lip_syncer_weight'), dtype = numpy.float32)
+		return forward_edtalk(source_voice_frames, crop_vision_frames, lip_syncer_weight)
+
+	return forward_wav2lip(source_voice_frames, crop_vision_frames)
 
 
 def forward_edtalk(temp_audio_frame : AudioFrame, crop_vision_frame : VisionFrame, lip_syncer_weight : LipSyncerWeight) -> VisionFrame:
 	lip_syncer = get_inference_pool().get('lip_syncer')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(lip_syncer):
 		crop_vision_frame = lip_syncer.run(None,
 		{
 			'source': temp_audio_frame,
@@ -225,7 +269,7 @@ def forward_edtalk(temp_audio_frame : AudioFrame, crop_vision_frame : VisionFram
 def forward_wav2lip(temp_audio_frame : AudioFrame, area_vision_frame : VisionFrame) -> VisionFrame:
 	lip_syncer = get_inference_pool().get('lip_syncer')
 
-	with conditional_thread_semaphore():
+	with conditional_thread_semaphore(lip_syncer):
 		area_vision_frame = lip_syncer.run(None,
 		{
 			'source': temp_audio_frame,
@@ -235,17 +279,17 @@ def forward_wav2lip(temp_audio_frame : AudioFrame, area_vision_frame : VisionFra
 	return area_vision_frame
 
 
-def prepare_audio_frame(temp_audio_frame : AudioFrame) -> AudioFrame:
+def prepare_audio_frames(temp_audio_frames : AudioFrame) -> AudioFrame:
 	model_type = get_model_options().get('type')
-	temp_audio_frame = numpy.maximum(numpy.exp(-5 * numpy.log(10)), temp_audio_frame)
-	temp_audio_frame = numpy.log10(temp_audio_frame) * 1.6 + 3.2
-	temp_audio_frame = temp_audio_frame.clip(-4, 4).astype(numpy.float32)
+	temp_audio_frames = numpy.maximum(numpy.exp(-5 * numpy.log(10)), temp_audio_frames)
+	temp_audio_frames = numpy.log10(temp_audio_frames) * 1.6 + 3.2
+	temp_audio_frames = temp_audio_frames.clip(-4, 4).astype(numpy.float32)
 
 	if model_type == 'wav2lip':
-		temp_audio_frame = temp_audio_frame * state_manager.get_item('lip_syncer_weight') * 2.0
+		temp_audio_frames = temp_audio_frames * state_manager.get_item('lip_syncer_weight') * 2.0
 
-	temp_audio_frame = numpy.expand_dims(temp_audio_frame, axis = (0, 1))
-	return temp_audio_frame
+	temp_audio_frames = numpy.expand_dims(temp_audio_frames, axis = 1)
+	return temp_audio_frames
 
 
 def prepare_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
@@ -281,16 +325,22 @@ def normalize_crop_frame(crop_vision_frame : VisionFrame) -> VisionFrame:
 
 
 def process_frame(inputs : LipSyncerInputs) -> ProcessorOutputs:
-	reference_vision_frame = inputs.get('reference_vision_frame')
-	source_voice_frame = inputs.get('source_voice_frame')
-	target_vision_frame = inputs.get('target_vision_frame')
-	temp_vision_frame = inputs.get('temp_vision_frame')
-	temp_vision_mask = inputs.get('temp_vision_mask')
-	target_faces = select_faces(reference_vision_frame, target_vision_frame)
-
-	if target_faces:
+	return get_first(process_frames([ inputs ]))
+
+
+def process_frames(inputs_list : List[LipSyncerInputs]) -> List[ProcessorOutputs]:
+	temp_vision_frames = [ inputs.get('temp_vision_frame') for inputs in inputs_list ]
+	lip_syncer_crops = []
+
+	for frame_index, inputs in enumerate(inputs_list):
+		target_vision_frame = inputs.get('target_vision_frame')
+		target_faces = select_faces(inputs.get('reference_vision_frame'), target_vision_frame)
+
 		for target_face in target_faces:
-			target_face = scale_face(target_face, target_vision_frame, temp_vision_frame)
-			temp_vision_frame = sync_lip(target_face, source_voice_frame, temp_vision_frame)
+			target_face = scale_face(target_face, target_vision_frame, temp_vision_frames[frame_index])
+			lip_syncer_crops.append(prepare_lip_syncer_crop(frame_index, target_face, inputs.get('source_voice_frame'), temp_vision_frames[frame_index]))
+
+	if lip_syncer_crops:
+		temp_vision_frames = sync_lips(lip_syncer_crops, temp_vision_frames)
 
-	return temp_vision_frame, temp_vision_mask
+	return [ (temp_vision_frame, inputs.get('temp_vision_mask')) for temp_vision_frame, inputs in zip(temp_vision_frames, inputs_list) ]
@@ -7,7 +7,8 @@ LOCALES : Locales =\
 		'help':
 		{
 			'model': 'choose the model responsible for syncing the lips',
-			'weight': 'specify the degree of weight applied to the lips'
+			'weight': 'specify the degree of weight applied to the lips',
+			'batch_size': 'specify the amount of consecutive frames synced in one run'
 		},
 		'uis':
 		{
@@ -1,8 +1,8 @@
-from typing import Any, Literal, TypeAlias, TypedDict
+from typing import Any, List, Literal, Optional, TypeAlias, TypedDict
 
 from numpy.typing import NDArray
 
-from facefusion.types import AudioFrame, Mask, VisionFrame
+from facefusion.types import AudioFrame, Mask, Matrix, VisionFrame
 
 LipSyncerInputs = TypedDict('LipSyncerInputs',
 {
@@ -13,6 +13,16 @@ LipSyncerInputs = TypedDict('LipSyncerInputs',
 	'temp_vision_mask' : Mask
 })
 
+LipSyncerCrop = TypedDict('LipSyncerCrop',
+{
+	'frame_index' : int,
+	'source_voice_frame' : AudioFrame,
+	'crop_vision_frame' : VisionFrame,
+	'crop_masks' : List[Mask],
+	'affine_matrix' : Matrix,
+	'area_matrix' : Optional[Matrix]
+})
+
 LipSyncerModel = Literal['edtalk_256', 'wav2lip_96', 'wav2lip_gan_96']
 
 LipSyncerWeight : TypeAlias = NDArray[Any]
@@ -13,6 +13,7 @@ LivePortraitMotionPoints : TypeAlias = NDArray[Any]
 LivePortraitRotation : TypeAlias = NDArray[Any]
 LivePortraitScale : TypeAlias = NDArray[Any]
 LivePortraitTranslation : TypeAlias = NDArray[Any]
+LivePortraitMotion : TypeAlias = Tuple[LivePortraitPitch, LivePortraitYaw, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitExpression, LivePortraitMotionPoints]
 
 ProcessorStateKey = str
 ProcessorState : TypeAlias = Dict[ProcessorStateKey, Any]
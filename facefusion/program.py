@@ -113,7 +113,8 @@ def create_face_landmarker_program() -> ArgumentParser:
 	group_face_landmarker = program.add_argument_group('face landmarker')
 	group_face_landmarker.add_argument('--face-landmarker-model', help = translator.get('help.face_landmarker_model'), default = config.get_str_value('face_landmarker', 'face_landmarker_model', '2dfan4'), choices = facefusion.choices.face_landmarker_models)
 	group_face_landmarker.add_argument('--face-landmarker-score', help = translator.get('help.face_landmarker_score'), type = float, default = config.get_float_value('face_landmarker', 'face_landmarker_score', '0.5'), choices = facefusion.choices.face_landmarker_score_range, metavar = create_float_metavar(facefusion.choices.face_landmarker_score_range))
-	job_store.register_step_keys([ 'face_landmarker_model', 'face_landmarker_score' ])
+	group_face_landmarker.add_argument('--face-alignment-method', help = translator.get('help.face_alignment_method'), default = config.get_str_value('face_landmarker', 'face_alignment_method', 'ransac'), choices = facefusion.choices.face_alignment_methods)
+	job_store.register_step_keys([ 'face_landmarker_model', 'face_landmarker_score', 'face_alignment_method' ])
 	return program
 
 
@@ -161,8 +162,9 @@ def create_frame_extraction_program() -> ArgumentParser:
 	group_frame_extraction.add_argument('--trim-frame-start', help = translator.get('help.trim_frame_start'), type = int, default = facefusion.config.get_int_value('frame_extraction', 'trim_frame_start'))
 	group_frame_extraction.add_argument('--trim-frame-end', help = translator.get('help.trim_frame_end'), type = int, default = facefusion.config.get_int_value('frame_extraction', 'trim_frame_end'))
 	group_frame_extraction.add_argument('--temp-frame-format', help = translator.get('help.temp_frame_format'), default = config.get_str_value('frame_extraction', 'temp_frame_format', 'png'), choices = facefusion.choices.temp_frame_formats)
+	group_frame_extraction.add_argument('--scene-cut-threshold', help = translator.get('help.scene_cut_threshold'), type = int, default = config.get_int_value('frame_extraction', 'scene_cut_threshold', '0'), choices = facefusion.choices.scene_cut_threshold_range, metavar = create_int_metavar(facefusion.choices.scene_cut_threshold_range))
 	group_frame_extraction.add_argument('--keep-temp', help = translator.get('help.keep_temp'), action = 'store_true', default = config.get_bool_value('frame_extraction', 'keep_temp'))
-	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'keep_temp' ])
+	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'scene_cut_threshold', 'keep_temp' ])
 	return program
 
 
@@ -237,7 +239,9 @@ def create_execution_program() -> ArgumentParser:
 	group_execution.add_argument('--execution-device-ids', help = translator.get('help.execution_device_ids'), type = int, default = config.get_int_list('execution', 'execution_device_ids', '0'), nargs = '+', metavar = 'EXECUTION_DEVICE_IDS')
 	group_execution.add_argument('--execution-providers', help = translator.get('help.execution_providers').format(choices = ', '.join(available_execution_providers)), default = config.get_str_list('execution', 'execution_providers', get_first(available_execution_providers)), choices = available_execution_providers, nargs = '+', metavar = 'EXECUTION_PROVIDERS')
 	group_execution.add_argument('--execution-thread-count', help = translator.get('help.execution_thread_count'), type = int, default = config.get_int_value('execution', 'execution_thread_count', '8'), choices = facefusion.choices.execution_thread_count_range, metavar = create_int_metavar(facefusion.choices.execution_thread_count_range))
-	job_store.register_job_keys([ 'execution_device_ids', 'execution_providers', 'execution_thread_count' ])
+	group_execution.add_argument('--execution-session-limit', help = translator.get('help.execution_session_limit'), type = int, default = config.get_int_value('execution', 'execution_session_limit'), choices = facefusion.choices.execution_session_limit_range, metavar = create_int_metavar(facefusion.choices.execution_session_limit_range))
+	group_execution.add_argument('--job-concurrency', help = translator.get('help.job_concurrency'), type = int, default = config.get_int_value('execution', 'job_concurrency', '1'), choices = facefusion.choices.job_concurrency_range, metavar = create_int_metavar(facefusion.choices.job_concurrency_range))
+	job_store.register_job_keys([ 'execution_device_ids', 'execution_providers', 'execution_thread_count', 'execution_session_limit', 'job_concurrency' ])
 	return program
 
 
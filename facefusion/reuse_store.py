@@ -0,0 +1,60 @@
+import threading
+from typing import Callable, List, Optional
+
+from facefusion import process_manager
+from facefusion.types import ReuseFrame, ReuseKey, VisionFrame
+from facefusion.vision import calculate_thumbnail_difference, create_thumbnail_frame
+
+REUSE_FRAMES : List[ReuseFrame] = []
+REUSE_FRAME_LOCK : threading.Lock = threading.Lock()
+REUSE_FRAME_LIMIT : int = 16
+
+
+def resolve_reuse_frame(reuse_key : ReuseKey, temp_vision_frame : VisionFrame, reuse_threshold : int, create_vision_frame : Callable[[VisionFrame], VisionFrame]) -> VisionFrame:
+	if reuse_threshold:
+		thumbnail_vision_frame = create_thumbnail_frame(temp_vision_frame)
+		vision_frame = find_reuse_frame(reuse_key, thumbnail_vision_frame, reuse_threshold)
+
+		if vision_frame is None:
+			vision_frame = create_vision_frame(temp_vision_frame)
+			store_reuse_frame(reuse_key, thumbnail_vision_frame, vision_frame)
+		return vision_frame
+
+	return create_vision_frame(temp_vision_frame)
+
+
+def find_reuse_frame(reuse_key : ReuseKey, thumbnail_vision_frame : VisionFrame, reuse_threshold : int) -> Optional[VisionFrame]:
+	vision_frame = None
+	temp_difference = float(reuse_threshold)
+
+	with REUSE_FRAME_LOCK:
+		for reuse_frame in REUSE_FRAMES:
+			if reuse_frame.get('reuse_key') == reuse_key:
+				frame_difference = calculate_thumbnail_difference(reuse_frame.get('thumbnail_vision_frame'), thumbnail_vision_frame)
+
+				if frame_difference < temp_difference:
+					vision_frame = reuse_frame.get('vision_frame')
+					temp_difference = frame_difference
+
+	return vision_frame
+
+
+def store_reuse_frame(reuse_key : ReuseKey, thumbnail_vision_frame : VisionFrame, vision_frame : VisionFrame) -> None:
+	with REUSE_FRAME_LOCK:
+		REUSE_FRAMES.append(
+		{
+			'reuse_key': reuse_key,
+			'thumbnail_vision_frame': thumbnail_vision_frame,
+			'vision_frame': vision_frame
+		})
+
+		if len(REUSE_FRAMES) > REUSE_FRAME_LIMIT:
+			REUSE_FRAMES.pop(0)
+
+
+def clear_reuse_frames() -> None:
+	if process_manager.count_process_scopes() > 1:
+		return
+
+	with REUSE_FRAME_LOCK:
+		REUSE_FRAMES.clear()
@@ -0,0 +1,52 @@
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from facefusion import state_manager
+from facefusion.json import read_json, write_json
+from facefusion.temp_helper import get_temp_metadata_path
+from facefusion.types import SceneCuts, VisionFrame
+from facefusion.vision import calculate_thumbnail_difference, create_thumbnail_frame, read_reduced_image
+
+
+def detect_scene_cuts(temp_frame_paths : List[str], scene_cut_threshold : int) -> SceneCuts:
+	scene_cuts = []
+	previous_thumbnail_vision_frame = None
+
+	with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), initializer = state_manager.bind_scope_state, initargs = (state_manager.get_scope_state(),)) as executor:
+		for frame_number, thumbnail_vision_frame in enumerate(executor.map(read_thumbnail_frame, temp_frame_paths)):
+			if thumbnail_vision_frame is None:
+				continue
+
+			if previous_thumbnail_vision_frame is not None and calculate_thumbnail_difference(previous_thumbnail_vision_frame, thumbnail_vision_frame) > scene_cut_threshold:
+				scene_cuts.append(frame_number)
+			previous_thumbnail_vision_frame = thumbnail_vision_frame
+
+	return scene_cuts
+
+
+def read_thumbnail_frame(temp_frame_path : str) -> Optional[VisionFrame]:
+	temp_vision_frame = read_reduced_image(temp_frame_path)
+
+	if temp_vision_frame is not None:
+		return create_thumbnail_frame(temp_vision_frame)
+	return None
+
+
+def read_scene_cuts(target_path : str) -> SceneCuts:
+	temp_metadata = read_json(get_temp_metadata_path(target_path))
+
+	if temp_metadata:
+		return temp_metadata.get('scene_cuts', [])
+	return []
+
+
+def write_scene_cuts(target_path : str, scene_cuts : SceneCuts) -> bool:
+	temp_metadata_path = get_temp_metadata_path(target_path)
+	temp_metadata = read_json(temp_metadata_path) or {}
+	temp_metadata['scene_cuts'] = scene_cuts
+	return write_json(temp_metadata_path, temp_metadata)
+
+
+def get_scene_index(scene_cuts : SceneCuts, frame_number : int) -> int:
+	return bisect_right(scene_cuts, frame_number)
@@ -1,4 +1,7 @@
-from typing import Any, Union
+import threading
+from contextlib import contextmanager
+from copy import copy
+from typing import Any, Iterator, Optional, Union
 
 from facefusion.app_context import detect_app_context
 from facefusion.processors.types import ProcessorState, ProcessorStateKey, ProcessorStateSet
@@ -9,13 +12,36 @@ STATE_SET : Union[StateSet, ProcessorStateSet] =\
 	'cli': {}, #type:ignore[assignment]
 	'ui': {} #type:ignore[assignment]
 }
+STATE_SCOPE : threading.local = threading.local()
 
 
 def get_state() -> Union[State, ProcessorState]:
+	scope_state = get_scope_state()
+
+	if scope_state is not None:
+		return scope_state
 	app_context = detect_app_context()
 	return STATE_SET.get(app_context)
 
 
+def get_scope_state() -> Optional[Union[State, ProcessorState]]:
+	return getattr(STATE_SCOPE, 'state', None)
+
+
+def bind_scope_state(scope_state : Optional[Union[State, ProcessorState]]) -> None:
+	STATE_SCOPE.state = scope_state
+
+
+@contextmanager
+def scope_state() -> Iterator[None]:
+	bind_scope_state(copy(get_state()))
+
+	try:
+		yield
+	finally:
+		bind_scope_state(None)
+
+
 def sync_state() -> None:
 	STATE_SET['cli'] = STATE_SET.get('ui') #type:ignore[assignment]
 
@@ -37,8 +63,7 @@ def get_item(key : Union[StateKey, ProcessorStateKey]) -> Any:
 
 
 def set_item(key : Union[StateKey, ProcessorStateKey], value : Any) -> None:
-	app_context = detect_app_context()
-	STATE_SET[app_context][key] = value #type:ignore[literal-required]
+	get_state()[key] = value #type:ignore[literal-required]
 
 
 def sync_item(key : Union[StateKey, ProcessorStateKey]) -> None:
@@ -60,6 +60,7 @@ def process_stream_frame(target_vision_frame : VisionFrame) -> VisionFrame:
 				'source_vision_frames': source_vision_frames,
 				'source_audio_frame': source_audio_frame,
 				'source_voice_frame': source_voice_frame,
+				'scene_index': 0,
 				'target_vision_frame': target_vision_frame,
 				'temp_vision_frame': temp_vision_frame,
 				'temp_vision_mask': temp_vision_mask
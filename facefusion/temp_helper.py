@@ -26,6 +26,11 @@ def get_temp_frames_pattern(target_path : str, temp_frame_prefix : str) -> str:
 	return os.path.join(temp_directory_path, temp_frame_prefix + '.' + state_manager.get_item('temp_frame_format'))
 
 
+def get_temp_metadata_path(target_path : str) -> str:
+	temp_directory_path = get_temp_directory_path(target_path)
+	return os.path.join(temp_directory_path, 'metadata.json')
+
+
 def get_temp_directory_path(file_path : str) -> str:
 	temp_file_name = get_file_name(file_path)
 	return os.path.join(state_manager.get_item('temp_path'), 'facefusion', temp_file_name)
@@ -1,12 +1,19 @@
 import threading
 from contextlib import nullcontext
-from typing import ContextManager, Union
+from typing import ContextManager, Dict, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
 
-from facefusion.common_helper import is_linux, is_windows
-from facefusion.execution import has_execution_provider
+from onnxruntime import InferenceSession
+
+import facefusion.choices
+from facefusion import state_manager
+from facefusion.common_helper import get_first
+from facefusion.types import ExecutionProvider
 
 THREAD_LOCK : threading.Lock = threading.Lock()
-THREAD_SEMAPHORE : threading.Semaphore = threading.Semaphore()
+THREAD_SEMAPHORE_LOCK : threading.Lock = threading.Lock()
+THREAD_SEMAPHORE_SET : 'WeakKeyDictionary[InferenceSession, Tuple[int, threading.Semaphore]]' = WeakKeyDictionary()
+THREAD_PROVIDER_SEMAPHORE_SET : Dict[ExecutionProvider, threading.Semaphore] = {}
 NULL_CONTEXT : ContextManager[None] = nullcontext()
 
 
@@ -14,11 +21,44 @@ def thread_lock() -> threading.Lock:
 	return THREAD_LOCK
 
 
-def thread_semaphore() -> threading.Semaphore:
-	return THREAD_SEMAPHORE
+def thread_semaphore(inference_session : InferenceSession) -> threading.Semaphore:
+	execution_provider = resolve_execution_provider(inference_session)
+
+	if has_provider_session_limit(execution_provider):
+		return thread_provider_semaphore(execution_provider)
+
+	execution_session_limit = state_manager.get_item('execution_session_limit') or 1
+
+	with THREAD_SEMAPHORE_LOCK:
+		session_limit, session_semaphore = THREAD_SEMAPHORE_SET.get(inference_session, (0, threading.Semaphore()))
+
+		if session_limit != execution_session_limit:
+			session_semaphore = threading.Semaphore(execution_session_limit)
+			THREAD_SEMAPHORE_SET[inference_session] = execution_session_limit, session_semaphore
+		return session_semaphore
+
 
+def thread_provider_semaphore(execution_provider : ExecutionProvider) -> threading.Semaphore:
+	with THREAD_SEMAPHORE_LOCK:
+		if execution_provider not in THREAD_PROVIDER_SEMAPHORE_SET:
+			THREAD_PROVIDER_SEMAPHORE_SET[execution_provider] = threading.Semaphore(facefusion.choices.execution_provider_session_limit_set[execution_provider])
+		return THREAD_PROVIDER_SEMAPHORE_SET[execution_provider]
 
-def conditional_thread_semaphore() -> Union[threading.Semaphore, ContextManager[None]]:
-	if is_windows() and has_execution_provider('directml') or is_linux() and has_execution_provider('migraphx') or is_linux() and has_execution_provider('rocm'):
-		return THREAD_SEMAPHORE
+
+def conditional_thread_semaphore(inference_session : InferenceSession) -> Union[threading.Semaphore, ContextManager[None]]:
+	if has_provider_session_limit(resolve_execution_provider(inference_session)) or state_manager.get_item('execution_session_limit'):
+		return thread_semaphore(inference_session)
 	return NULL_CONTEXT
+
+
+def resolve_execution_provider(inference_session : InferenceSession) -> Optional[ExecutionProvider]:
+	inference_session_provider = get_first(inference_session.get_providers())
+
+	for execution_provider, execution_provider_value in facefusion.choices.execution_provider_set.items():
+		if execution_provider_value == inference_session_provider:
+			return execution_provider
+	return None
+
+
+def has_provider_session_limit(execution_provider : Optional[ExecutionProvider]) -> bool:
+	return execution_provider in facefusion.choices.execution_provider_session_limit_set
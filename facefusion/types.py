@@ -1,3 +1,5 @@
+import subprocess
+import threading
 from collections import namedtuple
 from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypeAlias, TypedDict
 
@@ -45,22 +47,48 @@ Face = namedtuple('Face',
 	'race'
 ])
 FaceSet : TypeAlias = Dict[str, List[Face]]
+FaceIndex : TypeAlias = Dict[str, NDArray[Any]]
+FaceIndexFrameSet : TypeAlias = Dict[str, Tuple[int, int]]
 FaceStore = TypedDict('FaceStore',
 {
-	'static_faces' : FaceSet
+	'static_faces' : FaceSet,
+	'reference_faces' : FaceSet,
+	'face_index' : FaceIndex,
+	'face_index_frames' : FaceIndexFrameSet
 })
 
 Language = Literal['en']
 Locales : TypeAlias = Dict[Language, Dict[str, Any]]
 LocalePoolSet : TypeAlias = Dict[str, Locales]
 
-VideoCaptureSet : TypeAlias = Dict[str, cv2.VideoCapture]
-VideoWriterSet : TypeAlias = Dict[str, cv2.VideoWriter]
+VideoCaptureHandle = TypedDict('VideoCaptureHandle',
+{
+	'capture' : cv2.VideoCapture,
+	'lock' : threading.Lock,
+	'thread' : int,
+	'position' : Optional[int],
+	'frame' : Dict[int, NDArray[Any]],
+	'accessed' : float
+})
+VideoCaptureSet : TypeAlias = Dict[str, List[VideoCaptureHandle]]
 CameraCaptureSet : TypeAlias = Dict[str, cv2.VideoCapture]
 VideoPoolSet = TypedDict('VideoPoolSet',
 {
-	'capture': VideoCaptureSet,
-	'writer': VideoWriterSet
+	'capture': VideoCaptureSet
+})
+VideoMetadata = TypedDict('VideoMetadata',
+{
+	'fps' : float,
+	'frame_total' : int,
+	'resolution' : Tuple[int, int],
+	'duration' : float,
+	'codec' : str
+})
+VideoStore = TypedDict('VideoStore',
+{
+	'version' : int,
+	'fingerprints' : Dict[str, str],
+	'videos' : Dict[str, VideoMetadata]
 })
 CameraPoolSet = TypedDict('CameraPoolSet',
 {
@@ -70,21 +98,41 @@ CameraPoolSet = TypedDict('CameraPoolSet',
 ColorMode = Literal['rgb', 'rgba']
 VisionFrame : TypeAlias = NDArray[Any]
 Mask : TypeAlias = NDArray[Any]
+MaskSet : TypeAlias = Dict[str, Mask]
 Points : TypeAlias = NDArray[Any]
 Distance : TypeAlias = NDArray[Any]
 Matrix : TypeAlias = NDArray[Any]
 Anchors : TypeAlias = NDArray[Any]
 Translation : TypeAlias = NDArray[Any]
+ReuseKey : TypeAlias = Tuple[Any, ...]
+ReuseFrame = TypedDict('ReuseFrame',
+{
+	'reuse_key' : ReuseKey,
+	'thumbnail_vision_frame' : VisionFrame,
+	'vision_frame' : VisionFrame
+})
 
 AudioBuffer : TypeAlias = bytes
 Audio : TypeAlias = NDArray[Any]
 AudioChunk : TypeAlias = NDArray[Any]
 AudioFrame : TypeAlias = NDArray[Any]
+AudioFrames : TypeAlias = NDArray[Any]
 Spectrogram : TypeAlias = NDArray[Any]
 Mel : TypeAlias = NDArray[Any]
 MelFilterBank : TypeAlias = NDArray[Any]
 Voice : TypeAlias = NDArray[Any]
 VoiceChunk : TypeAlias = NDArray[Any]
+AudioStream = TypedDict('AudioStream',
+{
+	'process' : subprocess.Popen[bytes],
+	'position' : int
+})
+AudioPoolSet = TypedDict('AudioPoolSet',
+{
+	'stream' : Dict[str, AudioStream],
+	'block' : Dict[str, Dict[int, Audio]],
+	'chunk' : Dict[str, Dict[int, Spectrogram]]
+})
 
 Fps : TypeAlias = float
 Duration : TypeAlias = float
@@ -93,6 +141,7 @@ Padding : TypeAlias = Tuple[int, int, int, int]
 Margin : TypeAlias = Tuple[int, int, int, int]
 Orientation = Literal['landscape', 'portrait']
 Resolution : TypeAlias = Tuple[int, int]
+SceneCuts : TypeAlias = List[int]
 
 ProcessState = Literal['checking', 'processing', 'stopping', 'pending']
 Args : TypeAlias = Dict[str, Any]
@@ -117,6 +166,7 @@ TableContent : TypeAlias = Any
 
 FaceDetectorModel = Literal['many', 'retinaface', 'scrfd', 'yolo_face', 'yunet']
 FaceLandmarkerModel = Literal['many', '2dfan4', 'peppa_wutz']
+FaceAlignmentMethod = Literal['ransac', 'least-squares']
 FaceDetectorSet : TypeAlias = Dict[FaceDetectorModel, List[str]]
 FaceSelectorMode = Literal['many', 'one', 'reference']
 FaceSelectorOrder = Literal['left-right', 'right-left', 'top-bottom', 'bottom-top', 'small-large', 'large-small', 'best-worst', 'worst-best']
@@ -170,6 +220,7 @@ ModelInitializer : TypeAlias = NDArray[Any]
 ExecutionProvider = Literal['cpu', 'coreml', 'cuda', 'directml', 'openvino', 'migraphx', 'rocm', 'tensorrt']
 ExecutionProviderValue = Literal['CPUExecutionProvider', 'CoreMLExecutionProvider', 'CUDAExecutionProvider', 'DmlExecutionProvider', 'OpenVINOExecutionProvider', 'MIGraphXExecutionProvider', 'ROCMExecutionProvider', 'TensorrtExecutionProvider']
 ExecutionProviderSet : TypeAlias = Dict[ExecutionProvider, ExecutionProviderValue]
+ExecutionProviderSessionLimitSet : TypeAlias = Dict[ExecutionProvider, int]
 InferenceSessionProvider : TypeAlias = Any
 ValueAndUnit = TypedDict('ValueAndUnit',
 {
@@ -240,6 +291,7 @@ JobStore = TypedDict('JobStore',
 	'step_keys' : List[str]
 })
 JobOutputSet : TypeAlias = Dict[str, List[str]]
+JobStepDependencies : TypeAlias = Dict[int, List[int]]
 JobStatus = Literal['drafted', 'queued', 'completed', 'failed']
 JobStepStatus = Literal['drafted', 'queued', 'started', 'completed', 'failed']
 JobStep = TypedDict('JobStep',
@@ -280,6 +332,7 @@ StateKey = Literal\
 	'face_detector_score',
 	'face_landmarker_model',
 	'face_landmarker_score',
+	'face_alignment_method',
 	'face_selector_mode',
 	'face_selector_order',
 	'face_selector_gender',
@@ -300,6 +353,7 @@ StateKey = Literal\
 	'trim_frame_start',
 	'trim_frame_end',
 	'temp_frame_format',
+	'scene_cut_threshold',
 	'keep_temp',
 	'output_image_quality',
 	'output_image_scale',
@@ -318,6 +372,8 @@ StateKey = Literal\
 	'execution_device_ids',
 	'execution_providers',
 	'execution_thread_count',
+	'execution_session_limit',
+	'job_concurrency',
 	'video_memory_strategy',
 	'system_memory_limit',
 	'log_level',
@@ -350,6 +406,7 @@ State = TypedDict('State',
 	'face_detector_score' : Score,
 	'face_landmarker_model' : FaceLandmarkerModel,
 	'face_landmarker_score' : Score,
+	'face_alignment_method' : FaceAlignmentMethod,
 	'face_selector_mode' : FaceSelectorMode,
 	'face_selector_order' : FaceSelectorOrder,
 	'face_selector_race' : Race,
@@ -370,6 +427,7 @@ State = TypedDict('State',
 	'trim_frame_start' : int,
 	'trim_frame_end' : int,
 	'temp_frame_format' : TempFrameFormat,
+	'scene_cut_threshold' : int,
 	'keep_temp' : bool,
 	'output_image_quality' : int,
 	'output_image_scale' : Scale,
@@ -388,6 +446,8 @@ State = TypedDict('State',
 	'execution_device_ids' : List[int],
 	'execution_providers' : List[ExecutionProvider],
 	'execution_thread_count' : int,
+	'execution_session_limit' : int,
+	'job_concurrency' : int,
 	'video_memory_strategy' : VideoMemoryStrategy,
 	'system_memory_limit' : int,
 	'log_level' : LogLevel,
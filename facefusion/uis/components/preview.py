@@ -246,6 +246,7 @@ def process_preview_frame(reference_vision_frame : VisionFrame, source_vision_fr
 				'reference_vision_frame': reference_vision_frame,
 				'source_audio_frame': source_audio_frame,
 				'source_voice_frame': source_voice_frame,
+				'scene_index': 0,
 				'source_vision_frames': source_vision_frames,
 				'target_vision_frame': target_vision_frame[:, :, :3],
 				'temp_vision_frame': temp_vision_frame[:, :, :3],
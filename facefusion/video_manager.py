@@ -1,40 +1,165 @@
+import threading
+from contextlib import contextmanager
+from time import time
+from typing import Iterator, Optional
+
 import cv2
 
-from facefusion.types import VideoPoolSet
+from facefusion import process_manager
+from facefusion.types import VideoCaptureHandle, VideoMetadata, VideoPoolSet, VisionFrame
 
 VIDEO_POOL_SET : VideoPoolSet =\
 {
-	'capture': {},
-	'writer': {}
+	'capture': {}
 }
+VIDEO_POOL_LOCK : threading.Lock = threading.Lock()
+VIDEO_CAPTURE_LIMIT : int = 4
+VIDEO_CAPTURE_IDLE_TIMEOUT : int = 60
+VIDEO_FRAME_CACHE_LIMIT : int = 16
+VIDEO_FRAME_SKIP_LIMIT : int = 64
+
+
+@contextmanager
+def acquire_video_capture(video_path : str) -> Iterator[Optional[VideoCaptureHandle]]:
+	video_capture_handle = select_video_capture_handle(video_path)
+
+	if video_capture_handle:
+		with video_capture_handle.get('lock'):
+			video_capture_handle['accessed'] = time()
+			yield video_capture_handle
+	else:
+		yield None
+
+
+def select_video_capture_handle(video_path : str) -> Optional[VideoCaptureHandle]:
+	thread_ident = threading.get_ident()
+
+	with VIDEO_POOL_LOCK:
+		evict_video_captures()
+		video_capture_handles = VIDEO_POOL_SET.get('capture').get(video_path, [])
+
+		for video_capture_handle in video_capture_handles:
+			if video_capture_handle.get('thread') == thread_ident:
+				video_capture_handle['accessed'] = time()
+				return video_capture_handle
+
+		if len(video_capture_handles) < VIDEO_CAPTURE_LIMIT:
+			video_capture_handle = create_video_capture_handle(video_path)
+
+			if video_capture_handle:
+				VIDEO_POOL_SET['capture'].setdefault(video_path, []).append(video_capture_handle)
+			return video_capture_handle
+
+		video_capture_handle = min(video_capture_handles, key = lambda handle: handle.get('accessed'))
+		video_capture_handle['thread'] = thread_ident
+		video_capture_handle['accessed'] = time()
+		return video_capture_handle
+
+
+def create_video_capture_handle(video_path : str) -> Optional[VideoCaptureHandle]:
+	video_capture = cv2.VideoCapture(video_path)
+
+	if video_capture.isOpened():
+		return\
+		{
+			'capture': video_capture,
+			'lock': threading.Lock(),
+			'thread': threading.get_ident(),
+			'position': 0,
+			'frame': {},
+			'accessed': time()
+		}
+	return None
+
+
+def evict_video_captures() -> None:
+	accessed_limit = time() - VIDEO_CAPTURE_IDLE_TIMEOUT
+
+	for video_path, video_capture_handles in list(VIDEO_POOL_SET.get('capture').items()):
+		idle_video_capture_handles = [ video_capture_handle for video_capture_handle in video_capture_handles if video_capture_handle.get('accessed') < accessed_limit and not video_capture_handle.get('lock').locked() ]
+
+		for video_capture_handle in idle_video_capture_handles:
+			video_capture_handle.get('capture').release()
+			video_capture_handles.remove(video_capture_handle)
+
+		if not video_capture_handles:
+			VIDEO_POOL_SET.get('capture').pop(video_path)
+
+
+def count_video_captures(video_path : str) -> int:
+	return len(VIDEO_POOL_SET.get('capture').get(video_path, []))
+
+
+def read_video_capture_metadata(video_path : str) -> Optional[VideoMetadata]:
+	with acquire_video_capture(video_path) as video_capture_handle:
+		if video_capture_handle:
+			video_capture = video_capture_handle.get('capture')
+			video_fps = video_capture.get(cv2.CAP_PROP_FPS)
+			video_frame_total = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+			video_width = int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+			video_height = int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+			video_fourcc = int(video_capture.get(cv2.CAP_PROP_FOURCC))
+
+			if video_fps and video_width and video_height:
+				return\
+				{
+					'fps': video_fps,
+					'frame_total': video_frame_total,
+					'resolution': (video_width, video_height),
+					'duration': video_frame_total / video_fps,
+					'codec': ''.join(chr(video_fourcc >> 8 * index & 0xff) for index in range(4)).strip().lower()
+				}
+	return None
+
+
+def read_video_capture_frame(video_path : str, frame_index : int) -> Optional[VisionFrame]:
+	with acquire_video_capture(video_path) as video_capture_handle:
+		if video_capture_handle:
+			video_frame_cache = video_capture_handle.get('frame')
+			vision_frame = video_frame_cache.pop(frame_index, None)
+
+			if vision_frame is None:
+				vision_frame = decode_video_capture_frame(video_capture_handle, frame_index)
+
+			if vision_frame is not None:
+				video_frame_cache[frame_index] = vision_frame
+
+				if len(video_frame_cache) > VIDEO_FRAME_CACHE_LIMIT:
+					video_frame_cache.pop(next(iter(video_frame_cache)))
+				return vision_frame.copy()
 
+	return None
 
-def get_video_capture(video_path : str) -> cv2.VideoCapture:
-	if video_path not in VIDEO_POOL_SET.get('capture'):
-		video_capture = cv2.VideoCapture(video_path)
 
-		if video_capture.isOpened():
-			VIDEO_POOL_SET['capture'][video_path] = video_capture
+def decode_video_capture_frame(video_capture_handle : VideoCaptureHandle, frame_index : int) -> Optional[VisionFrame]:
+	video_capture = video_capture_handle.get('capture')
+	video_position = video_capture_handle.get('position')
 
-	return VIDEO_POOL_SET.get('capture').get(video_path)
+	if video_position is None or frame_index < video_position or frame_index - video_position > VIDEO_FRAME_SKIP_LIMIT:
+		video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+		video_position = frame_index
 
+	while video_position < frame_index and video_capture.grab():
+		video_position += 1
 
-def get_video_writer(video_path : str) -> cv2.VideoWriter:
-	if video_path not in VIDEO_POOL_SET.get('writer'):
-		video_writer = cv2.VideoWriter()
+	has_vision_frame, vision_frame = video_capture.read()
 
-		if video_writer.isOpened():
-			VIDEO_POOL_SET['writer'][video_path] = video_writer
+	if video_position == frame_index and has_vision_frame:
+		video_capture_handle['position'] = frame_index + 1
+		return vision_frame
 
-	return VIDEO_POOL_SET.get('writer').get(video_path)
+	video_capture_handle['position'] = None
+	return None
 
 
 def clear_video_pool() -> None:
-	for video_capture in VIDEO_POOL_SET.get('capture').values():
-		video_capture.release()
+	if process_manager.count_process_scopes() > 1:
+		return
 
-	for video_writer in VIDEO_POOL_SET.get('writer').values():
-		video_writer.release()
+	with VIDEO_POOL_LOCK:
+		for video_capture_handles in VIDEO_POOL_SET.get('capture').values():
+			for video_capture_handle in video_capture_handles:
+				with video_capture_handle.get('lock'):
+					video_capture_handle.get('capture').release()
 
-	VIDEO_POOL_SET['capture'].clear()
-	VIDEO_POOL_SET['writer'].clear()
+		VIDEO_POOL_SET['capture'].clear()
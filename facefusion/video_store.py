@@ -0,0 +1,155 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from json import JSONDecodeError
+from typing import List, Optional
+
+from facefusion import state_manager
+from facefusion.common_helper import get_first
+from facefusion.filesystem import create_directory, is_video
+from facefusion.hash_helper import create_file_hash
+from facefusion.json import read_json, write_json
+from facefusion.types import VideoMetadata, VideoStore
+
+VIDEO_STORE_VERSION : int = 2
+VIDEO_STORE : VideoStore =\
+{
+	'version': VIDEO_STORE_VERSION,
+	'fingerprints': {},
+	'videos': {}
+}
+VIDEO_STORE_LOCK : threading.Lock = threading.Lock()
+VIDEO_STORE_PATHS : List[str] = []
+
+
+def get_video_store() -> VideoStore:
+	return VIDEO_STORE
+
+
+def get_video_store_path() -> str:
+	temp_path = state_manager.get_item('temp_path') or tempfile.gettempdir()
+	return os.path.join(temp_path, 'facefusion', 'video_store.json')
+
+
+def load_video_store() -> VideoStore:
+	video_store_path = get_video_store_path()
+
+	if video_store_path not in VIDEO_STORE_PATHS:
+		video_store = read_json(video_store_path)
+
+		if video_store and video_store.get('version') == VIDEO_STORE_VERSION:
+			VIDEO_STORE['fingerprints'].update(video_store.get('fingerprints'))
+
+			for video_hash, video_metadata in video_store.get('videos').items():
+				video_metadata['resolution'] = tuple(video_metadata.get('resolution'))
+				VIDEO_STORE['videos'][video_hash] = video_metadata
+
+		VIDEO_STORE_PATHS.append(video_store_path)
+	return VIDEO_STORE
+
+
+def save_video_store() -> bool:
+	video_store_path = get_video_store_path()
+	temp_video_store_path = video_store_path + '.' + str(os.getpid()) + '.tmp'
+
+	if create_directory(os.path.dirname(video_store_path)) and write_json(temp_video_store_path, VIDEO_STORE): #type:ignore[arg-type]
+		os.replace(temp_video_store_path, video_store_path)
+		return True
+	return False
+
+
+def get_video_metadata(video_path : str) -> Optional[VideoMetadata]:
+	if is_video(video_path) and shutil.which('ffprobe'):
+		return register_video(video_path, get_video_hash(video_path))
+	return None
+
+
+def get_video_hash(video_path : str) -> Optional[str]:
+	if is_video(video_path):
+		video_fingerprint = create_video_fingerprint(video_path)
+
+		with VIDEO_STORE_LOCK:
+			video_hash = load_video_store().get('fingerprints').get(video_fingerprint)
+
+		if not video_hash:
+			video_hash = create_file_hash(video_path)
+		return video_hash
+	return None
+
+
+def register_video(video_path : str, video_hash : str) -> Optional[VideoMetadata]:
+	video_fingerprint = create_video_fingerprint(video_path)
+
+	with VIDEO_STORE_LOCK:
+		video_store = load_video_store()
+		video_metadata = video_store.get('videos').get(video_hash)
+
+		if video_store.get('fingerprints').get(video_fingerprint) == video_hash and video_metadata:
+			return video_metadata
+
+	if not video_metadata:
+		video_metadata = probe_video_metadata(video_path)
+
+	with VIDEO_STORE_LOCK:
+		VIDEO_STORE['fingerprints'][video_fingerprint] = video_hash
+
+		if video_metadata:
+			VIDEO_STORE['videos'][video_hash] = video_metadata
+		save_video_store()
+	return video_metadata
+
+
+def create_video_fingerprint(video_path : str) -> str:
+	video_stat = os.stat(video_path)
+	return os.path.abspath(video_path) + ':' + str(video_stat.st_size) + ':' + str(video_stat.st_mtime_ns)
+
+
+def probe_video_metadata(video_path : str) -> Optional[VideoMetadata]:
+	if shutil.which('ffprobe'):
+		commands = [ shutil.which('ffprobe'), '-v', 'error', '-count_packets', '-select_streams', 'v:0', '-show_entries', 'stream=codec_name,width,height,r_frame_rate,avg_frame_rate,nb_read_packets:stream_side_data=rotation:format=duration', '-of', 'json', video_path ]
+		process = subprocess.run(commands, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL)
+
+		if process.returncode == 0:
+			try:
+				probe_content = json.loads(process.stdout)
+			except JSONDecodeError:
+				return None
+
+			video_stream = get_first(probe_content.get('streams'))
+
+			if video_stream:
+				video_fps = parse_frame_rate(video_stream.get('avg_frame_rate')) or parse_frame_rate(video_stream.get('r_frame_rate'))
+				video_duration = float(probe_content.get('format', {}).get('duration', 0))
+				video_frame_total = int(video_stream.get('nb_read_packets')) if str(video_stream.get('nb_read_packets')).isdigit() else 0
+				video_width = video_stream.get('width')
+				video_height = video_stream.get('height')
+
+				if not video_frame_total and video_fps:
+					video_frame_total = round(video_duration * video_fps)
+
+				for side_data in video_stream.get('side_data_list', []):
+					if side_data.get('rotation', 0) % 180 == 90:
+						video_width, video_height = video_height, video_width
+
+				if video_fps and video_width and video_height:
+					return\
+					{
+						'fps': video_fps,
+						'frame_total': video_frame_total,
+						'resolution': (video_width, video_height),
+						'duration': video_duration,
+						'codec': video_stream.get('codec_name')
+					}
+	return None
+
+
+def parse_frame_rate(frame_rate : Optional[str]) -> Optional[float]:
+	if frame_rate:
+		numerator, _, denominator = frame_rate.partition('/')
+
+		if numerator.isdigit() and denominator.isdigit() and int(denominator) > 0:
+			return int(numerator) / int(denominator)
+	return None
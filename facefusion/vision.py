@@ -1,18 +1,18 @@
 import math
+import os
 from functools import lru_cache
-import shutil
-import subprocess
 from typing import List, Optional, Tuple
 
 import cv2
 import numpy
 from cv2.typing import Size
 
+from facefusion import process_manager
 from facefusion.common_helper import is_windows
 from facefusion.filesystem import get_file_extension, is_image, is_video
-from facefusion.thread_helper import thread_semaphore
-from facefusion.types import ColorMode, Duration, Fps, Mask, Orientation, Resolution, Scale, VisionFrame
-from facefusion.video_manager import get_video_capture
+from facefusion.types import ColorMode, Duration, Fps, Mask, Orientation, Resolution, Scale, VideoMetadata, VisionFrame
+from facefusion.video_manager import read_video_capture_frame, read_video_capture_metadata
+from facefusion.video_store import get_video_metadata
 
 
 def read_static_images(image_paths : List[str], color_mode : ColorMode = 'rgb') -> List[VisionFrame]:
@@ -43,6 +43,15 @@ def read_image(image_path : str, color_mode : ColorMode = 'rgb') -> Optional[Vis
 	return None
 
 
+def read_reduced_image(image_path : str) -> Optional[VisionFrame]:
+	if is_image(image_path):
+		if is_windows():
+			image_buffer = numpy.fromfile(image_path, dtype = numpy.uint8)
+			return cv2.imdecode(image_buffer, cv2.IMREAD_REDUCED_COLOR_8)
+		return cv2.imread(image_path, cv2.IMREAD_REDUCED_COLOR_8)
+	return None
+
+
 def write_image(image_path : str, vision_frame : VisionFrame) -> bool:
 	if image_path:
 		if is_windows():
@@ -72,6 +81,21 @@ def restrict_image_resolution(image_path : str, resolution : Resolution) -> Reso
 	return resolution
 
 
+def probe_video(video_path : str) -> Optional[VideoMetadata]:
+	if is_video(video_path):
+		return probe_static_video(video_path, os.stat(video_path).st_mtime_ns)
+	return None
+
+
+@lru_cache(maxsize = 64)
+def probe_static_video(video_path : str, video_mtime : int) -> Optional[VideoMetadata]:
+	video_metadata = get_video_metadata(video_path)
+
+	if not video_metadata:
+		video_metadata = read_video_capture_metadata(video_path)
+	return video_metadata
+
+
 @lru_cache(maxsize = 64)
 def read_static_video_frame(video_path : str, frame_number : int = 0) -> Optional[VisionFrame]:
 	return read_video_frame(video_path, frame_number)
@@ -79,30 +103,27 @@ def read_static_video_frame(video_path : str, frame_number : int = 0) -> Optiona
 
 def read_video_frame(video_path : str, frame_number : int = 0) -> Optional[VisionFrame]:
 	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
+		frame_total = count_video_frame_total(video_path)
+		frame_index = max(0, min(frame_total, frame_number - 1))
 
-		if video_capture and video_capture.isOpened():
-			frame_total = video_capture.get(cv2.CAP_PROP_FRAME_COUNT)
+		return read_video_capture_frame(video_path, frame_index)
 
-			with thread_semaphore():
-				video_capture.set(cv2.CAP_PROP_POS_FRAMES, min(frame_total, frame_number - 1))
-				has_vision_frame, vision_frame = video_capture.read()
+	return None
 
-			if has_vision_frame:
-				return vision_frame
 
-	return None
+def clear_static_frames() -> None:
+	if process_manager.count_process_scopes() > 1:
+		return
 
+	read_static_image.cache_clear()
+	read_static_video_frame.cache_clear()
 
-def count_video_frame_total(video_path : str) -> int:
-	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
 
-		if video_capture and video_capture.isOpened():
-			with thread_semaphore():
-				video_frame_total = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-				return video_frame_total
+def count_video_frame_total(video_path : str) -> int:
+	video_metadata = probe_video(video_path)
 
+	if video_metadata:
+		return video_metadata.get('frame_total')
 	return 0
 
 
@@ -117,25 +138,10 @@ def predict_video_frame_total(video_path : str, fps : Fps, trim_frame_start : in
 
 
 def detect_video_fps(video_path : str) -> Optional[float]:
-	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
-
-		if video_capture and video_capture.isOpened():
-			with thread_semaphore():
-				video_fps = video_capture.get(cv2.CAP_PROP_FPS)
-			if video_fps:
-				return video_fps
+	video_metadata = probe_video(video_path)
 
-		if shutil.which('ffprobe'):
-			commands = [ '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=r_frame_rate', '-of', 'default=noprint_wrappers=1:nokey=1', video_path ]
-			process = subprocess.Popen([ shutil.which('ffprobe') ] + commands, stdout = subprocess.PIPE)
-			output, _ = process.communicate()
-			if process.returncode == 0:
-				try:
-					numerator, denominator = map(int, output.decode().strip().split('/'))
-					return numerator / denominator
-				except Exception:
-					pass
+	if video_metadata:
+		return video_metadata.get('fps')
 	return None
 
 
@@ -184,15 +190,10 @@ def restrict_trim_frame(video_path : str, trim_frame_start : Optional[int], trim
 
 
 def detect_video_resolution(video_path : str) -> Optional[Resolution]:
-	if is_video(video_path):
-		video_capture = get_video_capture(video_path)
-
-		if video_capture and video_capture.isOpened():
-			with thread_semaphore():
-				width = video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)
-				height = video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
-				return int(width), int(height)
+	video_metadata = probe_video(video_path)
 
+	if video_metadata:
+		return video_metadata.get('resolution')
 	return None
 
 
@@ -284,6 +285,14 @@ def obscure_frame(vision_frame : VisionFrame) -> VisionFrame:
 	return cv2.GaussianBlur(vision_frame, (99, 99), 0)
 
 
+def create_thumbnail_frame(vision_frame : VisionFrame) -> VisionFrame:
+	return cv2.resize(vision_frame, (64, 64), interpolation = cv2.INTER_AREA).astype(numpy.int16)
+
+
+def calculate_thumbnail_difference(thumbnail_vision_frame : VisionFrame, other_thumbnail_vision_frame : VisionFrame) -> float:
+	return float(numpy.mean(numpy.abs(thumbnail_vision_frame - other_thumbnail_vision_frame))) / 255 * 100
+
+
 def blend_frame(source_vision_frame : VisionFrame, target_vision_frame : VisionFrame, blend_factor : float) -> VisionFrame:
 	blend_vision_frame = cv2.addWeighted(source_vision_frame, 1 - blend_factor, target_vision_frame, blend_factor, 0)
 	return blend_vision_frame
@@ -291,26 +300,33 @@ def blend_frame(source_vision_frame : VisionFrame, target_vision_frame : VisionF
 
 def conditional_match_frame_color(source_vision_frame : VisionFrame, target_vision_frame : VisionFrame) -> VisionFrame:
 	histogram_factor = calculate_histogram_difference(source_vision_frame, target_vision_frame)
-	target_vision_frame = blend_frame(target_vision_frame, match_frame_color(source_vision_frame, target_vision_frame), histogram_factor)
-	return target_vision_frame
-
 
-def match_frame_color(source_vision_frame : VisionFrame, target_vision_frame : VisionFrame) -> VisionFrame:
-	color_difference_sizes = numpy.linspace(16, target_vision_frame.shape[0], 3, endpoint = False)
-
-	for color_difference_size in color_difference_sizes:
-		source_vision_frame = equalize_frame_color(source_vision_frame, target_vision_frame, normalize_resolution((color_difference_size, color_difference_size)))
-	target_vision_frame = equalize_frame_color(source_vision_frame, target_vision_frame, target_vision_frame.shape[:2][::-1])
+	if histogram_factor > 0:
+		target_vision_frame = blend_frame(target_vision_frame, match_frame_color(source_vision_frame, target_vision_frame), histogram_factor)
 	return target_vision_frame
 
 
-def equalize_frame_color(source_vision_frame : VisionFrame, target_vision_frame : VisionFrame, size : Size) -> VisionFrame:
-	source_frame_resize = cv2.resize(source_vision_frame, size, interpolation = cv2.INTER_AREA).astype(numpy.float32)
-	target_frame_resize = cv2.resize(target_vision_frame, size, interpolation = cv2.INTER_AREA).astype(numpy.float32)
-	color_difference_vision_frame = numpy.subtract(source_frame_resize, target_frame_resize)
-	color_difference_vision_frame = cv2.resize(color_difference_vision_frame, target_vision_frame.shape[:2][::-1], interpolation = cv2.INTER_CUBIC)
-	target_vision_frame = numpy.add(target_vision_frame, color_difference_vision_frame).clip(0, 255).astype(numpy.uint8)
-	return target_vision_frame
+def match_frame_color(source_vision_frame : VisionFrame, target_vision_frame : VisionFrame) -> VisionFrame:
+	target_size = target_vision_frame.shape[:2][::-1]
+	color_difference_sizes = [ normalize_resolution((color_difference_size, color_difference_size)) for color_difference_size in numpy.linspace(16, target_vision_frame.shape[0], 3, endpoint = False) ]
+	target_frame_resizes = create_color_pyramid(target_vision_frame, color_difference_sizes)
+	target_vision_frame = target_vision_frame.astype(numpy.float32)
+	match_vision_frame = source_vision_frame
+	color_difference_vision_frame = numpy.empty_like(target_vision_frame)
+
+	for color_difference_size, target_frame_resize in zip(color_difference_sizes, target_frame_resizes):
+		source_frame_resize = cv2.resize(match_vision_frame, color_difference_size, interpolation = cv2.INTER_AREA).astype(numpy.float32, copy = False)
+		numpy.subtract(source_frame_resize, target_frame_resize, out = source_frame_resize)
+		cv2.resize(source_frame_resize, target_size, dst = color_difference_vision_frame, interpolation = cv2.INTER_CUBIC)
+		numpy.add(color_difference_vision_frame, target_vision_frame, out = color_difference_vision_frame)
+		numpy.clip(color_difference_vision_frame, 0, 255, out = color_difference_vision_frame)
+		match_vision_frame = color_difference_vision_frame
+
+	return match_vision_frame.astype(numpy.uint8)
+
+
+def create_color_pyramid(vision_frame : VisionFrame, sizes : List[Resolution]) -> List[VisionFrame]:
+	return [ cv2.resize(vision_frame, size, interpolation = cv2.INTER_AREA).astype(numpy.float32) for size in sizes ]
 
 
 def calculate_histogram_difference(source_vision_frame : VisionFrame, target_vision_frame : VisionFrame) -> float:
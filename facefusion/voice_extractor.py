@@ -1,5 +1,6 @@
-from functools import lru_cache
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import List, Tuple
 
 import numpy
 import scipy
@@ -125,34 +126,51 @@ def pre_check() -> bool:
 
 
 def batch_extract_voice(audio : Audio, chunk_size : int, step_size : int) -> Voice:
+	voice_batch_size = 8
 	temp_voice = numpy.zeros((audio.shape[0], 2)).astype(numpy.float32)
 	temp_voice_chunk = numpy.zeros((audio.shape[0], 2)).astype(numpy.float32)
+	audio_ranges = [ (start, min(start + chunk_size, audio.shape[0])) for start in range(0, audio.shape[0], step_size) ]
 
-	for start in range(0, audio.shape[0], step_size):
-		end = min(start + chunk_size, audio.shape[0])
-		temp_voice[start:end, ...] += extract_voice(audio[start:end, ...])
-		temp_voice_chunk[start:end, ...] += 1
+	with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), initializer = state_manager.bind_scope_state, initargs = (state_manager.get_scope_state(),)) as executor:
+		for index in range(0, len(audio_ranges), voice_batch_size):
+			batch_audio_ranges = audio_ranges[index:index + voice_batch_size]
+			temp_audio_chunks = [ audio[start:end, ...] for start, end in batch_audio_ranges ]
+			temp_voice_chunks = extract_voices(temp_audio_chunks, executor)
+
+			for (start, end), voice_chunk in zip(batch_audio_ranges, temp_voice_chunks):
+				temp_voice[start:end, ...] += voice_chunk
+				temp_voice_chunk[start:end, ...] += 1
 
 	voice = temp_voice / temp_voice_chunk
 	return voice
 
 
-def extract_voice(temp_audio_chunk : AudioChunk) -> VoiceChunk:
+def extract_voices(temp_audio_chunks : List[AudioChunk], executor : ThreadPoolExecutor) -> List[VoiceChunk]:
 	voice_extractor = get_inference_pool().get(state_manager.get_item('voice_extractor_model'))
 	voice_trim_size = 3840
 	voice_chunk_size = (voice_extractor.get_inputs()[0].shape[3] - 1) * 1024
-	temp_audio_chunk, audio_pad_size = prepare_audio_chunk(temp_audio_chunk.T, voice_chunk_size, voice_trim_size)
-	temp_audio_chunk = decompose_audio_chunk(temp_audio_chunk, voice_trim_size)
-	temp_audio_chunk = forward(temp_audio_chunk)
-	temp_audio_chunk = compose_audio_chunk(temp_audio_chunk, voice_trim_size)
-	temp_audio_chunk = normalize_audio_chunk(temp_audio_chunk, voice_chunk_size, voice_trim_size, audio_pad_size)
+	decomposed_audio_chunks, audio_pad_sizes = zip(*executor.map(partial(decompose_voice_chunk, chunk_size = voice_chunk_size, audio_trim_size = voice_trim_size), temp_audio_chunks))
+	audio_split_indices = numpy.cumsum([ len(decomposed_audio_chunk) for decomposed_audio_chunk in decomposed_audio_chunks ])[:-1]
+	forwarded_audio_chunks = numpy.split(forward(numpy.concatenate(decomposed_audio_chunks)), audio_split_indices)
+	return list(executor.map(partial(compose_voice_chunk, chunk_size = voice_chunk_size, audio_trim_size = voice_trim_size), forwarded_audio_chunks, audio_pad_sizes))
+
+
+def decompose_voice_chunk(temp_audio_chunk : AudioChunk, chunk_size : int, audio_trim_size : int) -> Tuple[AudioChunk, int]:
+	temp_audio_chunk, audio_pad_size = prepare_audio_chunk(temp_audio_chunk.T, chunk_size, audio_trim_size)
+	temp_audio_chunk = decompose_audio_chunk(temp_audio_chunk, audio_trim_size)
+	return temp_audio_chunk, audio_pad_size
+
+
+def compose_voice_chunk(temp_audio_chunk : AudioChunk, audio_pad_size : int, chunk_size : int, audio_trim_size : int) -> VoiceChunk:
+	temp_audio_chunk = compose_audio_chunk(temp_audio_chunk, audio_trim_size)
+	temp_audio_chunk = normalize_audio_chunk(temp_audio_chunk, chunk_size, audio_trim_size, audio_pad_size)
 	return temp_audio_chunk
 
 
 def forward(temp_audio_chunk : AudioChunk) -> AudioChunk:
 	voice_extractor = get_inference_pool().get(state_manager.get_item('voice_extractor_model'))
 
-	with thread_semaphore():
+	with thread_semaphore(voice_extractor):
 		temp_audio_chunk = voice_extractor.run(None,
 		{
 			'input': temp_audio_chunk
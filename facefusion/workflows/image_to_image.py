@@ -78,6 +78,7 @@ def process_image() -> ErrorCode:
 			'source_vision_frames': source_vision_frames,
 			'source_audio_frame': source_audio_frame,
 			'source_voice_frame': source_voice_frame,
+			'scene_index': 0,
 			'target_vision_frame': target_vision_frame[:, :, :3],
 			'temp_vision_frame': temp_vision_frame[:, :, :3],
 			'temp_vision_mask': temp_vision_mask
@@ -1,19 +1,23 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import partial
+from typing import Any, Dict, List
 
 import numpy
 from tqdm import tqdm
 
 from facefusion import ffmpeg
 from facefusion import logger, process_manager, state_manager, translator, video_manager
-from facefusion.audio import create_empty_audio_frame, get_audio_frame, get_voice_frame
+from facefusion.audio import clear_audio_pool, create_empty_audio_frame, get_audio_frame, get_voice_frame
 from facefusion.common_helper import get_first
 from facefusion.content_analyser import analyse_video
+from facefusion.face_masker import clear_face_mask_set
+from facefusion.face_store import load_face_index, resolve_face_index_path, save_face_index
 from facefusion.filesystem import filter_audio_paths, is_video
-from facefusion.processors.core import get_processors_modules
+from facefusion.processors.core import get_frame_batch_size, get_processors_modules, process_frames
+from facefusion.scene_detector import detect_scene_cuts, get_scene_index, read_scene_cuts, write_scene_cuts
 from facefusion.temp_helper import clear_temp_directory, create_temp_directory, move_temp_file, resolve_temp_frame_paths
 from facefusion.time_helper import calculate_end_time
-from facefusion.types import ErrorCode
+from facefusion.types import ErrorCode, SceneCuts
 from facefusion.vision import conditional_merge_vision_mask, detect_video_resolution, extract_vision_mask, pack_resolution, read_static_image, read_static_images, read_static_video_frame, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, scale_resolution, write_image
 from facefusion.workflows.core import is_process_stopping
 
@@ -23,6 +27,7 @@ def process(start_time : float) -> ErrorCode:
 	[
 		setup,
 		extract_frames,
+		detect_scenes,
 		process_video,
 		merge_frames,
 		restore_audio,
@@ -71,18 +76,38 @@ def extract_frames() -> ErrorCode:
 	return 0
 
 
+def detect_scenes() -> ErrorCode:
+	scene_cut_threshold = state_manager.get_item('scene_cut_threshold')
+
+	if scene_cut_threshold:
+		temp_frame_paths = resolve_temp_frame_paths(state_manager.get_item('target_path'))
+		logger.info(translator.get('detecting_scenes'), __name__)
+		scene_cuts = detect_scene_cuts(temp_frame_paths, scene_cut_threshold)
+
+		if is_process_stopping():
+			return 4
+		write_scene_cuts(state_manager.get_item('target_path'), scene_cuts)
+		logger.debug(translator.get('detecting_scenes_succeeded').format(scene_total = len(scene_cuts) + 1), __name__)
+	return 0
+
+
 def process_video() -> ErrorCode:
 	temp_frame_paths = resolve_temp_frame_paths(state_manager.get_item('target_path'))
+	face_index_path = resolve_face_index_path(state_manager.get_item('target_path'))
+	scene_cuts = read_scene_cuts(state_manager.get_item('target_path'))
 
 	if temp_frame_paths:
+		load_face_index(face_index_path)
+
 		with tqdm(total = len(temp_frame_paths), desc = translator.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
 			progress.set_postfix(execution_providers = state_manager.get_item('execution_providers'))
 
-			with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
+			with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), initializer = state_manager.bind_scope_state, initargs = (state_manager.get_scope_state(),)) as executor:
 				futures = []
+				frame_batch_size = get_frame_batch_size(get_processors_modules(state_manager.get_item('processors')))
 
-				for frame_number, temp_frame_path in enumerate(temp_frame_paths):
-					future = executor.submit(process_temp_frame, temp_frame_path, frame_number)
+				for frame_start in range(0, len(temp_frame_paths), frame_batch_size):
+					future = executor.submit(process_temp_frames, temp_frame_paths[frame_start:frame_start + frame_batch_size], frame_start, scene_cuts)
 					futures.append(future)
 
 				for future in as_completed(futures):
@@ -91,8 +116,7 @@ def process_video() -> ErrorCode:
 							__future__.cancel()
 
 					if not future.cancelled():
-						future.result()
-						progress.update()
+						progress.update(len(future.result()))
 						try:
 							from facefusion.api.websocket import manager
 							percentage = (progress.n / progress.total) * 100 if progress.total else 0
@@ -111,9 +135,12 @@ def process_video() -> ErrorCode:
 
 		for processor_module in get_processors_modules(state_manager.get_item('processors')):
 			processor_module.post_process()
+		clear_audio_pool()
+		clear_face_mask_set()
 
 		if is_process_stopping():
 			return 4
+		save_face_index(face_index_path)
 	else:
 		logger.error(translator.get('temp_frames_not_found'), __name__)
 		return 1
@@ -167,37 +194,46 @@ def restore_audio() -> ErrorCode:
 	return 0
 
 
-def process_temp_frame(temp_frame_path : str, frame_number : int) -> bool:
+def process_temp_frames(temp_frame_paths : List[str], frame_start : int, scene_cuts : SceneCuts) -> List[bool]:
 	reference_vision_frame = read_static_video_frame(state_manager.get_item('target_path'), state_manager.get_item('reference_frame_number'))
 	source_vision_frames = read_static_images(state_manager.get_item('source_paths'))
 	source_audio_path = get_first(filter_audio_paths(state_manager.get_item('source_paths')))
 	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
-	target_vision_frame = read_static_image(temp_frame_path, 'rgba')
-	temp_vision_frame = target_vision_frame.copy()
-	temp_vision_mask = extract_vision_mask(temp_vision_frame)
+	processor_inputs : List[Dict[str, Any]] = []
 
-	source_audio_frame = get_audio_frame(source_audio_path, temp_video_fps, frame_number)
-	source_voice_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
+	for frame_number, temp_frame_path in enumerate(temp_frame_paths, frame_start):
+		target_vision_frame = read_static_image(temp_frame_path, 'rgba')
+		temp_vision_frame = target_vision_frame.copy()
+		temp_vision_mask = extract_vision_mask(temp_vision_frame)
 
-	if not numpy.any(source_audio_frame):
-		source_audio_frame = create_empty_audio_frame()
-	if not numpy.any(source_voice_frame):
-		source_voice_frame = create_empty_audio_frame()
+		source_audio_frame = get_audio_frame(source_audio_path, temp_video_fps, frame_number)
+		source_voice_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
 
-	for processor_module in get_processors_modules(state_manager.get_item('processors')):
-		temp_vision_frame, temp_vision_mask = processor_module.process_frame(
+		if not numpy.any(source_audio_frame):
+			source_audio_frame = create_empty_audio_frame()
+		if not numpy.any(source_voice_frame):
+			source_voice_frame = create_empty_audio_frame()
+
+		processor_inputs.append(
 		{
 			'reference_vision_frame': reference_vision_frame,
 			'source_vision_frames': source_vision_frames,
 			'source_audio_frame': source_audio_frame,
 			'source_voice_frame': source_voice_frame,
+			'scene_index': get_scene_index(scene_cuts, frame_number),
 			'target_vision_frame': target_vision_frame[:, :, :3],
 			'temp_vision_frame': temp_vision_frame[:, :, :3],
 			'temp_vision_mask': temp_vision_mask
 		})
 
-	temp_vision_frame = conditional_merge_vision_mask(temp_vision_frame, temp_vision_mask)
-	return write_image(temp_frame_path, temp_vision_frame)
+	for processor_module in get_processors_modules(state_manager.get_item('processors')):
+		processor_outputs = process_frames(processor_module, processor_inputs)
+
+		for processor_input, (temp_vision_frame, temp_vision_mask) in zip(processor_inputs, processor_outputs):
+			processor_input['temp_vision_frame'] = temp_vision_frame
+			processor_input['temp_vision_mask'] = temp_vision_mask
+
+	return [ write_image(temp_frame_path, conditional_merge_vision_mask(processor_input.get('temp_vision_frame'), processor_input.get('temp_vision_mask'))) for temp_frame_path, processor_input in zip(temp_frame_paths, processor_inputs) ]
 
 
 def finalize_video(start_time : float) -> ErrorCode:
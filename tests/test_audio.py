@@ -1,9 +1,17 @@
+import os
 import subprocess
+import tempfile
+import time
+from typing import Callable
 
+import numpy
 import pytest
+import scipy
 
-from facefusion.audio import get_audio_frame, read_static_audio
+from facefusion import state_manager
+from facefusion.audio import calculate_spectrogram_total, clear_audio_pool, create_audio_frame_indices, create_mel_filter_bank, create_spectrogram, extract_audio_frame, extract_audio_frames, get_audio_frame, read_static_audio, read_voice_spectrogram, resolve_voice_cache_path, scan_static_audio, write_voice_cache
 from facefusion.download import conditional_download
+from facefusion.types import Audio, AudioFrames
 from .helper import get_test_example_file, get_test_examples_directory
 
 
@@ -14,6 +22,8 @@ def before_all() -> None:
 		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/source.mp3'
 	])
 	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('source.mp3'), get_test_example_file('source.wav') ])
+	state_manager.init_item('temp_path', tempfile.gettempdir())
+	state_manager.init_item('voice_extractor_model', 'kim_vocal_2')
 
 
 def test_get_audio_frame() -> None:
@@ -21,8 +31,84 @@ def test_get_audio_frame() -> None:
 	assert hasattr(get_audio_frame(get_test_example_file('source.wav'), 25), '__array_interface__')
 	assert get_audio_frame('invalid', 25) is None
 
+	audio_frames = read_static_audio(get_test_example_file('source.mp3'), 25)
+
+	for frame_number in [ 0, 1, 140, 279, 10 ]:
+		assert numpy.array_equal(get_audio_frame(get_test_example_file('source.mp3'), 25, frame_number), audio_frames[frame_number])
+
+	assert get_audio_frame(get_test_example_file('source.mp3'), 25, 280) is None
+	clear_audio_pool()
+
+
+def test_scan_static_audio() -> None:
+	audio_sample_total, _ = scan_static_audio(get_test_example_file('source.mp3'))
+
+	assert len(create_audio_frame_indices(calculate_spectrogram_total(audio_sample_total), 25)) == 280
+	assert scan_static_audio('invalid') is None
+
 
 def test_read_static_audio() -> None:
 	assert len(read_static_audio(get_test_example_file('source.mp3'), 25)) == 280
 	assert len(read_static_audio(get_test_example_file('source.wav'), 25)) == 280
 	assert read_static_audio('invalid', 25) is None
+
+
+def test_read_voice_spectrogram() -> None:
+	voice_cache_path = resolve_voice_cache_path(get_test_example_file('source.mp3'))
+	spectrogram = numpy.random.rand(80, 100)
+
+	assert voice_cache_path.endswith('-kim_vocal_2.npy')
+	assert write_voice_cache(voice_cache_path, spectrogram) is True
+	assert numpy.array_equal(read_voice_spectrogram(get_test_example_file('source.mp3')), spectrogram)
+	assert read_voice_spectrogram('invalid') is None
+
+	os.remove(voice_cache_path)
+
+
+def test_extract_audio_frames() -> None:
+	spectrogram = numpy.random.rand(80, 1000)
+	audio_frames = extract_audio_frames(spectrogram, 25)
+
+	assert audio_frames.shape == (308, 80, 16)
+
+	for frame_number in [ 0, 1, 100, 307 ]:
+		assert numpy.array_equal(audio_frames[frame_number], extract_audio_frame(spectrogram, 25, frame_number))
+
+	assert extract_audio_frame(spectrogram, 25, 308) is None
+	assert extract_audio_frames(spectrogram[:, :10], 25).shape == (0, 80, 16)
+
+
+def test_extract_audio_frames_long_clip() -> None:
+	audio = numpy.random.default_rng(0).uniform(-1.0, 1.0, 16000 * 300)
+	spectrogram = create_spectrogram(audio)
+	audio_frames = extract_audio_frames(spectrogram, 25)
+	spectrogram_indices = [ index for index in numpy.arange(0, spectrogram.shape[1], 80 / 25).astype(numpy.int64) if index >= 16 ]
+
+	assert audio_frames.shape == (len(spectrogram_indices), 80, 16)
+
+	for frame_number, index in enumerate(spectrogram_indices):
+		assert numpy.array_equal(audio_frames[frame_number], spectrogram[:, index - 16:index])
+
+	assert numpy.array_equal(create_mel_filter_bank(), create_mel_filter_bank.__wrapped__())
+
+
+def test_extract_audio_frames_benchmark(record_property : Callable[[str, float], None]) -> None:
+	audio_chunks = numpy.array_split(numpy.random.default_rng(0).uniform(-1.0, 1.0, 16000 * 300), 30)
+
+	def extract_slice_audio_frames(audio : Audio) -> AudioFrames:
+		spectrogram = numpy.dot(create_mel_filter_bank.__wrapped__(), numpy.abs(scipy.signal.stft(audio, nperseg = 800, nfft = 800, noverlap = 600)[2]))
+		indices = numpy.arange(0, spectrogram.shape[1], 80 / 25).astype(numpy.int64)
+		return numpy.array([ spectrogram[:, max(0, index - 16):index] for index in indices[indices >= 16] ])
+
+	slice_start = time.perf_counter()
+	slice_audio_frames = [ extract_slice_audio_frames(audio_chunk) for audio_chunk in audio_chunks ]
+	slice_time = time.perf_counter() - slice_start
+	window_start = time.perf_counter()
+	window_audio_frames = [ extract_audio_frames(create_spectrogram(audio_chunk), 25) for audio_chunk in audio_chunks ]
+	window_time = time.perf_counter() - window_start
+
+	record_property('slice_time', slice_time)
+	record_property('window_time', window_time)
+	print('extract audio frames of a five minute clip: {:.3f}s sliced, {:.3f}s windowed, {:.1f}x speedup'.format(slice_time, window_time, slice_time / window_time))
+
+	assert all(numpy.allclose(slice_audio_frame, window_audio_frame) for slice_audio_frame, window_audio_frame in zip(slice_audio_frames, window_audio_frames))
@@ -0,0 +1,89 @@
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from facefusion.processors.modules.expression_restorer import core as expression_restorer
+from facefusion.processors.modules.expression_restorer.core import clear_motion_index, extract_motions, get_target_expression, load_motion_index, save_motion_index, set_target_expression
+from facefusion.types import VisionFrame
+from .helper import get_test_output_file, prepare_test_output_directory
+
+
+class FakeNode:
+	def __init__(self, shape : List[Any]) -> None:
+		self.shape = shape
+
+
+class FakeMotionExtractor:
+	def __init__(self, batch_size : Any) -> None:
+		self.batch_size = batch_size
+		self.run_total = 0
+
+	def get_inputs(self) -> List[FakeNode]:
+		return [ FakeNode([ self.batch_size, 3, 256, 256 ]) ]
+
+	def get_outputs(self) -> List[FakeNode]:
+		return [ FakeNode([ self.batch_size, 21, 3 ]) ]
+
+	def get_providers(self) -> List[str]:
+		return [ 'CPUExecutionProvider' ]
+
+	def run(self, output_names : Any, input_feed : Dict[str, VisionFrame]) -> List[Any]:
+		crop_vision_frame = input_feed.get('input')
+		motion_value = crop_vision_frame.mean(axis = (1, 2, 3)).reshape(-1, 1, 1)
+		self.run_total += 1
+		return [ motion_value[:, 0], motion_value[:, 0], motion_value[:, 0], motion_value[:, 0], motion_value[:, 0], numpy.tile(motion_value, (1, 21, 3)), numpy.tile(motion_value * 2, (1, 21, 3)) ]
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_motion_index()
+	prepare_test_output_directory()
+
+
+def test_extract_motions() -> None:
+	target_crop_vision_frame = numpy.full((1, 3, 256, 256), 0.25, dtype = numpy.float32)
+	temp_crop_vision_frame = numpy.full((1, 3, 256, 256), 0.75, dtype = numpy.float32)
+	batch_motion_extractor = FakeMotionExtractor('batch')
+	motion_extractor = FakeMotionExtractor(1)
+
+	with patch.object(expression_restorer, 'get_inference_pool', return_value = { 'motion_extractor': batch_motion_extractor }):
+		batch_target_expression, batch_temp_motion = extract_motions(target_crop_vision_frame, temp_crop_vision_frame)
+
+		assert batch_motion_extractor.run_total == 1
+
+	clear_motion_index()
+
+	with patch.object(expression_restorer, 'get_inference_pool', return_value = { 'motion_extractor': motion_extractor }):
+		target_expression, temp_motion = extract_motions(target_crop_vision_frame, temp_crop_vision_frame)
+
+		assert motion_extractor.run_total == 2
+		assert numpy.array_equal(batch_target_expression, target_expression)
+		assert all(numpy.array_equal(batch_temp_motion[index], temp_motion[index]) for index in range(len(temp_motion)))
+
+		cache_target_expression, _ = extract_motions(target_crop_vision_frame, temp_crop_vision_frame)
+
+		assert motion_extractor.run_total == 3
+		assert cache_target_expression is target_expression
+
+
+def test_save_and_load_motion_index() -> None:
+	motion_index_path = get_test_output_file('motion_index.npz')
+	target_expression = numpy.full((1, 21, 3), 0.5, dtype = numpy.float32)
+
+	assert load_motion_index(motion_index_path) is False
+
+	set_target_expression('a', target_expression)
+
+	assert save_motion_index() is True
+
+	clear_motion_index()
+
+	assert get_target_expression('a') is None
+	assert load_motion_index(motion_index_path) is True
+	assert numpy.array_equal(get_target_expression('a'), target_expression)
+	assert get_target_expression('a').flags.writeable is False
+	assert save_motion_index() is True
+	assert load_motion_index('invalid') is False
+	assert get_target_expression('a') is None
@@ -0,0 +1,66 @@
+import numpy
+
+from facefusion import state_manager
+from facefusion.face_helper import WARP_TEMPLATE_SET, estimate_matrix_by_face_landmark_5, estimate_similarity_matrix, paste_back
+
+
+def test_paste_back() -> None:
+	temp_vision_frame = numpy.zeros((240, 320, 3), dtype = numpy.uint8)
+	crop_vision_frame = numpy.full((64, 64, 3), 200, dtype = numpy.uint8)
+	crop_vision_mask = numpy.ones((64, 64), dtype = numpy.float32)
+	affine_matrix = numpy.array([ [ 1, 0, -100 ], [ 0, 1, -50 ] ], dtype = numpy.float64)
+	paste_vision_frame = paste_back(temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix)
+
+	assert numpy.all(temp_vision_frame == 0)
+	assert numpy.all(paste_vision_frame[60:100, 110:150] == 200)
+	assert numpy.all(paste_vision_frame[:40] == 0)
+	assert numpy.all(paste_vision_frame[:, 180:] == 0)
+
+	crop_vision_mask = numpy.full((64, 64), 0.5, dtype = numpy.float32)
+
+	assert paste_back(temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix, in_place = True) is temp_vision_frame
+	assert numpy.all(temp_vision_frame[60:100, 110:150] == 100)
+	assert numpy.all(temp_vision_frame[:40] == 0)
+
+
+def test_paste_back_outside() -> None:
+	temp_vision_frame = numpy.zeros((240, 320, 3), dtype = numpy.uint8)
+	crop_vision_frame = numpy.full((64, 64, 3), 200, dtype = numpy.uint8)
+	crop_vision_mask = numpy.ones((64, 64), dtype = numpy.float32)
+	affine_matrix = numpy.array([ [ 1, 0, 500 ], [ 0, 1, 500 ] ], dtype = numpy.float64)
+
+	assert numpy.all(paste_back(temp_vision_frame, crop_vision_frame, crop_vision_mask, affine_matrix) == 0)
+
+
+def test_estimate_matrix_by_face_landmark_5() -> None:
+	face_landmark_5 = numpy.array([ [ 100, 120 ], [ 160, 118 ], [ 130, 150 ], [ 108, 180 ], [ 155, 178 ] ], dtype = numpy.float32)
+	affine_matrix = estimate_matrix_by_face_landmark_5(face_landmark_5, 'ffhq_512', (512, 512))
+
+	assert affine_matrix.shape == (2, 3)
+	assert affine_matrix.flags.writeable is False
+	assert estimate_matrix_by_face_landmark_5(face_landmark_5.copy(), 'ffhq_512', (512, 512)) is affine_matrix
+	assert estimate_matrix_by_face_landmark_5(face_landmark_5.astype(numpy.float64), 'ffhq_512', (512, 512)) is not affine_matrix
+	assert estimate_matrix_by_face_landmark_5(face_landmark_5, 'arcface_128', (512, 512)) is not affine_matrix
+	assert numpy.allclose(estimate_matrix_by_face_landmark_5(face_landmark_5.astype(numpy.float64), 'ffhq_512', (512, 512)), affine_matrix)
+
+	state_manager.init_item('face_alignment_method', 'ransac')
+
+	assert estimate_matrix_by_face_landmark_5(numpy.zeros((5, 2), dtype = numpy.float32), 'ffhq_512', (512, 512)) is None
+
+
+def test_estimate_similarity_matrix() -> None:
+	face_landmark_5 = numpy.array([ [ 100, 120 ], [ 160, 118 ], [ 130, 150 ], [ 108, 180 ], [ 155, 178 ] ], dtype = numpy.float32)
+	warp_template_norm = WARP_TEMPLATE_SET.get('ffhq_512') * 512
+	affine_matrix = numpy.array([ [ 0.8, -0.6, 40 ], [ 0.6, 0.8, -20 ] ])
+
+	assert numpy.allclose(estimate_similarity_matrix(face_landmark_5, face_landmark_5 @ affine_matrix[:, :2].T + affine_matrix[:, 2]), affine_matrix)
+
+	state_manager.init_item('face_alignment_method', 'ransac')
+	ransac_matrix = estimate_matrix_by_face_landmark_5(face_landmark_5, 'ffhq_512', (512, 512))
+	state_manager.init_item('face_alignment_method', 'least-squares')
+	least_squares_matrix = estimate_matrix_by_face_landmark_5(face_landmark_5, 'ffhq_512', (512, 512))
+
+	assert least_squares_matrix is not ransac_matrix
+	assert numpy.allclose(least_squares_matrix, ransac_matrix, atol = 1e-3)
+	assert numpy.allclose(estimate_similarity_matrix(face_landmark_5, warp_template_norm), least_squares_matrix)
+	state_manager.init_item('face_alignment_method', 'ransac')
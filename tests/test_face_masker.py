@@ -0,0 +1,60 @@
+import numpy
+
+from facefusion.face_masker import FACE_MASK_LIMIT, clear_face_mask_set, create_box_mask, create_mask_key, get_face_mask, merge_crop_masks, refine_face_mask, set_face_mask
+
+
+def test_create_box_mask() -> None:
+	crop_vision_frame = numpy.zeros((256, 256, 3), dtype = numpy.uint8)
+	box_mask = create_box_mask(crop_vision_frame, 0.3, (0, 0, 0, 0))
+
+	assert box_mask.shape == (256, 256)
+	assert box_mask.flags.writeable is False
+	assert box_mask[0, 0] < 0.01 and box_mask[128, 128] > 0.99
+	assert create_box_mask(crop_vision_frame.copy(), 0.3, (0, 0, 0, 0)) is box_mask
+	assert create_box_mask(crop_vision_frame, 0.5, (0, 0, 0, 0)) is not box_mask
+
+
+def test_refine_face_mask() -> None:
+	face_mask = numpy.zeros((128, 128), dtype = numpy.float32)
+	face_mask[32:96, 32:96] = 2
+
+	assert refine_face_mask(face_mask) is face_mask
+	assert face_mask.min() == 0 and face_mask.max() == 1
+	assert face_mask[64, 64] == 1 and face_mask[0, 0] == 0
+
+
+def test_merge_crop_masks() -> None:
+	crop_masks =\
+	[
+		numpy.array([ [ 0.5, 1.2 ], [ 0.3, 0.9 ] ], dtype = numpy.float32),
+		numpy.array([ [ 0.7, 1.5 ], [ -0.2, 0.4 ] ], dtype = numpy.float32)
+	]
+	crop_masks[0].setflags(write = False)
+
+	assert numpy.array_equal(merge_crop_masks(crop_masks), numpy.array([ [ 0.5, 1 ], [ 0, 0.4 ] ], dtype = numpy.float32))
+
+
+def test_create_mask_key() -> None:
+	crop_vision_frame = numpy.zeros((256, 256, 3), dtype = numpy.uint8)
+
+	assert create_mask_key(crop_vision_frame, [ 'xseg_1' ]) == create_mask_key(crop_vision_frame.copy(), [ 'xseg_1' ])
+	assert create_mask_key(crop_vision_frame, [ 'xseg_1' ]) != create_mask_key(crop_vision_frame, [ 'xseg_2' ])
+	assert create_mask_key(crop_vision_frame, [ 'xseg_1' ]) != create_mask_key(crop_vision_frame + 1, [ 'xseg_1' ])
+	assert create_mask_key(crop_vision_frame, [ 'xseg_1' ]) != create_mask_key(crop_vision_frame.reshape(128, 512, 3), [ 'xseg_1' ])
+
+
+def test_set_face_mask() -> None:
+	clear_face_mask_set()
+
+	for index in range(FACE_MASK_LIMIT + 1):
+		face_mask = set_face_mask(str(index), numpy.full((8, 8), index, dtype = numpy.float32))
+
+		assert face_mask.flags.writeable is False
+		assert get_face_mask(str(index)) is face_mask
+
+	assert get_face_mask('0') is None
+	assert get_face_mask('1') is not None
+
+	clear_face_mask_set()
+
+	assert get_face_mask('1') is None
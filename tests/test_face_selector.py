@@ -0,0 +1,95 @@
+from typing import List
+
+import numpy
+
+from facefusion import state_manager
+from facefusion.face_selector import calculate_face_distances, create_reference_key, filter_faces_by_age, filter_faces_by_gender, filter_faces_by_race, find_match_faces, get_reference_face, sort_faces_by_order
+from facefusion.face_store import clear_static_faces, get_reference_faces, set_reference_faces
+from facefusion.types import Age, Face, Gender, Race
+
+
+def create_face(bounding_box : List[float], score : float, embedding : List[float], gender : Gender, age : Age, race : Race) -> Face:
+	embedding_norm = numpy.array(embedding) / numpy.linalg.norm(embedding)
+	return Face(
+		bounding_box = numpy.array(bounding_box),
+		score_set =
+		{
+			'detector': score,
+			'landmarker': 0.0
+		},
+		landmark_set = {},
+		angle = 0,
+		embedding = embedding_norm,
+		embedding_norm = embedding_norm,
+		gender = gender,
+		age = age,
+		race = race
+	)
+
+
+FACES =\
+[
+	create_face([ 10, 50, 30, 80 ], 0.7, [ 1, 0, 0 ], 'female', range(20, 29), 'asian'),
+	create_face([ 40, 10, 90, 60 ], 0.9, [ 0, 1, 0 ], 'male', range(30, 39), 'white'),
+	create_face([ 0, 30, 10, 40 ], 0.7, [ 1, 0.1, 0 ], 'female', range(60, 69), 'white')
+]
+
+
+def test_find_match_faces() -> None:
+	assert find_match_faces([ FACES[0] ], FACES, 0.3) == [ FACES[0], FACES[2] ]
+	assert find_match_faces([ FACES[1], FACES[0] ], FACES, 0.3) == [ FACES[1], FACES[0], FACES[2] ]
+	assert find_match_faces([ FACES[0], FACES[2] ], FACES, 0.3) == [ FACES[0], FACES[2], FACES[0], FACES[2] ]
+	assert find_match_faces([ None ], FACES, 0.3) == []
+	assert find_match_faces([ FACES[0] ], [], 0.3) == []
+
+
+def test_calculate_face_distances() -> None:
+	face_distances = calculate_face_distances(numpy.array([[ 1.0, 0.0 ]]), numpy.array([[ 1.0, 0.0 ], [ 0.0, 1.0 ], [ -1.0, 0.0 ]]))
+
+	assert face_distances.tolist() == [[ 0.0, 0.5, 1.0 ]]
+
+
+def test_sort_faces_by_order() -> None:
+	assert sort_faces_by_order(FACES, 'left-right') == [ FACES[2], FACES[0], FACES[1] ]
+	assert sort_faces_by_order(FACES, 'right-left') == [ FACES[1], FACES[0], FACES[2] ]
+	assert sort_faces_by_order(FACES, 'top-bottom') == [ FACES[1], FACES[2], FACES[0] ]
+	assert sort_faces_by_order(FACES, 'bottom-top') == [ FACES[0], FACES[2], FACES[1] ]
+	assert sort_faces_by_order(FACES, 'small-large') == [ FACES[2], FACES[0], FACES[1] ]
+	assert sort_faces_by_order(FACES, 'large-small') == [ FACES[1], FACES[0], FACES[2] ]
+	assert sort_faces_by_order(FACES, 'best-worst') == [ FACES[1], FACES[0], FACES[2] ]
+	assert sort_faces_by_order(FACES, 'worst-best') == [ FACES[0], FACES[2], FACES[1] ]
+
+
+def test_filter_faces() -> None:
+	assert filter_faces_by_gender(FACES, 'female') == [ FACES[0], FACES[2] ]
+	assert filter_faces_by_race(FACES, 'white') == [ FACES[1], FACES[2] ]
+	assert filter_faces_by_race([], 'white') == []
+	assert filter_faces_by_age(FACES, 25, 35) == [ FACES[0], FACES[1] ]
+	assert filter_faces_by_age(FACES, 29, 30) == []
+	assert filter_faces_by_age(FACES, 30, 30) == []
+	assert filter_faces_by_age([], 0, 100) == []
+
+
+def test_get_reference_face() -> None:
+	reference_vision_frame = numpy.zeros((240, 320, 3), dtype = numpy.uint8)
+	state_manager.init_item('reference_frame_number', 10)
+	state_manager.init_item('reference_face_position', 0)
+	state_manager.init_item('face_detector_margin', (0, 0, 0, 0))
+	reference_key = create_reference_key(reference_vision_frame)
+	set_reference_faces(reference_key, [ FACES[1] ])
+
+	assert get_reference_face(reference_vision_frame) == FACES[1]
+	assert create_reference_key(reference_vision_frame[:120]) != reference_key
+
+	state_manager.init_item('reference_frame_number', 20)
+
+	assert create_reference_key(reference_vision_frame) != reference_key
+
+	reference_key = create_reference_key(reference_vision_frame)
+	state_manager.init_item('face_detector_margin', (10, 0, 10, 0))
+
+	assert create_reference_key(reference_vision_frame) != reference_key
+
+	clear_static_faces()
+
+	assert get_reference_faces(reference_key) is None
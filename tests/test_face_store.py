@@ -0,0 +1,105 @@
+import tempfile
+
+import numpy
+import pytest
+
+from facefusion import state_manager
+from facefusion.download import conditional_download
+from facefusion.face_store import clear_static_faces, get_face_store, get_static_faces, load_face_index, pack_faces, resolve_face_index_path, save_face_index, set_static_faces, unpack_faces
+from facefusion.types import Face
+from .helper import get_test_example_file, get_test_examples_directory, get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	conditional_download(get_test_examples_directory(),
+	[
+		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/target-240p.mp4'
+	])
+	state_manager.init_item('temp_path', tempfile.gettempdir())
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_static_faces()
+	prepare_test_output_directory()
+
+
+def create_face(seed : int) -> Face:
+	random_state = numpy.random.RandomState(seed)
+	return Face(
+		bounding_box = random_state.rand(4),
+		score_set =
+		{
+			'detector': 0.9,
+			'landmarker': 0.8
+		},
+		landmark_set =
+		{
+			'5': random_state.rand(5, 2),
+			'5/68': random_state.rand(5, 2),
+			'68': random_state.rand(68, 2),
+			'68/5': random_state.rand(68, 2)
+		},
+		angle = 90,
+		embedding = random_state.rand(512),
+		embedding_norm = random_state.rand(512),
+		gender = 'female',
+		age = range(20, 29),
+		race = 'asian'
+	)
+
+
+def test_pack_faces() -> None:
+	faces = [ create_face(0), create_face(1) ]
+	face_index = pack_faces({ 'a': faces, 'b': [] })
+
+	assert face_index.get('frame_hashes').tolist() == [ 'a', 'b' ]
+	assert face_index.get('frame_face_totals').tolist() == [ 2, 0 ]
+	assert face_index.get('landmarks_68').shape == (2, 68, 2)
+
+	unpacked_faces = unpack_faces(face_index, 0, 2)
+
+	for face, unpacked_face in zip(faces, unpacked_faces):
+		assert numpy.array_equal(face.bounding_box, unpacked_face.bounding_box)
+		assert numpy.array_equal(face.landmark_set.get('68'), unpacked_face.landmark_set.get('68'))
+		assert numpy.array_equal(face.embedding_norm, unpacked_face.embedding_norm)
+		assert unpacked_face.score_set.get('detector') == 0.9
+		assert unpacked_face.angle == 90
+		assert unpacked_face.gender == 'female'
+		assert unpacked_face.age == range(20, 29)
+		assert unpacked_face.race == 'asian'
+
+
+def test_save_and_load_face_index() -> None:
+	face_index_path = get_test_output_file('face_index.npz')
+	vision_frame = numpy.full((8, 8, 3), 1, dtype = numpy.uint8)
+	empty_vision_frame = numpy.full((8, 8, 3), 2, dtype = numpy.uint8)
+
+	set_static_faces(vision_frame, [ create_face(0) ])
+	set_static_faces(empty_vision_frame, [])
+
+	assert save_face_index(face_index_path) is True
+
+	clear_static_faces()
+
+	assert load_face_index(face_index_path) is True
+	assert get_face_store().get('static_faces') == {}
+	assert all(len(frame_hash) == 32 for frame_hash in get_face_store().get('face_index_frames'))
+	assert numpy.array_equal(get_static_faces(vision_frame)[0].embedding, create_face(0).embedding)
+	assert get_static_faces(empty_vision_frame) == []
+	assert get_static_faces(numpy.zeros((8, 8, 3), dtype = numpy.uint8)) is None
+	assert load_face_index('invalid') is False
+
+
+def test_resolve_face_index_path() -> None:
+	video_path = get_test_example_file('target-240p.mp4')
+	state_manager.init_item('face_detector_margin', (0, 0, 0, 0))
+	face_index_path = resolve_face_index_path(video_path)
+
+	assert face_index_path.endswith('.npz')
+
+	state_manager.init_item('face_detector_margin', (10, 0, 10, 0))
+
+	assert resolve_face_index_path(video_path) != face_index_path
+	assert resolve_face_index_path('invalid') is None
@@ -1,12 +1,18 @@
 import subprocess
+import threading
+from typing import List
 
 import pytest
 
+from facefusion import process_manager, state_manager
 from facefusion.download import conditional_download
+from facefusion.face_store import load_face_index, save_face_index
 from facefusion.filesystem import copy_file
-from facefusion.jobs.job_manager import add_step, clear_jobs, create_job, init_jobs, move_job_file, submit_job, submit_jobs
-from facefusion.jobs.job_runner import collect_output_set, finalize_steps, retry_job, retry_jobs, run_job, run_jobs, run_steps
+from facefusion.jobs.job_manager import add_step, clear_jobs, create_job, get_steps, init_jobs, move_job_file, remix_step, submit_job, submit_jobs
+from facefusion.jobs.job_runner import collect_output_set, collect_step_dependencies, finalize_steps, retry_job, retry_jobs, run_job, run_jobs, run_steps
 from facefusion.types import Args
+from facefusion.video_manager import VIDEO_POOL_SET, clear_video_pool
+from facefusion.vision import clear_static_frames, read_static_video_frame
 from .helper import get_test_example_file, get_test_examples_directory, get_test_jobs_directory, get_test_output_file, is_test_output_file, prepare_test_output_directory
 
 
@@ -25,6 +31,7 @@ def before_each() -> None:
 	clear_jobs(get_test_jobs_directory())
 	init_jobs(get_test_jobs_directory())
 	prepare_test_output_directory()
+	state_manager.init_item('job_concurrency', 1)
 
 
 def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
@@ -193,6 +200,119 @@ def test_run_steps() -> None:
 	assert run_steps('job-test-run-steps', process_step) is True
 
 
+def test_run_steps_with_concurrency() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.mp4'),
+		'output_path': get_test_output_file('output-1.mp4')
+	}
+	args_2 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.jpg'),
+		'output_path': get_test_output_file('output-2.jpg')
+	}
+	args_3 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'output_path': get_test_output_file('output-3.mp4')
+	}
+
+	create_job('job-test-run-steps-with-concurrency')
+	add_step('job-test-run-steps-with-concurrency', args_1)
+	add_step('job-test-run-steps-with-concurrency', args_2)
+	remix_step('job-test-run-steps-with-concurrency', 0, args_3)
+	state_manager.init_item('job_concurrency', 2)
+
+	assert run_steps('job-test-run-steps-with-concurrency', process_step) is True
+	assert [ step.get('status') for step in get_steps('job-test-run-steps-with-concurrency') ] == [ 'completed', 'completed', 'completed' ]
+
+
+def test_run_steps_with_concurrent_video_steps() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.mp4'),
+		'output_path': get_test_output_file('output-1.mp4')
+	}
+	args_2 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_output_file('target-240p-copy.mp4'),
+		'output_path': get_test_output_file('output-2.mp4')
+	}
+	step_barrier = threading.Barrier(2, timeout = 10)
+	process_scope_totals : List[int] = []
+
+	def process_video_step(job_id : str, step_index : int, step_args : Args) -> bool:
+		target_path = step_args.get('target_path')
+		face_index_path = get_test_output_file('face-index-' + str(step_index) + '.npz')
+
+		assert read_static_video_frame(target_path, 1) is not None
+
+		step_barrier.wait()
+		process_scope_totals.append(process_manager.count_process_scopes())
+		clear_video_pool()
+		clear_static_frames()
+
+		assert load_face_index(face_index_path) is False
+		assert save_face_index(face_index_path) is False
+
+		step_barrier.wait()
+
+		assert target_path in VIDEO_POOL_SET.get('capture')
+		assert read_static_video_frame(target_path, 2) is not None
+		return copy_file(target_path, step_args.get('output_path'))
+
+	copy_file(get_test_example_file('target-240p.mp4'), get_test_output_file('target-240p-copy.mp4'))
+	create_job('job-test-run-concurrent-video-steps')
+	add_step('job-test-run-concurrent-video-steps', args_1)
+	add_step('job-test-run-concurrent-video-steps', args_2)
+	state_manager.init_item('job_concurrency', 2)
+
+	assert run_steps('job-test-run-concurrent-video-steps', process_video_step) is True
+	assert process_scope_totals == [ 2, 2 ]
+	assert process_manager.count_process_scopes() == 0
+	assert [ step.get('status') for step in get_steps('job-test-run-concurrent-video-steps') ] == [ 'completed', 'completed' ]
+
+
+def test_collect_step_dependencies() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.mp4'),
+		'output_path': get_test_output_file('output-1.mp4')
+	}
+	args_2 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-1080p.mp4'),
+		'output_path': get_test_output_file('output-2.mp4')
+	}
+	args_3 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'output_path': get_test_output_file('output-3.mp4')
+	}
+
+	create_job('job-test-collect-step-dependencies')
+	add_step('job-test-collect-step-dependencies', args_1)
+	add_step('job-test-collect-step-dependencies', args_2)
+	add_step('job-test-collect-step-dependencies', args_1)
+	remix_step('job-test-collect-step-dependencies', 1, args_3)
+
+	step_dependencies =\
+	{
+		0: [],
+		1: [],
+		2: [ 0 ],
+		3: [ 1 ]
+	}
+
+	assert collect_step_dependencies('job-test-collect-step-dependencies', get_steps('job-test-collect-step-dependencies')) == step_dependencies
+
+
 def test_finalize_steps() -> None:
 	args_1 =\
 	{
@@ -0,0 +1,108 @@
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from facefusion import state_manager
+from facefusion.processors.modules.lip_syncer import core as lip_syncer
+from facefusion.processors.modules.lip_syncer.core import process_frame, process_frames
+from facefusion.processors.modules.lip_syncer.types import LipSyncerInputs
+from facefusion.types import Face, VisionFrame
+
+
+class FakeNode:
+	def __init__(self, shape : List[Any]) -> None:
+		self.shape = shape
+
+
+class FakeLipSyncer:
+	def __init__(self, batch_size : Any) -> None:
+		self.batch_size = batch_size
+		self.run_total = 0
+
+	def get_inputs(self) -> List[FakeNode]:
+		return [ FakeNode([ self.batch_size, 3, 256, 256 ]) ]
+
+	def get_outputs(self) -> List[FakeNode]:
+		return [ FakeNode([ self.batch_size, 3, 256, 256 ]) ]
+
+	def get_providers(self) -> List[str]:
+		return [ 'CPUExecutionProvider' ]
+
+	def run(self, output_names : Any, input_feed : Dict[str, VisionFrame]) -> List[VisionFrame]:
+		source_audio_frame = input_feed.get('source')
+		crop_vision_frame = input_feed.get('target')
+		self.run_total += 1
+		return [ crop_vision_frame * 0.5 + source_audio_frame.mean(axis = (1, 2, 3)).reshape(-1, 1, 1, 1) * 0.01 ]
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('download_providers', [ 'github' ])
+	state_manager.init_item('lip_syncer_model', 'edtalk_256')
+	state_manager.init_item('lip_syncer_weight', 0.5)
+	state_manager.init_item('face_mask_types', [ 'box' ])
+	state_manager.init_item('face_mask_blur', 0.3)
+	state_manager.init_item('face_mask_padding', (0, 0, 0, 0))
+
+
+def create_face(offset : int) -> Face:
+	face_landmark_5 = numpy.array([ [ 100, 120 ], [ 160, 118 ], [ 130, 150 ], [ 108, 180 ], [ 155, 178 ] ], dtype = numpy.float32) + offset
+	return Face(
+		bounding_box = numpy.array([ 80, 90, 180, 200 ]) + offset,
+		score_set =
+		{
+			'detector': 0.9,
+			'landmarker': 0.8
+		},
+		landmark_set =
+		{
+			'5': face_landmark_5,
+			'5/68': face_landmark_5,
+			'68': numpy.zeros((68, 2)),
+			'68/5': numpy.zeros((68, 2))
+		},
+		angle = 0,
+		embedding = numpy.zeros(512),
+		embedding_norm = numpy.zeros(512),
+		gender = 'female',
+		age = range(20, 29),
+		race = 'asian'
+	)
+
+
+def create_lip_syncer_inputs(frame_total : int) -> List[LipSyncerInputs]:
+	random_state = numpy.random.RandomState(0)
+	return [
+		{
+			'reference_vision_frame': numpy.zeros((320, 320, 3), dtype = numpy.uint8),
+			'source_voice_frame': random_state.rand(80, 16),
+			'target_vision_frame': random_state.randint(0, 255, (320, 320, 3), dtype = numpy.uint8),
+			'temp_vision_frame': random_state.randint(0, 255, (320, 320, 3), dtype = numpy.uint8),
+			'temp_vision_mask': numpy.ones((320, 320), dtype = numpy.float32)
+		} for _ in range(frame_total) ]
+
+
+def test_process_frames() -> None:
+	batch_lip_syncer = FakeLipSyncer('batch')
+	lip_syncer_session = FakeLipSyncer(1)
+
+	with patch.object(lip_syncer, 'select_faces', return_value = [ create_face(0), create_face(40) ]), patch.object(lip_syncer, 'scale_face', side_effect = lambda target_face, target_vision_frame, temp_vision_frame: target_face):
+		with patch.object(lip_syncer, 'get_inference_pool', return_value = { 'lip_syncer': batch_lip_syncer }):
+			batch_outputs = process_frames(create_lip_syncer_inputs(3))
+
+			assert batch_lip_syncer.run_total == 1
+
+		with patch.object(lip_syncer, 'get_inference_pool', return_value = { 'lip_syncer': lip_syncer_session }):
+			outputs = process_frames(create_lip_syncer_inputs(3))
+
+			assert lip_syncer_session.run_total == 6
+
+			frame_outputs = [ process_frame(lip_syncer_inputs) for lip_syncer_inputs in create_lip_syncer_inputs(3) ]
+
+	assert not numpy.array_equal(batch_outputs[0][0], create_lip_syncer_inputs(1)[0].get('temp_vision_frame'))
+
+	for (batch_vision_frame, _), (temp_vision_frame, _), (frame_vision_frame, _) in zip(batch_outputs, outputs, frame_outputs):
+		assert numpy.array_equal(batch_vision_frame, temp_vision_frame)
+		assert numpy.array_equal(temp_vision_frame, frame_vision_frame)
@@ -1,4 +1,4 @@
-from facefusion.process_manager import end, is_pending, is_processing, is_stopping, set_process_state, start, stop
+from facefusion.process_manager import count_process_scopes, end, is_pending, is_processing, is_stopping, scope_process, set_process_state, start, stop
 
 
 def test_start() -> None:
@@ -20,3 +20,22 @@ def test_end() -> None:
 	end()
 
 	assert is_pending()
+
+
+def test_scope_process() -> None:
+	set_process_state('pending')
+
+	with scope_process():
+		start()
+
+		assert count_process_scopes() == 1
+		assert is_processing()
+
+		stop()
+
+		assert is_stopping()
+
+		end()
+
+	assert count_process_scopes() == 0
+	assert is_pending()
@@ -0,0 +1,46 @@
+from types import ModuleType
+from typing import Any, Dict, List
+
+import numpy
+
+from facefusion.processors.core import get_frame_batch_size, process_frames
+from facefusion.processors.types import ProcessorOutputs
+
+
+def process_frame(inputs : Dict[str, Any]) -> ProcessorOutputs:
+	return inputs.get('temp_vision_frame') + inputs.get('frame_number'), inputs.get('temp_vision_mask')
+
+
+def create_processor_module(frame_batch_size : int) -> ModuleType:
+	processor_module = ModuleType('processor_module')
+	processor_module.process_frame = process_frame #type:ignore[attr-defined]
+	processor_module.get_frame_batch_size = lambda: frame_batch_size #type:ignore[attr-defined]
+	return processor_module
+
+
+def create_processor_inputs(frame_total : int) -> List[Dict[str, Any]]:
+	return [ { 'frame_number': frame_number, 'temp_vision_frame': numpy.zeros((8, 8, 3), dtype = numpy.uint8), 'temp_vision_mask': numpy.ones((8, 8), dtype = numpy.float32) } for frame_number in range(frame_total) ]
+
+
+def test_get_frame_batch_size() -> None:
+	assert get_frame_batch_size([]) == 1
+	assert get_frame_batch_size([ ModuleType('processor_module') ]) == 1
+	assert get_frame_batch_size([ create_processor_module(1), create_processor_module(4) ]) == 4
+
+
+def test_process_frames() -> None:
+	processor_module = create_processor_module(1)
+	processor_inputs = create_processor_inputs(4)
+	processor_outputs = process_frames(processor_module, processor_inputs)
+
+	assert len(processor_outputs) == 4
+
+	for processor_input, (temp_vision_frame, temp_vision_mask) in zip(processor_inputs, processor_outputs):
+		reference_vision_frame, reference_vision_mask = process_frame(processor_input)
+
+		assert numpy.array_equal(temp_vision_frame, reference_vision_frame)
+		assert temp_vision_mask is reference_vision_mask
+
+	processor_module.process_frames = lambda inputs_list: [ (inputs.get('temp_vision_frame'), inputs.get('temp_vision_mask')) for inputs in inputs_list ] #type:ignore[attr-defined]
+
+	assert all(numpy.all(temp_vision_frame == 0) for temp_vision_frame, _ in process_frames(processor_module, processor_inputs))
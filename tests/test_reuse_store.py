@@ -0,0 +1,60 @@
+import numpy
+import pytest
+
+from facefusion.reuse_store import REUSE_FRAMES, REUSE_FRAME_LIMIT, clear_reuse_frames, find_reuse_frame, resolve_reuse_frame, store_reuse_frame
+from facefusion.types import VisionFrame
+from facefusion.vision import create_thumbnail_frame
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_reuse_frames()
+
+
+def test_find_reuse_frame() -> None:
+	thumbnail_vision_frame = create_thumbnail_frame(numpy.zeros((240, 320, 3), dtype = numpy.uint8))
+	other_thumbnail_vision_frame = create_thumbnail_frame(numpy.full((240, 320, 3), 10, dtype = numpy.uint8))
+	vision_frame = numpy.full((64, 64), 255, dtype = numpy.uint8)
+
+	store_reuse_frame(('target-240p.mp4', 'rmbg_2.0', 0), thumbnail_vision_frame, vision_frame)
+
+	assert find_reuse_frame(('target-240p.mp4', 'rmbg_2.0', 0), other_thumbnail_vision_frame, 5) is vision_frame
+	assert find_reuse_frame(('target-240p.mp4', 'rmbg_2.0', 0), other_thumbnail_vision_frame, 2) is None
+	assert find_reuse_frame(('target-240p.mp4', 'rmbg_2.0', 1), other_thumbnail_vision_frame, 5) is None
+	assert find_reuse_frame(('target-1080p.mp4', 'rmbg_2.0', 0), other_thumbnail_vision_frame, 5) is None
+	assert find_reuse_frame(('target-240p.mp4', 'u2net_cloth', 0), other_thumbnail_vision_frame, 5) is None
+	assert find_reuse_frame(('target-240p.mp4', 'ddcolor', '256x256', 0), other_thumbnail_vision_frame, 5) is None
+
+
+def test_store_reuse_frame() -> None:
+	for scene_index in range(REUSE_FRAME_LIMIT + 1):
+		thumbnail_vision_frame = create_thumbnail_frame(numpy.full((240, 320, 3), scene_index, dtype = numpy.uint8))
+		store_reuse_frame(('target-240p.mp4', 'rmbg_2.0', scene_index), thumbnail_vision_frame, numpy.zeros((64, 64), dtype = numpy.uint8))
+
+	assert len(REUSE_FRAMES) == REUSE_FRAME_LIMIT
+	assert REUSE_FRAMES[0].get('reuse_key') == ('target-240p.mp4', 'rmbg_2.0', 1)
+	assert REUSE_FRAMES[-1].get('reuse_key') == ('target-240p.mp4', 'rmbg_2.0', REUSE_FRAME_LIMIT)
+
+
+def test_resolve_reuse_frame() -> None:
+	temp_vision_frame = numpy.zeros((240, 320, 3), dtype = numpy.uint8)
+	other_vision_frame = numpy.full((240, 320, 3), 10, dtype = numpy.uint8)
+	different_vision_frame = numpy.full((240, 320, 3), 200, dtype = numpy.uint8)
+	reuse_key = ('target-240p.mp4', 'ddcolor', '256x256', 0)
+	vision_frames = []
+
+	def create_vision_frame(vision_frame : VisionFrame) -> VisionFrame:
+		vision_frames.append(vision_frame)
+		return vision_frame.copy()
+
+	reuse_vision_frame = resolve_reuse_frame(reuse_key, temp_vision_frame, 5, create_vision_frame)
+
+	assert resolve_reuse_frame(reuse_key, other_vision_frame, 5, create_vision_frame) is reuse_vision_frame
+	assert len(vision_frames) == 1
+	assert resolve_reuse_frame(reuse_key, different_vision_frame, 5, create_vision_frame) is not reuse_vision_frame
+	assert len(vision_frames) == 2
+
+	resolve_reuse_frame(reuse_key, temp_vision_frame, 0, create_vision_frame)
+
+	assert len(vision_frames) == 3
+	assert len(REUSE_FRAMES) == 2
@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+import numpy
+import pytest
+
+from facefusion import state_manager
+from facefusion.download import conditional_download
+from facefusion.scene_detector import detect_scene_cuts, get_scene_index, read_scene_cuts, write_scene_cuts
+from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_directory_path
+from facefusion.vision import write_image
+from .helper import get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	conditional_download(get_test_examples_directory(),
+	[
+		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/target-240p.mp4'
+	])
+	state_manager.init_item('temp_path', tempfile.gettempdir())
+	state_manager.init_item('temp_frame_format', 'png')
+	state_manager.init_item('execution_thread_count', 4)
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	state_manager.set_item('keep_temp', False)
+	clear_temp_directory(get_test_example_file('target-240p.mp4'))
+	create_temp_directory(get_test_example_file('target-240p.mp4'))
+
+
+def test_detect_scene_cuts() -> None:
+	temp_directory_path = get_temp_directory_path(get_test_example_file('target-240p.mp4'))
+	temp_frame_paths = []
+
+	for frame_number, frame_value in enumerate([ 20, 22, 24, 200, 202, 40 ]):
+		temp_frame_path = os.path.join(temp_directory_path, str(frame_number).zfill(4) + '.png')
+		write_image(temp_frame_path, numpy.full((240, 320, 3), frame_value, dtype = numpy.uint8))
+		temp_frame_paths.append(temp_frame_path)
+
+	assert detect_scene_cuts(temp_frame_paths, 30) == [ 3, 5 ]
+	assert detect_scene_cuts(temp_frame_paths, 90) == []
+
+
+def test_read_scene_cuts() -> None:
+	assert read_scene_cuts(get_test_example_file('target-240p.mp4')) == []
+	assert write_scene_cuts(get_test_example_file('target-240p.mp4'), [ 3, 5 ]) is True
+	assert read_scene_cuts(get_test_example_file('target-240p.mp4')) == [ 3, 5 ]
+
+
+def test_get_scene_index() -> None:
+	assert get_scene_index([], 10) == 0
+	assert get_scene_index([ 3, 5 ], 0) == 0
+	assert get_scene_index([ 3, 5 ], 3) == 1
+	assert get_scene_index([ 3, 5 ], 4) == 1
+	assert get_scene_index([ 3, 5 ], 5) == 2
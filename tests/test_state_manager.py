@@ -3,7 +3,7 @@ from typing import Union
 import pytest
 
 from facefusion.processors.types import ProcessorState
-from facefusion.state_manager import STATE_SET, get_item, init_item, set_item
+from facefusion.state_manager import STATE_SET, get_item, init_item, scope_state, set_item
 from facefusion.types import AppContext, State
 
 
@@ -33,3 +33,14 @@ def test_get_item_and_set_item() -> None:
 
 	assert get_item('video_memory_strategy') == 'tolerant'
 	assert get_state('ui').get('video_memory_strategy') is None
+
+
+def test_scope_state() -> None:
+	set_item('video_memory_strategy', 'tolerant')
+
+	with scope_state():
+		set_item('video_memory_strategy', 'strict')
+
+		assert get_item('video_memory_strategy') == 'strict'
+
+	assert get_item('video_memory_strategy') == 'tolerant'
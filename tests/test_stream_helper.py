@@ -0,0 +1,44 @@
+import io
+import tempfile
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from facefusion.api.stream_helper import iterate_file_range, parse_range_header, store_stream
+
+
+def test_store_stream() -> None:
+	upload_directory = Path(tempfile.mkdtemp())
+	file_id, file_path = store_stream(io.BytesIO(b'facefusion'), upload_directory, '.MP4', 1024)
+
+	assert file_path == upload_directory / (file_id + '.mp4')
+	assert file_path.read_bytes() == b'facefusion'
+	assert store_stream(io.BytesIO(b'facefusion'), upload_directory, '.mp4', 1024) == (file_id, file_path)
+	assert len(list(upload_directory.iterdir())) == 1
+
+	with pytest.raises(HTTPException):
+		store_stream(io.BytesIO(b'facefusion'), upload_directory, '.mp4', 4)
+	assert len(list(upload_directory.iterdir())) == 1
+
+
+def test_parse_range_header() -> None:
+	assert parse_range_header(None, 100) is None
+	assert parse_range_header('bytes=0-9', 100) == (0, 9)
+	assert parse_range_header('bytes=90-', 100) == (90, 99)
+	assert parse_range_header('bytes=-10', 100) == (90, 99)
+	assert parse_range_header('bytes=-200', 100) == (0, 99)
+	assert parse_range_header('bytes=50-200', 100) == (50, 99)
+	assert parse_range_header('bytes=0-9, 20-29', 100) is None
+	assert parse_range_header('items=0-9', 100) is None
+
+	with pytest.raises(HTTPException):
+		parse_range_header('bytes=100-', 100)
+
+
+def test_iterate_file_range() -> None:
+	file_path = Path(tempfile.mkdtemp()) / 'test.bin'
+	file_path.write_bytes(bytes(range(100)))
+
+	assert b''.join(iterate_file_range(file_path, 10, 19)) == bytes(range(10, 20))
+	assert b''.join(iterate_file_range(file_path, 95, 99)) == bytes(range(95, 100))
@@ -0,0 +1,65 @@
+from typing import List
+
+from facefusion import state_manager
+from facefusion.thread_helper import NULL_CONTEXT, conditional_thread_semaphore, resolve_execution_provider, thread_semaphore
+
+
+class InferenceSessionMock:
+	def __init__(self, inference_session_providers : List[str]) -> None:
+		self.inference_session_providers = inference_session_providers
+
+	def get_providers(self) -> List[str]:
+		return self.inference_session_providers
+
+
+def test_thread_semaphore() -> None:
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('execution_session_limit', 2)
+	inference_session = InferenceSessionMock([ 'CPUExecutionProvider' ])
+	other_inference_session = InferenceSessionMock([ 'CPUExecutionProvider' ])
+
+	assert thread_semaphore(inference_session) is thread_semaphore(inference_session)
+	assert thread_semaphore(inference_session) is not thread_semaphore(other_inference_session)
+
+	with thread_semaphore(inference_session):
+		assert thread_semaphore(inference_session).acquire(blocking = False) is True
+		assert thread_semaphore(inference_session).acquire(blocking = False) is False
+		assert thread_semaphore(other_inference_session).acquire(blocking = False) is True
+		thread_semaphore(inference_session).release()
+		thread_semaphore(other_inference_session).release()
+
+	session_semaphore = thread_semaphore(inference_session)
+	state_manager.init_item('execution_session_limit', 1)
+
+	assert thread_semaphore(inference_session) is not session_semaphore
+
+	with thread_semaphore(inference_session):
+		assert thread_semaphore(inference_session).acquire(blocking = False) is False
+
+	state_manager.init_item('execution_session_limit', 2)
+	inference_session = InferenceSessionMock([ 'DmlExecutionProvider', 'CPUExecutionProvider' ])
+	other_inference_session = InferenceSessionMock([ 'DmlExecutionProvider', 'CPUExecutionProvider' ])
+
+	assert thread_semaphore(inference_session) is thread_semaphore(other_inference_session)
+
+	with thread_semaphore(inference_session):
+		assert thread_semaphore(other_inference_session).acquire(blocking = False) is False
+
+
+def test_resolve_execution_provider() -> None:
+	assert resolve_execution_provider(InferenceSessionMock([ 'CUDAExecutionProvider', 'CPUExecutionProvider' ])) == 'cuda'
+	assert resolve_execution_provider(InferenceSessionMock([ 'ROCMExecutionProvider' ])) == 'rocm'
+	assert resolve_execution_provider(InferenceSessionMock([])) is None
+
+
+def test_conditional_thread_semaphore() -> None:
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('execution_session_limit', None)
+	inference_session = InferenceSessionMock([ 'CPUExecutionProvider' ])
+
+	assert conditional_thread_semaphore(inference_session) is NULL_CONTEXT
+	assert conditional_thread_semaphore(InferenceSessionMock([ 'MIGraphXExecutionProvider' ])) is thread_semaphore(InferenceSessionMock([ 'MIGraphXExecutionProvider' ]))
+
+	state_manager.init_item('execution_session_limit', 2)
+
+	assert conditional_thread_semaphore(inference_session) is thread_semaphore(inference_session)
@@ -0,0 +1,110 @@
+import threading
+from time import time
+
+import cv2
+import numpy
+import pytest
+
+from facefusion import video_manager
+from facefusion.download import conditional_download
+from facefusion.types import VisionFrame
+from facefusion.video_manager import clear_video_pool, count_video_captures, evict_video_captures, read_video_capture_frame, read_video_capture_metadata, select_video_capture_handle
+from .helper import get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	conditional_download(get_test_examples_directory(),
+	[
+		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/target-240p.mp4'
+	])
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_video_pool()
+
+
+def seek_video_frame(video_path : str, frame_index : int) -> VisionFrame:
+	video_capture = cv2.VideoCapture(video_path)
+	video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+	_, vision_frame = video_capture.read()
+	video_capture.release()
+	return vision_frame
+
+
+def test_read_video_capture_frame() -> None:
+	video_path = get_test_example_file('target-240p.mp4')
+
+	for frame_index in [ 0, 1, 2, 50, 10, 200, 201 ]:
+		assert numpy.array_equal(read_video_capture_frame(video_path, frame_index), seek_video_frame(video_path, frame_index))
+
+	assert video_manager.VIDEO_POOL_SET.get('capture').get(video_path)[0].get('position') == 202
+	assert read_video_capture_frame(video_path, 270) is None
+	assert read_video_capture_frame('invalid', 0) is None
+
+
+def test_read_video_capture_frame_cache() -> None:
+	video_path = get_test_example_file('target-240p.mp4')
+	vision_frame = read_video_capture_frame(video_path, 10)
+	vision_frame.fill(0)
+
+	assert numpy.array_equal(read_video_capture_frame(video_path, 10), seek_video_frame(video_path, 10))
+	assert video_manager.VIDEO_POOL_SET.get('capture').get(video_path)[0].get('position') == 11
+
+	for frame_index in range(video_manager.VIDEO_FRAME_CACHE_LIMIT + 1):
+		read_video_capture_frame(video_path, frame_index)
+
+	assert len(video_manager.VIDEO_POOL_SET.get('capture').get(video_path)[0].get('frame')) == video_manager.VIDEO_FRAME_CACHE_LIMIT
+
+
+def test_read_video_capture_metadata() -> None:
+	video_metadata = read_video_capture_metadata(get_test_example_file('target-240p.mp4'))
+
+	assert video_metadata.get('fps') == 25.0
+	assert video_metadata.get('resolution') == (426, 226)
+	assert video_metadata.get('codec') == 'h264'
+	assert read_video_capture_metadata('invalid') is None
+
+
+def test_video_capture_pool() -> None:
+	video_path = get_test_example_file('target-240p.mp4')
+	barrier = threading.Barrier(video_manager.VIDEO_CAPTURE_LIMIT + 2)
+
+	def read_video_frames() -> None:
+		barrier.wait()
+		for frame_index in range(10):
+			read_video_capture_frame(video_path, frame_index)
+
+	threads = [ threading.Thread(target = read_video_frames) for _ in range(video_manager.VIDEO_CAPTURE_LIMIT + 2) ]
+
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	assert count_video_captures(video_path) == video_manager.VIDEO_CAPTURE_LIMIT
+
+	read_video_capture_frame(video_path, 0)
+	clear_video_pool()
+
+	assert count_video_captures(video_path) == 0
+
+
+def test_evict_video_captures() -> None:
+	video_path = get_test_example_file('target-240p.mp4')
+	select_time = time()
+	video_capture_handle = select_video_capture_handle(video_path)
+	video_capture_handle['accessed'] = select_time - video_manager.VIDEO_CAPTURE_IDLE_TIMEOUT + 1
+
+	assert select_video_capture_handle(video_path) is video_capture_handle
+	assert video_capture_handle.get('accessed') >= select_time
+
+	evict_video_captures()
+
+	assert count_video_captures(video_path) == 1
+
+	video_capture_handle['accessed'] = select_time - video_manager.VIDEO_CAPTURE_IDLE_TIMEOUT - 1
+	evict_video_captures()
+
+	assert count_video_captures(video_path) == 0
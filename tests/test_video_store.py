@@ -0,0 +1,69 @@
+import os
+import subprocess
+import tempfile
+
+import pytest
+
+from facefusion import state_manager
+from facefusion.download import conditional_download
+from facefusion.hash_helper import create_file_hash
+from facefusion.json import write_json
+from facefusion.video_store import VIDEO_STORE_VERSION, create_video_fingerprint, get_video_metadata, get_video_store, get_video_store_path, load_video_store, parse_frame_rate, probe_video_metadata
+from .helper import get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	conditional_download(get_test_examples_directory(),
+	[
+		'https://github.com/facefusion/facefusion-assets/releases/download/examples-3.0.0/target-240p.mp4'
+	])
+	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('target-240p.mp4'), '-vf', 'fps=25', get_test_example_file('target-240p-25fps.mp4') ])
+	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('target-240p.mp4'), '-vf', 'transpose=0', get_test_example_file('target-240p-90deg.mp4') ])
+	state_manager.init_item('temp_path', tempfile.gettempdir())
+
+
+def test_probe_video_metadata() -> None:
+	video_metadata = probe_video_metadata(get_test_example_file('target-240p-25fps.mp4'))
+
+	assert video_metadata.get('fps') == 25.0
+	assert video_metadata.get('frame_total') == 270
+	assert video_metadata.get('resolution') == (426, 226)
+	assert video_metadata.get('codec') == 'h264'
+	assert probe_video_metadata(get_test_example_file('target-240p-90deg.mp4')).get('resolution') == (226, 426)
+	assert probe_video_metadata('invalid') is None
+
+
+def test_get_video_metadata() -> None:
+	video_path = get_test_example_file('target-240p-25fps.mp4')
+	video_hash = create_file_hash(video_path)
+
+	assert get_video_metadata(video_path) == probe_video_metadata(video_path)
+	assert get_video_store().get('fingerprints').get(create_video_fingerprint(video_path)) == video_hash
+	assert get_video_store().get('videos').get(video_hash) == probe_video_metadata(video_path)
+	assert get_video_metadata('invalid') is None
+
+
+def test_load_video_store() -> None:
+	for video_store_version in [ None, VIDEO_STORE_VERSION ]:
+		state_manager.init_item('temp_path', tempfile.mkdtemp())
+		os.makedirs(os.path.dirname(get_video_store_path()))
+		write_json(get_video_store_path(),
+		{
+			'version': video_store_version,
+			'fingerprints': { 'fingerprint-' + str(video_store_version): 'hash' },
+			'videos': {}
+		})
+		load_video_store()
+
+	state_manager.init_item('temp_path', tempfile.gettempdir())
+
+	assert 'fingerprint-None' not in get_video_store().get('fingerprints')
+	assert get_video_store().get('fingerprints').get('fingerprint-' + str(VIDEO_STORE_VERSION)) == 'hash'
+
+
+def test_parse_frame_rate() -> None:
+	assert parse_frame_rate('25/1') == 25.0
+	assert parse_frame_rate('30000/1001') == 30000 / 1001
+	assert parse_frame_rate('0/0') is None
+	assert parse_frame_rate(None) is None
@@ -1,9 +1,14 @@
 import subprocess
+import timeit
+from typing import Callable
 
+import cv2
+import numpy
 import pytest
 
 from facefusion.download import conditional_download
-from facefusion.vision import calculate_histogram_difference, count_trim_frame_total, count_video_frame_total, detect_image_resolution, detect_video_duration, detect_video_fps, detect_video_resolution, match_frame_color, normalize_resolution, pack_resolution, predict_video_frame_total, read_image, read_video_frame, restrict_image_resolution, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, scale_resolution, unpack_resolution, write_image
+from facefusion.types import VisionFrame
+from facefusion.vision import calculate_histogram_difference, calculate_thumbnail_difference, count_trim_frame_total, count_video_frame_total, create_thumbnail_frame, detect_image_resolution, detect_video_duration, detect_video_fps, detect_video_resolution, match_frame_color, normalize_resolution, pack_resolution, predict_video_frame_total, probe_video, read_image, read_reduced_image, read_video_frame, restrict_image_resolution, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, scale_resolution, unpack_resolution, write_image
 from .helper import get_test_example_file, get_test_examples_directory, get_test_output_file, prepare_test_output_directory
 
 
@@ -39,6 +44,12 @@ def test_read_image() -> None:
 	assert read_image('invalid') is None
 
 
+def test_read_reduced_image() -> None:
+	assert read_reduced_image(get_test_example_file('target-240p.jpg')).shape == (29, 54, 3)
+	assert read_reduced_image(get_test_example_file('目标-240p.webp')).shape == (28, 53, 3)
+	assert read_reduced_image('invalid') is None
+
+
 def test_write_image() -> None:
 	vision_frame = read_image(get_test_example_file('target-240p.jpg'))
 
@@ -65,6 +76,16 @@ def test_read_video_frame() -> None:
 	assert read_video_frame('invalid') is None
 
 
+def test_probe_video() -> None:
+	video_metadata = probe_video(get_test_example_file('target-240p-25fps.mp4'))
+
+	assert video_metadata.get('fps') == 25.0
+	assert video_metadata.get('frame_total') == 270
+	assert video_metadata.get('resolution') == (426, 226)
+	assert probe_video(get_test_example_file('target-240p-25fps.mp4')) is video_metadata
+	assert probe_video('invalid') is None
+
+
 def test_count_video_frame_total() -> None:
 	assert count_video_frame_total(get_test_example_file('target-240p-25fps.mp4')) == 270
 	assert count_video_frame_total(get_test_example_file('target-240p-30fps.mp4')) == 324
@@ -167,3 +188,40 @@ def test_match_frame_color() -> None:
 	output_vision_frame = match_frame_color(source_vision_frame, target_vision_frame)
 
 	assert calculate_histogram_difference(source_vision_frame, output_vision_frame) > 0.5
+
+
+def test_match_frame_color_against_reference(record_property : Callable[[str, float], None]) -> None:
+	source_vision_frame = cv2.resize(read_image(get_test_example_file('target-240p.jpg')), (512, 512))
+	target_vision_frame = cv2.resize(read_image(get_test_example_file('target-240p-0sat.jpg')), (512, 512))
+	output_vision_frame = match_frame_color(source_vision_frame, target_vision_frame)
+	reference_vision_frame = match_frame_color_reference(source_vision_frame, target_vision_frame)
+
+	assert numpy.abs(output_vision_frame.astype(numpy.int16) - reference_vision_frame).max() <= 4
+	assert numpy.abs(output_vision_frame.astype(numpy.int16) - reference_vision_frame).mean() < 1
+
+	match_time = min(timeit.repeat(lambda: match_frame_color(source_vision_frame, target_vision_frame), number = 10, repeat = 3))
+	reference_time = min(timeit.repeat(lambda: match_frame_color_reference(source_vision_frame, target_vision_frame), number = 10, repeat = 3))
+
+	record_property('match_time', match_time)
+	record_property('reference_time', reference_time)
+	print('match frame color of 10 frames at 512x512: {:.3f}s pyramid, {:.3f}s reference, {:.1f}x speedup'.format(match_time, reference_time, reference_time / match_time))
+
+
+def match_frame_color_reference(source_vision_frame : VisionFrame, target_vision_frame : VisionFrame) -> VisionFrame:
+	for color_difference_size in numpy.linspace(16, target_vision_frame.shape[0], 3, endpoint = False).tolist() + [ None ]:
+		size = normalize_resolution((color_difference_size, color_difference_size)) if color_difference_size else target_vision_frame.shape[:2][::-1]
+		source_frame_resize = cv2.resize(source_vision_frame, size, interpolation = cv2.INTER_AREA).astype(numpy.float32)
+		target_frame_resize = cv2.resize(target_vision_frame, size, interpolation = cv2.INTER_AREA).astype(numpy.float32)
+		color_difference_vision_frame = cv2.resize(source_frame_resize - target_frame_resize, target_vision_frame.shape[:2][::-1], interpolation = cv2.INTER_CUBIC)
+		source_vision_frame = numpy.add(target_vision_frame, color_difference_vision_frame).clip(0, 255).astype(numpy.uint8)
+	return source_vision_frame
+
+
+def test_calculate_thumbnail_difference() -> None:
+	vision_frame = read_image(get_test_example_file('target-240p.jpg'))
+	thumbnail_vision_frame = create_thumbnail_frame(vision_frame)
+
+	assert thumbnail_vision_frame.shape == (64, 64, 3)
+	assert calculate_thumbnail_difference(thumbnail_vision_frame, create_thumbnail_frame(vision_frame)) == 0
+	assert calculate_thumbnail_difference(thumbnail_vision_frame, create_thumbnail_frame(cv2.add(vision_frame, numpy.full_like(vision_frame, 10)))) < 5
+	assert calculate_thumbnail_difference(thumbnail_vision_frame, create_thumbnail_frame(255 - vision_frame)) > 20
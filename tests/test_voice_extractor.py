@@ -0,0 +1,59 @@
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from facefusion import state_manager, voice_extractor
+from facefusion.types import Audio, AudioChunk, Voice
+from facefusion.voice_extractor import batch_extract_voice, compose_voice_chunk, decompose_voice_chunk, forward
+
+
+class FakeInput:
+	shape = [ 'batch', 4, 3072, 256 ]
+
+
+class FakeVoiceExtractor:
+	def get_inputs(self) -> List[FakeInput]:
+		return [ FakeInput() ]
+
+	def get_providers(self) -> List[str]:
+		return [ 'CPUExecutionProvider' ]
+
+	def run(self, output_names : Any, input_feed : Dict[str, AudioChunk]) -> List[AudioChunk]:
+		return [ input_feed.get('input') * 0.5 ]
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('voice_extractor_model', 'kim_vocal_2')
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('execution_session_limit', 1)
+
+
+def extract_voice_sequential(audio : Audio, chunk_size : int, step_size : int) -> Voice:
+	voice_chunk_size = 255 * 1024
+	voice_trim_size = 3840
+	temp_voice = numpy.zeros((audio.shape[0], 2)).astype(numpy.float32)
+	temp_voice_chunk = numpy.zeros((audio.shape[0], 2)).astype(numpy.float32)
+
+	for start in range(0, audio.shape[0], step_size):
+		end = min(start + chunk_size, audio.shape[0])
+		temp_audio_chunk, audio_pad_size = decompose_voice_chunk(audio[start:end, ...], voice_chunk_size, voice_trim_size)
+		temp_audio_chunk = forward(temp_audio_chunk)
+		temp_voice[start:end, ...] += compose_voice_chunk(temp_audio_chunk, audio_pad_size, voice_chunk_size, voice_trim_size)
+		temp_voice_chunk[start:end, ...] += 1
+
+	return temp_voice / temp_voice_chunk
+
+
+def test_batch_extract_voice() -> None:
+	audio = numpy.random.default_rng(0).integers(-32768, 32767, (48000 * 12, 2)).astype(numpy.int16)
+	inference_pool = { 'kim_vocal_2': FakeVoiceExtractor() }
+
+	with patch.object(voice_extractor, 'get_inference_pool', return_value = inference_pool):
+		voice = batch_extract_voice(audio, 240 * 1024, 180 * 1024)
+
+		assert voice.shape == (48000 * 12, 2)
+		assert numpy.allclose(voice, extract_voice_sequential(audio, 240 * 1024, 180 * 1024))